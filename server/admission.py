@@ -0,0 +1,323 @@
+"""
+admission.py
+Admission control for password (bcrypt) endpoints.
+
+Every `/auth/login`, `/auth/register` and admin `POST /teachers/` burns one
+~250 ms bcrypt computation. A credential-stuffing burst can otherwise queue
+thousands of them on the password worker pool, saturating every core and
+starving cheap endpoints. The gate in front of them:
+- Rate-limits each client IP and each target email with token buckets
+  (checked before any DB or CPU work, so rejected requests cost ~nothing).
+  Behind a reverse proxy, list it in TRUSTED_PROXIES so the client IP is
+  taken from X-Forwarded-For instead of the proxy's address.
+- Caps concurrent password operations globally; excess requests wait in a
+  short bounded queue and are shed with 429 + Retry-After once the queue
+  is full or the wait exceeds the queue timeout.
+- Lets batch work (the bulk teacher import) through in small steps via
+  `run_batch`, so an import never queues hundreds of hashes ahead of
+  interactive logins.
+- Counts admissions, queue depth and sheds per reason (GET /admin/admission
+  and /metrics).
+
+State lives per worker process.
+
+Tuning the IP bucket: every client behind one address shares a bucket.
+That address is the proxy when TRUSTED_PROXIES is not set, or the NAT
+gateway when a campus network shares one public IP. Raise
+PASSWORD_IP_RATE / PASSWORD_IP_BURST to fit the expected login rush from
+that address, e.g. 10/s with a burst of 200 for a school. The per-email
+bucket still limits guessing against any one account. `PASSWORD_IP_RATE=0`
+turns the IP bucket off.
+"""
+import asyncio
+import ipaddress
+import math
+import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Hashable, Iterable, List, Optional, TypeVar
+
+from fastapi import HTTPException, Request, status
+
+from .caching import TTLCache
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Concurrent bcrypt operations admitted at once (defaults to the worker pool size).
+PASSWORD_MAX_CONCURRENT = int(os.getenv("PASSWORD_MAX_CONCURRENT", os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)))
+# Requests allowed to wait for a slot, and for how long, before being shed.
+PASSWORD_QUEUE_SIZE = int(os.getenv("PASSWORD_QUEUE_SIZE", 32))
+PASSWORD_QUEUE_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_QUEUE_TIMEOUT_SECONDS", 2))
+# Token buckets: sustained rate (per second) and burst size, per client IP and per email.
+PASSWORD_IP_RATE = float(os.getenv("PASSWORD_IP_RATE", 1))
+PASSWORD_IP_BURST = float(os.getenv("PASSWORD_IP_BURST", 10))
+PASSWORD_EMAIL_RATE = float(os.getenv("PASSWORD_EMAIL_RATE", 0.2))
+PASSWORD_EMAIL_BURST = float(os.getenv("PASSWORD_EMAIL_BURST", 5))
+# Upper bound on tracked IPs/emails; idle buckets are forgotten once full again.
+PASSWORD_BUCKETS_MAX_ENTRIES = int(os.getenv("PASSWORD_BUCKETS_MAX_ENTRIES", 100000))
+# Reverse proxies (comma-separated IPs or CIDRs, e.g. "10.0.0.5,172.16.0.0/12")
+# whose X-Forwarded-For header is trusted. Empty: the TCP peer is the client.
+TRUSTED_PROXIES = tuple(
+    ipaddress.ip_network(entry.strip(), strict=False)
+    for entry in os.getenv("TRUSTED_PROXIES", "").split(",") if entry.strip()
+)
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `burst` tokens, refilled at `rate`/s.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (float): Bucket capacity (and initial fill).
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: Optional[float] = None) -> float:
+        """
+        Try to take one token.
+
+        Returns:
+            float: 0 if a token was taken, else seconds until one is available.
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (1 - self.tokens) / self.rate
+
+
+class KeyedRateLimiter:
+    """
+    One token bucket per key (client IP, email...), kept in a bounded TTL cache.
+
+    A bucket left idle long enough to refill completely is equivalent to a new
+    one, so it is allowed to expire from the cache.
+
+    Args:
+        rate (float): Tokens per second per key. `<= 0` disables the limiter.
+        burst (float): Bucket capacity per key.
+        max_entries (int): Maximum number of tracked keys.
+    """
+
+    def __init__(self, rate: float, burst: float, max_entries: int = 100000):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        refill = self.burst / rate if rate > 0 else 0
+        self._buckets = TTLCache(max_entries, max(refill, 1.0))
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def take(self, key: Hashable) -> float:
+        """Take a token for `key`; returns 0 or the seconds to wait (see TokenBucket.take)."""
+        if not self.enabled:
+            return 0.0
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+        wait = bucket.take()
+        # Re-set on every touch so the entry lives until the bucket is full again.
+        self._buckets.set(key, bucket)
+        return wait
+
+    def tracked(self) -> int:
+        return len(self._buckets)
+
+
+class AdmissionGate:
+    """
+    Rate limits plus a bounded, time-limited queue in front of a scarce resource.
+
+    Usage in route:
+        gate.charge(request, email=user.email)   # 429 if the IP/email is over its rate
+        async with gate.slot():                   # 429 if the queue is full / wait too long
+            ...bcrypt...
+
+    Args:
+        name (str): Label used in stats.
+        max_concurrent (int): Operations allowed to run at once.
+        queue_size (int): Requests allowed to wait for a slot.
+        queue_timeout (float): Longest wait for a slot, in seconds.
+        ip_limiter, email_limiter (KeyedRateLimiter): Per-client and per-account buckets.
+        trusted_proxies (tuple): Networks of reverse proxies whose
+            X-Forwarded-For is used to find the client IP (see `client_ip`).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        queue_size: int,
+        queue_timeout: float,
+        ip_limiter: KeyedRateLimiter,
+        email_limiter: KeyedRateLimiter,
+        trusted_proxies: tuple = (),
+    ):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self.ip_limiter = ip_limiter
+        self.email_limiter = email_limiter
+        self.trusted_proxies = trusted_proxies
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.admitted = 0
+        self.shed: Counter = Counter()
+
+    def _shed(self, reason: str, retry_after: float) -> HTTPException:
+        self.shed[reason] += 1
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many password attempts, retry later.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def _is_trusted_proxy(self, host: str) -> bool:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def client_ip(self, request: Request) -> str:
+        """
+        Address the IP bucket is keyed on.
+
+        The TCP peer, unless it is a trusted proxy: then the right-most
+        X-Forwarded-For entry that is not itself a trusted proxy. Entries to
+        its left are set by the client and could be forged, so they are ignored.
+        """
+        host = request.client.host if request.client else "unknown"
+        if not self._is_trusted_proxy(host):
+            return host
+        forwarded = [
+            entry.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for entry in header.split(",") if entry.strip()
+        ]
+        for entry in reversed(forwarded):
+            if not self._is_trusted_proxy(entry):
+                return entry
+        return forwarded[0] if forwarded else host
+
+    def charge(self, request: Request, email: Optional[str] = None) -> None:
+        """
+        Take one token from the caller's IP bucket and, if given, the email's bucket.
+
+        Raises:
+            HTTPException: 429 with Retry-After when either bucket is empty.
+        """
+        wait = self.ip_limiter.take(self.client_ip(request))
+        if wait:
+            raise self._shed("ip_rate", wait)
+        if email:
+            wait = self.email_limiter.take(email.strip().lower())
+            if wait:
+                raise self._shed("email_rate", wait)
+
+    @asynccontextmanager
+    async def slot(self, background: bool = False) -> AsyncIterator[None]:
+        """
+        Hold one of the `max_concurrent` slots for the duration of the block.
+
+        Args:
+            background (bool): Batch work (see `run_batch`): waits as long as
+                needed and does not count against the queue size.
+
+        Raises:
+            HTTPException: 429 with Retry-After when the wait queue is full or
+            no slot frees up within `queue_timeout`.
+        """
+        if self._semaphore is None:
+            # Created lazily so it binds to the running event loop.
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        if background:
+            await self._semaphore.acquire()
+        elif self._semaphore.locked():
+            if self.queued >= self.queue_size:
+                raise self._shed("queue_full", self.queue_timeout)
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._shed("queue_timeout", self.queue_timeout)
+            finally:
+                self.queued -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def run_batch(self, fn: Callable[[T], Awaitable[R]], items: Iterable[T]) -> List[R]:
+        """
+        Run `fn(item)` for every item, each inside a background slot.
+
+        At most `max_concurrent` items hold or wait for a slot at a time, so an
+        interactive request queues behind a few batch operations instead of
+        the whole batch, and is not shed because of it.
+
+        Returns:
+            List: The results, in item order.
+        """
+        lane = asyncio.Semaphore(self.max_concurrent)
+
+        async def run(item: T) -> R:
+            async with lane:
+                async with self.slot(background=True):
+                    return await fn(item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+    def stats(self) -> dict:
+        """Current load and cumulative admission/shed counters."""
+        return {
+            "name": self.name,
+            "max_concurrent": self.max_concurrent,
+            "queue_size": self.queue_size,
+            "queue_timeout_s": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values()),
+            "tracked_ips": self.ip_limiter.tracked(),
+            "tracked_emails": self.email_limiter.tracked(),
+        }
+
+
+password_gate = AdmissionGate(
+    "password",
+    max_concurrent=PASSWORD_MAX_CONCURRENT,
+    queue_size=PASSWORD_QUEUE_SIZE,
+    queue_timeout=PASSWORD_QUEUE_TIMEOUT_SECONDS,
+    ip_limiter=KeyedRateLimiter(PASSWORD_IP_RATE, PASSWORD_IP_BURST, PASSWORD_BUCKETS_MAX_ENTRIES),
+    email_limiter=KeyedRateLimiter(PASSWORD_EMAIL_RATE, PASSWORD_EMAIL_BURST, PASSWORD_BUCKETS_MAX_ENTRIES),
+    trusted_proxies=TRUSTED_PROXIES,
+)
@@ -0,0 +1,15 @@
+"""
+benchmarks/
+In-process benchmarks for the School API.
+
+Each module boots `server.main.app` through an ASGI transport (no network,
+no uvicorn) against a local database and prints its measurements.
+Run them from the repository root, e.g.:
+
+    pip install -r server/benchmarks/requirements.txt
+    python -m server.benchmarks.suite --users 1000 --teachers 1000 --output results.json
+    python -m server.benchmarks.login_storm
+
+`suite` covers every auth/teachers endpoint and writes comparable JSON;
+the other modules each target one specific optimization.
+"""
@@ -0,0 +1,103 @@
+"""
+Bulk import benchmark.
+
+Creates N teachers through the single-create path (`POST /teachers/`, with
+bounded concurrency) and N more through one `POST /teachers/bulk` NDJSON
+upload, and reports teachers/second for both. Passwords are omitted, so
+both paths hash one generated password per teacher.
+
+Then runs a second bulk upload while logging in every LOGIN_INTERVAL_S,
+with the password gate's default queue size and timeout, and checks that
+no login is shed (429) behind the import's hashes.
+Fails (exit 1) if any login during the import does not answer 200.
+
+Usage:
+    python -m server.benchmarks.bulk_import [--rows 500] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from server.benchmarks.common import client, reset_schema, summarize, timed
+from server.admission import password_gate
+
+ADMIN_EMAIL = "bench-admin@example.com"
+ADMIN_PASSWORD = "BenchAdmin123"
+LOGIN_INTERVAL_S = 1.0
+# The gate's defaults (the shared benchmark helpers relax them).
+GATE_QUEUE_SIZE = 32
+GATE_QUEUE_TIMEOUT_S = 2.0
+
+
+async def admin_headers(c) -> dict:
+    """Register (idempotently) and log in a benchmark admin; return auth headers."""
+    await c.post("/auth/register", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD, "role": "admin"})
+    r = await c.post("/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def run(rows: int, concurrency: int) -> dict:
+    await reset_schema()
+    async with client() as c:
+        headers = await admin_headers(c)
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def create_one(i: int):
+            async with sem:
+                r = await c.post("/teachers/", headers=headers, json={"name": f"Single {i}", "bio": "bench"})
+                r.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(create_one(i) for i in range(rows)))
+        single_s = time.perf_counter() - start
+
+        body = "\n".join(json.dumps({"name": f"Bulk {i}", "bio": "bench"}) for i in range(rows)).encode()
+        start = time.perf_counter()
+        r = await c.post("/teachers/bulk", headers={**headers, "Content-Type": "application/x-ndjson"}, content=body)
+        r.raise_for_status()
+        bulk_s = time.perf_counter() - start
+        report = r.json()
+
+        password_gate.queue_size, password_gate.queue_timeout = GATE_QUEUE_SIZE, GATE_QUEUE_TIMEOUT_S
+        body = "\n".join(json.dumps({"name": f"Busy {i}", "bio": "bench"}) for i in range(rows)).encode()
+        upload = asyncio.create_task(
+            c.post("/teachers/bulk", headers={**headers, "Content-Type": "application/x-ndjson"}, content=body)
+        )
+        statuses, logins = [], []
+
+        async def login():
+            r = await c.post("/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+            statuses.append(r.status_code)
+        while not upload.done():
+            logins.append(asyncio.create_task(timed(login())))
+            await asyncio.sleep(LOGIN_INTERVAL_S)
+        (await upload).raise_for_status()
+        login_ms = await asyncio.gather(*logins)
+
+    return {
+        "rows": rows,
+        "single_create": {"seconds": round(single_s, 2), "teachers_per_s": round(rows / single_s, 1)},
+        "bulk_import": {"seconds": round(bulk_s, 2), "teachers_per_s": round(rows / bulk_s, 1),
+                        "created": report["created"], "failed": report["failed"]},
+        "logins_during_import": {**summarize(login_ms), "statuses": sorted(set(statuses)),
+                                 "ok": bool(statuses) and set(statuses) == {200}},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.rows, args.concurrency))
+    print(json.dumps(results, indent=2))
+    if not results["logins_during_import"]["ok"]:
+        print("FAIL: logins shed during the bulk import")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
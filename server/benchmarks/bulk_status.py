@@ -0,0 +1,104 @@
+"""
+Bulk activate/deactivate benchmark.
+
+Deactivates N teachers the old per-row way (load the row, mutate it,
+COMMIT, refresh, one teacher at a time) and through
+`POST /teachers/deactivate` (one set-based UPDATE per chunk), then
+reactivates them through `POST /teachers/activate` with a name filter.
+Reports wall time, SQL statements and COMMITs for each, and asserts that
+LIKE wildcards (`%`, `_`) in the name filter match only themselves.
+
+Usage:
+    python -m server.benchmarks.bulk_status [--teachers 2000]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import event, select
+
+from server.benchmarks.common import SEED_PASSWORD, client, reset_schema, seed_teachers
+from server.database import SessionLocal, get_engine
+from server.models.teacherProfile import TeacherProfile
+
+
+class Statements:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def __enter__(self):
+        event.listen(get_engine().sync_engine, "before_cursor_execute", self._statement)
+        event.listen(get_engine().sync_engine, "commit", self._commit)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed_ms = (time.perf_counter() - self.start) * 1000
+        event.remove(get_engine().sync_engine, "before_cursor_execute", self._statement)
+        event.remove(get_engine().sync_engine, "commit", self._commit)
+
+    def _statement(self, *_):
+        self.statements += 1
+
+    def _commit(self, *_):
+        self.commits += 1
+
+    def report(self) -> dict:
+        return {"ms": round(self.elapsed_ms, 1), "statements": self.statements, "commits": self.commits}
+
+
+async def _per_row(ids: list[int], is_active: bool) -> None:
+    """The previous activate/deactivate_teacher logic, once per id."""
+    async with SessionLocal() as db:
+        for teacher_id in ids:
+            teacher = (await db.execute(select(TeacherProfile).filter(TeacherProfile.id == teacher_id))).scalars().first()
+            if teacher:
+                teacher.is_active = is_active
+                await db.commit()
+                await db.refresh(teacher)
+
+
+async def run(teachers: int) -> dict:
+    await reset_schema()
+    await seed_teachers(teachers)
+    ids = list(range(1, teachers + 1))
+    results = {"teachers": teachers}
+    async with client() as c:
+        await c.post("/auth/register", json={"email": "bs-admin@example.com", "password": SEED_PASSWORD, "role": "admin"})
+        login = await c.post("/auth/login", json={"email": "bs-admin@example.com", "password": SEED_PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        await c.get("/auth/me", headers=headers)  # warm the principal cache
+
+        with Statements() as per_row:
+            await _per_row(ids, False)
+        results["per_row_deactivate"] = per_row.report()
+        await _per_row(ids, True)
+
+        with Statements() as by_ids:
+            r = await c.post("/teachers/deactivate", headers=headers, json={"ids": ids})
+            assert r.status_code == 200 and r.json()["updated"] == teachers, r.text
+        results["set_based_deactivate_by_ids"] = by_ids.report()
+
+        with Statements() as by_filter:
+            r = await c.post("/teachers/activate", headers=headers, json={"name_contains": "Teacher"})
+            assert r.status_code == 200 and r.json()["updated"] == teachers, r.text
+        results["set_based_activate_by_filter"] = by_filter.report()
+
+        for wildcard in ("%", "_", "Teacher_1"):
+            r = await c.post("/teachers/deactivate", headers=headers, json={"name_contains": wildcard})
+            assert r.status_code == 200 and r.json()["targets"] == 0, (wildcard, r.text)
+        results["wildcards_match_literally"] = True
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teachers", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.teachers)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Teacher change feed check and benchmark.
+
+Seeds N teachers, does a full sync through `GET /teachers/changes`, then
+creates one teacher, deactivates five (one bulk UPDATE, so they share one
+timestamp) and reactivates one, and syncs again with the saved token.
+Checks that:
+- the full sync returns every profile exactly once across pages;
+- a caught-up token returns nothing;
+- the delta sync returns exactly the changed profiles with the right
+  `change` kind, also when paging one row at a time through rows with
+  equal timestamps;
+- deactivated profiles come back as tombstones without profile data;
+- the change-feed query is an ordered range scan of the (updated_at, id)
+  index, with no sort step (SQLite plan).
+
+Reports the delta sync against re-downloading `/teachers/all`.
+Fails (exit 1) if any check does not hold.
+
+Usage:
+    python -m server.benchmarks.change_feed [--teachers 20000]
+"""
+import os
+
+# Must be set before any `server.*` module reads the environment.
+os.environ.setdefault("TEACHER_CHANGES_SETTLE_SECONDS", "0.2")
+
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import text
+
+from server.benchmarks.common import SEED_PASSWORD, client, reset_schema, seed_teachers
+from server.database import get_engine
+from server.routers.teachers import CHANGES_SETTLE_SECONDS
+
+SETTLE_WAIT_S = CHANGES_SETTLE_SECONDS + 0.1
+
+
+async def _sync(c, token, limit: int) -> tuple[list[dict], str, int, int]:
+    """Page until caught up; returns (changes, token, requests, bytes)."""
+    changes, requests, size = [], 0, 0
+    while True:
+        params = {"limit": limit, **({"since": token} if token else {})}
+        r = await c.get("/teachers/changes", params=params)
+        assert r.status_code == 200, r.text
+        requests += 1
+        size += len(r.content)
+        page = r.json()
+        changes += page["changes"]
+        token = page["next_token"]
+        if not page["has_more"]:
+            return changes, token, requests, size
+
+
+async def _timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+async def run(teachers: int) -> dict:
+    await reset_schema()
+    await seed_teachers(teachers)
+    results, checks = {"teachers": teachers}, {}
+
+    async with client() as c:
+        await c.post("/auth/register", json={"email": "cf-admin@example.com", "password": SEED_PASSWORD, "role": "admin"})
+        login = await c.post("/auth/login", json={"email": "cf-admin@example.com", "password": SEED_PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        await asyncio.sleep(SETTLE_WAIT_S)
+
+        (full, token, requests, size), ms = await _timed(_sync(c, None, 1000))
+        results["full_sync"] = {"ms": ms, "requests": requests, "bytes": size}
+        checks["full_sync_every_profile_once"] = (sorted(ch["id"] for ch in full) == list(range(1, teachers + 1)), True)
+
+        empty, token, _, _ = await _sync(c, token, 1000)
+        checks["caught_up_returns_nothing"] = (len(empty), 0)
+
+        created = await c.post("/teachers/", headers=headers, json={"name": "New Teacher"})
+        new_id = created.json()["id"]
+        await c.post("/teachers/deactivate", headers=headers, json={"ids": [2, 3, 4, 5, 6]})
+        await c.post("/teachers/activate", headers=headers, json={"ids": [6]})
+        r = await c.get("/teachers/changes", params={"since": token})
+        checks["unsettled_changes_not_returned_yet"] = (len(r.json()["changes"]), 0)
+        await asyncio.sleep(SETTLE_WAIT_S)
+
+        (delta, _, requests, size), ms = await _timed(_sync(c, token, 1000))
+        results["delta_sync"] = {"ms": ms, "requests": requests, "bytes": size, "changes": len(delta)}
+        checks["delta_kinds"] = (
+            sorted((ch["id"], ch["change"]) for ch in delta),
+            sorted([(2, "deleted"), (3, "deleted"), (4, "deleted"), (5, "deleted"), (6, "updated"), (new_id, "created")]),
+        )
+        paged, _, requests, _ = await _sync(c, token, 1)
+        checks["one_row_pages_same_result"] = ([ch["id"] for ch in paged], [ch["id"] for ch in delta])
+        checks["one_row_pages_requests"] = (requests, len(delta))
+        checks["deleted_has_deleted_at"] = (all(ch["deleted_at"] for ch in delta if ch["change"] == "deleted"), True)
+        checks["deleted_is_tombstone"] = (
+            sorted({tuple(sorted(ch)) for ch in delta if ch["change"] == "deleted"}),
+            [("change", "deleted_at", "id", "is_active", "updated_at")],
+        )
+
+        r = await c.get("/teachers/changes", params={"since": "not-a-token"})
+        checks["bad_token_400"] = (r.status_code, 400)
+
+        r, ms = await _timed(c.get("/teachers/all"))
+        results["full_download"] = {"ms": ms, "bytes": len(r.content)}
+
+        if get_engine().dialect.name == "sqlite":
+            async with get_engine().connect() as conn:
+                plan = (await conn.execute(text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM teacher_profiles WHERE updated_at < :u AND updated_at >= :t "
+                    "AND (updated_at > :t OR id > :i) ORDER BY updated_at, id LIMIT 100"
+                ), {"u": "2100-01-01", "t": "2000-01-01", "i": 0})).all()
+            detail = " ".join(row[-1] for row in plan)
+            results["query_plan"] = detail
+            checks["uses_updated_at_index"] = ("ix_teacher_profiles_updated_at_id" in detail, True)
+            checks["no_sort_step"] = ("TEMP B-TREE" in detail, False)
+
+    results["checks"] = {name: {"got": got, "expected": expected} for name, (got, expected) in checks.items()}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teachers", type=int, default=20000)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.teachers))
+    print(json.dumps(results, indent=2))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Shared helpers for the in-process benchmarks.
+- Points the app at a local SQLite file unless DATABASE_URL is already set.
+- Recreates the schema, seeds bulk data, and opens an ASGI client against `server.main.app`.
+- Provides latency percentile helpers.
+
+Requires the benchmark-only extras `httpx` and `aiosqlite`.
+"""
+import os
+import time
+from contextlib import asynccontextmanager
+
+# Must be set before any `server.*` module reads the environment.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+# Benchmarks drive every request from one client IP and a handful of emails;
+# keep the password admission gate out of the way unless a run opts in.
+os.environ.setdefault("PASSWORD_IP_RATE", "0")
+os.environ.setdefault("PASSWORD_EMAIL_RATE", "0")
+os.environ.setdefault("PASSWORD_QUEUE_SIZE", "100000")
+os.environ.setdefault("PASSWORD_QUEUE_TIMEOUT_SECONDS", "600")
+
+import httpx
+from sqlalchemy import insert
+
+from server.database import Base, dispose_engine, get_engine
+from server.main import app
+from server.models.teacherProfile import TeacherProfile
+from server.models.user import User
+from server.security import _hash_password_sync
+
+# Every seeded user shares this password (hashed once per run).
+SEED_PASSWORD = "SeedPass123"
+SEED_BATCH_SIZE = 5000
+
+
+def seed_email(i: int) -> str:
+    """Email of the i-th seeded user (1-based)."""
+    return f"seed-{i}@example.com"
+
+
+async def reset_schema() -> None:
+    """Drop and recreate every table so each run starts from a clean slate."""
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def seed(users: int, teachers: int, batch_size: int = SEED_BATCH_SIZE) -> None:
+    """
+    Bulk-insert `users` users; the first `teachers` of them get an active
+    teacher profile (profile id == user id). Uses multi-row core INSERTs in
+    chunks, bypassing the ORM unit of work.
+    """
+    teachers = min(teachers, users)
+    password_hash = _hash_password_sync(SEED_PASSWORD)
+    async with get_engine().begin() as conn:
+        for start in range(0, users, batch_size):
+            ids = range(start + 1, min(start + batch_size, users) + 1)
+            await conn.execute(insert(User), [
+                {"id": i, "email": seed_email(i), "password_hash": password_hash,
+                 "role": "teacher", "is_active": True}
+                for i in ids
+            ])
+            profile_ids = [i for i in ids if i <= teachers]
+            if profile_ids:
+                await conn.execute(insert(TeacherProfile), [
+                    {"id": i, "user_id": i, "name": f"Teacher {i}",
+                     "bio": "Profesor de matemáticas y física " * 4, "image_url": f"{i}.jpg",
+                     "is_active": True}
+                    for i in profile_ids
+                ])
+
+
+async def seed_teachers(count: int, batch_size: int = SEED_BATCH_SIZE) -> None:
+    """Bulk-insert `count` users with one active teacher profile each."""
+    await seed(count, count, batch_size)
+
+
+@asynccontextmanager
+async def client(client_addr: tuple[str, int] = ("127.0.0.1", 123)):
+    """ASGI client bound to the in-process app. Disposes the engine on exit."""
+    transport = httpx.ASGITransport(app=app, client=client_addr)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            yield c
+    finally:
+        # aiosqlite connections run on non-daemon threads; close them or the
+        # interpreter never exits.
+        await dispose_engine()
+
+
+async def timed(coro) -> float:
+    """Await `coro` and return its wall time in milliseconds."""
+    start = time.perf_counter()
+    await coro
+    return (time.perf_counter() - start) * 1000
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples` (pct in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: list[float]) -> dict:
+    """p50/p95/p99/max summary (milliseconds) for a list of latencies."""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "max_ms": round(max(samples), 2) if samples else 0.0,
+    }
@@ -0,0 +1,176 @@
+"""
+Contact form write-behind check and benchmark.
+
+Makes every INSERT slow (default +200 ms per statement), then:
+- fires bursts of concurrent `POST /contact` requests and reports their
+  latency, plus the latency of writing each submission inline (one INSERT
+  per request, the same slow statement), and whether the POST p99 stays
+  below the INSERT latency (reported, not checked);
+- checks that the writer batched the rows (far fewer INSERTs than rows),
+  that nothing was lost once drained, and that `close()` writes what was
+  still queued;
+- checks validation (422), queue-full shedding (503 + Retry-After) while
+  the database is stalled, and the admin inbox (newest first, paginated);
+- checks that a row the database rejects is dropped on its own (the rest
+  of its batch is written and the writer keeps going), and that a crashed
+  writer refuses new submissions instead of acknowledging them.
+
+Fails (exit 1) if any check does not hold.
+
+Usage:
+    python -m server.benchmarks.contact_ingest [--requests 1000] [--concurrency 50] [--db-ms 200]
+"""
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import func, insert, select
+
+from server.benchmarks.common import SEED_PASSWORD, client, reset_schema, summarize, timed
+from server.contact import ContactWriter, contact_writer
+from server.database import get_engine
+from server.models.contactMessage import ContactMessage
+
+
+def _body(i: int) -> dict:
+    return {"name": f"Visitor {i}", "email": f"visitor-{i}@example.com",
+            "subject": "Inscripciones", "message": f"Consulta número {i} sobre inscripciones."}
+
+
+def _slow_writes(writer: ContactWriter, delay_s: float, counter: dict) -> None:
+    """Delay every batch INSERT by `delay_s` (a slow or busy database)."""
+    write = writer._write
+
+    async def slow_write(batch):
+        counter["inserts"] += 1
+        await asyncio.sleep(delay_s)
+        await write(batch)
+    writer._write = slow_write
+
+
+async def _inline(i: int, delay_s: float) -> None:
+    await asyncio.sleep(delay_s)
+    async with get_engine().begin() as conn:
+        await conn.execute(insert(ContactMessage).values(**_body(i)))
+
+
+async def _rows() -> int:
+    async with get_engine().connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(ContactMessage))).scalar_one()
+
+
+async def run(requests: int, concurrency: int, db_ms: float) -> dict:
+    await reset_schema()
+    delay_s = db_ms / 1000
+    counter = {"inserts": 0}
+    _slow_writes(contact_writer, delay_s, counter)
+    contact_writer.start()
+    checks, results = {}, {"requests": requests, "concurrency": concurrency, "db_ms": db_ms}
+
+    async with client() as c:
+        r = await c.post("/contact", json={"name": " ", "email": "not-an-email", "message": ""})
+        checks["invalid_422"] = (r.status_code, 422)
+
+        statuses = set()
+
+        async def submit(i: int) -> float:
+            async def request():
+                r = await c.post("/contact", json=_body(i))
+                statuses.add(r.status_code)
+            return await timed(request())
+
+        samples = []
+        for start in range(0, requests, concurrency):
+            samples += await asyncio.gather(*(submit(i) for i in range(start, min(start + concurrency, requests))))
+        results["write_behind_post"] = summarize(samples)
+        checks["all_202"] = (sorted(statuses), [202])
+        # Timing dependent, so reported rather than checked.
+        results["post_p99_below_db_latency"] = results["write_behind_post"]["p99_ms"] < db_ms
+
+        # Let the writer catch up, then count.
+        for _ in range(200):
+            if contact_writer.pending == 0:
+                break
+            await asyncio.sleep(0.05)
+        checks["all_written"] = (await _rows(), requests)
+        results["inserts"] = counter["inserts"]
+        checks["batched"] = (counter["inserts"] <= requests // 10, True)
+
+        await c.post("/auth/register", json={"email": "ci-admin@example.com", "password": SEED_PASSWORD, "role": "admin"})
+        login = await c.post("/auth/login", json={"email": "ci-admin@example.com", "password": SEED_PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        page = (await c.get("/contact/messages?limit=5", headers=headers)).json()
+        checks["inbox_newest_first"] = ([m["name"] for m in page["items"][:2]], [f"Visitor {requests - 1}", f"Visitor {requests - 2}"])
+        page2 = (await c.get(f"/contact/messages?limit=5&cursor={page['next_cursor']}", headers=headers)).json()
+        checks["inbox_next_page"] = (page2["items"][0]["name"], f"Visitor {requests - 6}")
+        checks["inbox_requires_admin"] = ((await c.get("/contact/messages")).status_code, 401)
+
+        # A row violating NOT NULL fails its whole batch: only that row is dropped.
+        before, dropped = await _rows(), contact_writer.dropped
+        for i in range(9):
+            contact_writer.submit(_body(requests + i))
+        contact_writer.submit({**_body(requests + 9), "name": None})
+        for _ in range(200):
+            if contact_writer.pending == 0:
+                break
+            await asyncio.sleep(0.05)
+        checks["bad_row_rest_of_batch_written"] = (await _rows() - before, 9)
+        checks["bad_row_dropped"] = (contact_writer.dropped - dropped, 1)
+        checks["writer_alive_after_bad_row"] = (contact_writer.stats()["running"], True)
+
+        # A writer whose task died must refuse, not acknowledge and lose.
+        crashed = ContactWriter()
+
+        async def crash():
+            raise RuntimeError("writer bug")
+        crashed._next_batch = crash
+        crashed.start()
+        await asyncio.sleep(0)
+        checks["crashed_writer_refuses"] = (crashed.submit(_body(0)), False)
+        await crashed.close(timeout=1)
+
+        # Drain on shutdown: queue a burst and close immediately.
+        before = await _rows()
+        for i in range(requests + 10, requests + 310):
+            contact_writer.submit(_body(i))
+        await contact_writer.close(timeout=60)
+        checks["drained_on_close"] = (await _rows() - before, 300)
+        r = await c.post("/contact", json=_body(0))
+        checks["closed_503"] = (r.status_code, 503)
+
+        # Stalled database: a small queue fills up and sheds with Retry-After.
+        stalled = ContactWriter(batch_size=10, flush_interval=0.01, max_queued=20)
+        _slow_writes(stalled, 3600, {"inserts": 0})
+        stalled.start()
+        accepted = sum(stalled.submit(_body(i)) for i in range(50))
+        checks["stalled_accepts_up_to_queue_size"] = (accepted, 20)
+        checks["stalled_rejects_rest"] = (stalled.rejected, 30)
+        await stalled.close(timeout=0.1)
+
+        inline = []
+        for start in range(0, requests, concurrency):
+            inline += await asyncio.gather(*(timed(_inline(i, delay_s)) for i in range(start, min(start + concurrency, requests))))
+        results["inline_insert_per_request"] = summarize(inline)
+
+    results["writer"] = contact_writer.stats()
+    results["checks"] = {name: {"got": got, "expected": expected} for name, (got, expected) in checks.items()}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-ms", type=float, default=200)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.requests, args.concurrency, args.db_ms))
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
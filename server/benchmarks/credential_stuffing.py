@@ -0,0 +1,103 @@
+"""
+Credential-stuffing benchmark.
+
+Fires a burst of wrong-password `/auth/login` attempts from a set of client
+IPs against many emails, while measuring `GET /teachers/` latency from a
+separate client. Reports how many attempts were admitted vs shed (429) by
+the password admission gate, how long attackers waited for an answer, and
+the read latency during the attack.
+
+Run with the gate's defaults (the shared benchmark helpers disable it):
+    python -m server.benchmarks.credential_stuffing [--attempts 300] [--ips 20]
+Compare with the gate effectively off:
+    python -m server.benchmarks.credential_stuffing --no-gate
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# The gate's defaults apply unless --no-gate; must run before `common` sets its own.
+if "--no-gate" not in sys.argv:
+    os.environ["PASSWORD_IP_RATE"] = os.getenv("BENCH_PASSWORD_IP_RATE", "1")
+    os.environ["PASSWORD_EMAIL_RATE"] = os.getenv("BENCH_PASSWORD_EMAIL_RATE", "0.2")
+    os.environ["PASSWORD_QUEUE_SIZE"] = os.getenv("BENCH_PASSWORD_QUEUE_SIZE", "32")
+    os.environ["PASSWORD_QUEUE_TIMEOUT_SECONDS"] = os.getenv("BENCH_PASSWORD_QUEUE_TIMEOUT_SECONDS", "2")
+
+import httpx
+
+from server.benchmarks.common import client, reset_schema, seed, seed_email, summarize, timed
+from server.admission import password_gate
+from server.main import app
+
+
+async def _reads(c, count: int, concurrency: int = 10) -> list[float]:
+    sem = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async def one():
+        async with sem:
+            samples.append(await timed(c.get("/teachers/")))
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return samples
+
+
+async def run(attempts: int, ips: int, emails: int, reads: int) -> dict:
+    await reset_schema()
+    await seed(emails, emails)
+
+    attackers = [
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(f"10.0.0.{i + 1}", 4000)),
+                          base_url="http://bench")
+        for i in range(ips)
+    ]
+    statuses: dict[int, int] = {}
+    latencies: list[float] = []
+
+    async def attempt(i: int) -> None:
+        start = time.perf_counter()
+        r = await attackers[i % ips].post(
+            "/auth/login", json={"email": seed_email(i % emails + 1), "password": "wrong-password"}
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    try:
+        async with client() as c:
+            baseline = await _reads(c, reads)
+            attack = asyncio.gather(*(attempt(i) for i in range(attempts)))
+            await asyncio.sleep(0)  # let the attack start first
+            under_attack = await _reads(c, reads)
+            await attack
+    finally:
+        for a in attackers:
+            await a.aclose()
+
+    return {
+        "attempts": attempts,
+        "client_ips": ips,
+        "emails": emails,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "login_attempts": summarize(latencies),
+        "gate": password_gate.stats(),
+        "reads_baseline": summarize(baseline),
+        "reads_during_attack": summarize(under_attack),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--attempts", type=int, default=300)
+    parser.add_argument("--ips", type=int, default=20)
+    parser.add_argument("--emails", type=int, default=100)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--no-gate", action="store_true", help="Leave the rate limits off and the queue unbounded.")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.attempts, args.ips, args.emails, args.reads)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Streaming export benchmark.
+
+Seeds N active teacher profiles and measures peak Python heap (tracemalloc)
+and time-to-first-byte for `GET /teachers/all?stream=ndjson`. With
+`--compare-list` it also measures the buffered `GET /teachers/all`, whose
+peak grows linearly with N while the streaming peak stays flat.
+
+Usage:
+    python -m server.benchmarks.export_memory [--rows 1000000] [--compare-list]
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from server.benchmarks.common import reset_schema, seed_teachers
+from server.database import dispose_engine, get_engine
+from server.main import app
+
+
+async def _measure(path: str, query: str = "") -> dict:
+    """
+    Drive the ASGI app directly so body chunks are counted and discarded as
+    they are sent; an HTTP client would buffer them and hide the difference.
+    """
+    first_byte = None
+    received = 0
+    status = None
+
+    request_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects; Starlette cancels this wait when done.
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first_byte, received, status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            received += len(message.get("body", b""))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query.encode(), "headers": [], "server": ("bench", 80),
+        "client": ("127.0.0.1", 0), "root_path": "",
+    }
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "status": status,
+        "bytes": received,
+        "ttfb_ms": round((first_byte or 0) * 1000, 2),
+        "total_s": round(elapsed, 2),
+        "peak_heap_mb": round(peak / 2**20, 2),
+    }
+
+
+async def run(rows: int, compare_list: bool) -> dict:
+    await reset_schema()
+    await seed_teachers(rows)
+    results = {"rows": rows}
+    try:
+        results["ndjson_stream"] = await _measure("/teachers/all", "stream=ndjson")
+        if compare_list:
+            results["buffered_list"] = await _measure("/teachers/all")
+    finally:
+        await dispose_engine()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--compare-list", action="store_true")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.rows, args.compare_list)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Instagram feed stale-while-revalidate check.
+
+Plugs a slow local stub upstream (default 300 ms per call) into the feed
+cache and drives `GET /api/instagram/feed` through these phases:
+- cold start: concurrent requests wait for one upstream call;
+- fresh: no upstream calls;
+- stale: requests are answered immediately while one refresh runs;
+- upstream down: the last good snapshot is still served;
+- restart: a new cache serves the on-disk snapshot with the upstream down;
+- conditional request: If-None-Match gets a 304.
+
+The cache runs on a fake clock that the script advances past the TTL, so
+the checks (upstream call counts, statuses, which snapshot is served) do not
+depend on timing. Latency per phase, and whether stale requests beat the
+upstream latency, are reported only. Fails (exit 1) if a check does not hold.
+
+Usage:
+    python -m server.benchmarks.instagram_feed [--requests 200] [--upstream-ms 300]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from server.benchmarks.common import client, summarize, timed
+from server.caching import SWRCache
+from server.instagram import instagram_feed
+
+TTL_S = 60.0
+
+
+class FakeClock:
+    """Wall-clock stand-in for the cache; only moves when advanced."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class StubUpstream:
+    """Slow upstream that can be switched off; counts calls."""
+
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+        self.calls = 0
+        self.down = False
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        if self.down:
+            raise ConnectionError("upstream unavailable")
+        return {"data": [{"id": str(self.calls), "caption": f"Post {self.calls}", "media_type": "IMAGE",
+                          "media_url": f"https://example.com/{self.calls}.jpg", "thumbnail_url": None,
+                          "permalink": f"https://instagram.com/p/{self.calls}", "timestamp": None}]}
+
+
+async def _burst(c, count: int) -> tuple[list[float], set]:
+    statuses = set()
+
+    async def one() -> float:
+        async def request():
+            r = await c.get("/api/instagram/feed")
+            statuses.add(r.status_code)
+        return await timed(request())
+
+    return list(await asyncio.gather(*(one() for _ in range(count)))), statuses
+
+
+async def _settle() -> None:
+    """Wait for the feed's in-flight background refresh, if any."""
+    if instagram_feed._refresh is not None:
+        await asyncio.gather(instagram_feed._refresh, return_exceptions=True)
+
+
+async def run(requests: int, upstream_ms: float) -> dict:
+    upstream = StubUpstream(upstream_ms / 1000)
+    clock = FakeClock()
+    disk_path = os.path.join(tempfile.mkdtemp(), "feed.json")
+    instagram_feed.fetch = upstream
+    instagram_feed.ttl = TTL_S
+    instagram_feed.retry_interval = 0
+    instagram_feed.disk_path = disk_path
+    instagram_feed.clock = clock
+
+    phases, checks = {}, {}
+    async with client() as c:
+        samples, statuses = await _burst(c, 50)
+        phases["cold"] = summarize(samples)
+        checks["cold_upstream_calls"] = (upstream.calls, 1)
+
+        samples, statuses = await _burst(c, requests)
+        phases["fresh"] = summarize(samples)
+        checks["fresh_upstream_calls"] = (upstream.calls, 1)
+
+        clock.advance(TTL_S)
+        samples, statuses = await _burst(c, requests)
+        phases["stale_while_revalidate"] = summarize(samples)
+        checks["stale_all_200"] = (statuses, {200})
+        await _settle()
+        checks["stale_refresh_coalesced"] = (upstream.calls, 2)
+
+        upstream.down = True
+        clock.advance(TTL_S)
+        samples, statuses = await _burst(c, requests)
+        phases["upstream_down"] = summarize(samples)
+        checks["upstream_down_all_200"] = (statuses, {200})
+        await _settle()
+        r = await c.get("/api/instagram/feed")
+        checks["upstream_down_serves_last_good"] = (r.status_code == 200 and r.json()["data"][0]["id"] == "2", True)
+        checks["upstream_failures_recorded"] = (instagram_feed.failures >= 1, True)
+
+        r2 = await c.get("/api/instagram/feed", headers={"If-None-Match": r.headers["etag"]})
+        checks["conditional_304"] = (r2.status_code, 304)
+
+    # Restart with the upstream still down: the disk snapshot answers without an upstream call.
+    calls = upstream.calls
+    restarted = SWRCache(upstream, ttl=TTL_S, retry_interval=60, disk_path=disk_path, clock=clock)
+    body, _, _ = await restarted.get()
+    checks["restart_serves_disk_snapshot"] = ((json.loads(body)["data"][0]["id"], upstream.calls - calls), ("2", 0))
+    await restarted.close()
+
+    return {
+        "upstream_ms": upstream_ms,
+        "phases": phases,
+        # Timing dependent, so reported rather than checked.
+        "stale_p99_below_upstream": phases["stale_while_revalidate"]["p99_ms"] < upstream_ms,
+        "upstream_calls": upstream.calls,
+        "feed": instagram_feed.stats(),
+        "checks": {name: {"got": got if not isinstance(got, set) else sorted(got),
+                          "expected": expected if not isinstance(expected, set) else sorted(expected)}
+                   for name, (got, expected) in checks.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--upstream-ms", type=float, default=300)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.requests, args.upstream_ms))
+    print(json.dumps(results, indent=2))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Principal cache revocation check.
+
+Registers a user, warms the token/principal caches through `GET /auth/me`,
+then checks that:
+- a user registered again under a cached email after being deleted resolves
+  to the new row, with its new role (registration invalidates the cached
+  principal);
+- an inactive principal found in the cache is rejected (401) and evicted;
+- a user deactivated in the database and invalidated is rejected on the
+  next request, and can no longer log in.
+
+Fails (exit 1) if any check does not hold.
+
+Usage:
+    python -m server.benchmarks.principal_cache
+"""
+import asyncio
+import dataclasses
+import json
+
+from sqlalchemy import delete, update
+
+from server.benchmarks.common import SEED_PASSWORD, client, reset_schema
+from server.database import get_engine
+from server.models.user import User
+from server.security import invalidate_principal, principal_cache
+
+EMAIL = "pc-user@example.com"
+
+
+async def _login(c) -> dict:
+    r = await c.post("/auth/login", json={"email": EMAIL, "password": SEED_PASSWORD})
+    return {"Authorization": f"Bearer {r.json()['access_token']}"} if r.status_code == 200 else {}
+
+
+async def run() -> dict:
+    await reset_schema()
+    checks = {}
+
+    async with client() as c:
+        await c.post("/auth/register", json={"email": EMAIL, "password": SEED_PASSWORD})
+        headers = await _login(c)
+        first_role = (await c.get("/auth/me", headers=headers)).json()["role"]
+
+        # Row deleted out of band, email registered again: the cache must not keep the old row.
+        async with get_engine().begin() as conn:
+            await conn.execute(delete(User).where(User.email == EMAIL))
+        await c.post("/auth/register", json={"email": EMAIL, "password": SEED_PASSWORD, "role": "admin"})
+        me = (await c.get("/auth/me", headers=headers)).json()
+        checks["re_registered_email_resolves_new_row"] = ((first_role, me["role"]), ("teacher", "admin"))
+
+        # An inactive principal that made it into the cache is refused and evicted.
+        principal_cache.set(EMAIL, dataclasses.replace(principal_cache.get(EMAIL), is_active=False))
+        checks["inactive_cached_principal_401"] = ((await c.get("/auth/me", headers=headers)).status_code, 401)
+        checks["inactive_cached_principal_evicted"] = (principal_cache.get(EMAIL) is None, True)
+
+        # Deactivation in the database plus invalidation: refused on the next request.
+        checks["reactivated_from_db_200"] = ((await c.get("/auth/me", headers=headers)).status_code, 200)
+        async with get_engine().begin() as conn:
+            await conn.execute(update(User).where(User.email == EMAIL).values(is_active=False))
+        invalidate_principal(email=EMAIL)
+        checks["deactivated_user_401"] = ((await c.get("/auth/me", headers=headers)).status_code, 401)
+        checks["deactivated_user_cannot_log_in"] = (await _login(c), {})
+
+    return {"checks": {name: {"got": got, "expected": expected} for name, (got, expected) in checks.items()}}
+
+
+def main() -> None:
+    results = asyncio.run(run())
+    print(json.dumps(results, indent=2))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Programs catalog check and benchmark.
+
+Serves a temporary copy of the catalog file through `GET /programs/` and
+`GET /programs/{id}` and checks:
+- content negotiation (identity, gzip, and br when `brotli` is installed),
+  with every encoding decoding to the same document;
+- ETag/304 (also across encodings), long-lived `immutable` responses for
+  `?v=<version>`, 404 for unknown ids;
+- hot reload: an edit is picked up by the watcher with a new version and
+  ETag, and an invalid edit keeps the previous snapshot.
+
+Then reports HTTP round-trip latency for the list, and the handler cost of
+serving precompiled bytes against building the response per request (read
+file, validate, serialize, gzip).
+Fails (exit 1) if any check does not hold.
+
+Usage:
+    python -m server.benchmarks.programs_catalog [--requests 500]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from fastapi import Request
+
+from server.benchmarks.common import client, summarize, timed
+from server.programs import PROGRAMS_DATA_FILE, brotli, programs_catalog
+from server.schemas import ProgramSchemas
+
+RELOAD_INTERVAL_S = 0.05
+
+
+def _naive_list_body(path: str) -> bytes:
+    """What a per-request handler would do: parse, validate, serialize, compress."""
+    with open(path, "rb") as f:
+        catalog = ProgramSchemas.Catalog.model_validate_json(f.read())
+    return gzip.compress(catalog.model_dump_json().encode())
+
+
+async def _edit(path: str, mutate) -> None:
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    mutate(document)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False)
+    await asyncio.sleep(RELOAD_INTERVAL_S * 4)
+
+
+async def run(requests: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "programs.json")
+    shutil.copyfile(PROGRAMS_DATA_FILE, path)
+    programs_catalog.path = path
+    checks = {}
+
+    async with client() as c:
+        r = await c.get("/programs/")
+        checks["before_load_503"] = (r.status_code, 503)
+
+        await programs_catalog.reload_if_changed()
+        watcher = asyncio.create_task(programs_catalog.run_reloader(RELOAD_INTERVAL_S))
+        try:
+            plain = await c.get("/programs/", headers={"Accept-Encoding": "identity"})
+            document = plain.json()
+            version = document["version"]
+            checks["list_200"] = (plain.status_code, 200)
+            checks["list_count"] = (len(document["programs"]), 8)
+            checks["list_fields"] = (sorted(document["programs"][0]), sorted(ProgramSchemas.Read.model_fields))
+
+            # httpx decodes Content-Encoding itself; compare the decoded bodies.
+            zipped = await c.get("/programs/", headers={"Accept-Encoding": "gzip"})
+            checks["gzip_encoding"] = (zipped.headers.get("content-encoding"), "gzip")
+            checks["gzip_same_document"] = (zipped.json() == document, True)
+            checks["gzip_vary"] = (zipped.headers.get("vary"), "Accept-Encoding")
+            preferred = await c.get("/programs/", headers={"Accept-Encoding": "gzip, deflate, br"})
+            checks["preferred_encoding"] = (preferred.headers.get("content-encoding"), "br" if brotli else "gzip")
+            refused = await c.get("/programs/", headers={"Accept-Encoding": "gzip;q=0, *;q=0"})
+            checks["q0_refuses_gzip"] = (refused.headers.get("content-encoding"), None)
+
+            r = await c.get("/programs/", headers={"If-None-Match": plain.headers["etag"], "Accept-Encoding": "gzip"})
+            checks["conditional_304_across_encodings"] = (r.status_code, 304)
+            checks["default_cache_control"] = (plain.headers["cache-control"], f"public, max-age={programs_catalog.max_age}")
+            r = await c.get(f"/programs/?v={version}")
+            checks["versioned_immutable"] = ("immutable" in r.headers["cache-control"], True)
+
+            detail = await c.get("/programs/informatica")
+            checks["detail_title"] = (detail.status_code == 200 and detail.json()["title"], "Informática")
+            checks["unknown_404"] = ((await c.get("/programs/no-such-program")).status_code, 404)
+
+            await _edit(path, lambda d: d["programs"][1].update(duration="3 años"))
+            edited = await c.get("/programs/informatica")
+            checks["hot_reload_detail"] = (edited.json()["duration"], "3 años")
+            r = await c.get("/programs/", headers={"If-None-Match": plain.headers["etag"]})
+            checks["hot_reload_new_etag_200"] = (r.status_code, 200)
+            checks["hot_reload_new_version"] = (r.json()["version"] != version, True)
+            version = r.json()["version"]
+
+            failures = programs_catalog.failures
+            await _edit(path, lambda d: d["programs"].append(dict(d["programs"][0])))  # duplicate id
+            r = await c.get("/programs/")
+            checks["invalid_edit_keeps_snapshot"] = ((r.status_code, r.json()["version"]), (200, version))
+            checks["invalid_edit_reported_once"] = (programs_catalog.failures - failures, 1)
+            shutil.copyfile(PROGRAMS_DATA_FILE, path)
+            await asyncio.sleep(RELOAD_INTERVAL_S * 4)
+
+            headers = {"Accept-Encoding": "gzip, deflate, br"}
+            round_trips = [await timed(c.get("/programs/", headers=headers)) for _ in range(requests)]
+        finally:
+            watcher.cancel()
+
+    request = Request({"type": "http", "method": "GET", "path": "/programs/", "query_string": b"",
+                       "headers": [(b"accept-encoding", b"gzip, deflate, br")]})
+    start = time.perf_counter()
+    for _ in range(requests):
+        programs_catalog.respond(request)
+    precompiled_us = (time.perf_counter() - start) / requests * 1e6
+    start = time.perf_counter()
+    for _ in range(requests):
+        _naive_list_body(path)
+    per_request_us = (time.perf_counter() - start) / requests * 1e6
+
+    return {
+        "requests": requests,
+        "catalog": programs_catalog.stats(),
+        "http_round_trip": summarize(round_trips),
+        "handler_us": {"precompiled": round(precompiled_us, 1), "build_per_request": round(per_request_us, 1)},
+        "checks": {name: {"got": got, "expected": expected} for name, (got, expected) in checks.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.requests))
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
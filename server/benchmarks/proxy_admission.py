@@ -0,0 +1,94 @@
+"""
+Password gate client-IP check behind a reverse proxy.
+
+Runs the IP bucket at its defaults (1/s, burst 10) and checks that:
+- with the proxy listed in TRUSTED_PROXIES, logins from many clients
+  forwarded by that one proxy each get their own bucket (no `ip_rate`
+  sheds), while one client forwarded many times is still limited;
+- X-Forwarded-For from an untrusted peer is ignored, so a client cannot
+  pick a fresh bucket per request;
+- trusted proxies chained in X-Forwarded-For are skipped, and entries left
+  of the client's (set by the client) are not used.
+
+Fails (exit 1) if any check does not hold.
+
+Usage:
+    python -m server.benchmarks.proxy_admission [--clients 50]
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+
+# The IP bucket's defaults apply; must run before `common` turns it off.
+os.environ["PASSWORD_IP_RATE"] = "1"
+os.environ["PASSWORD_IP_BURST"] = "10"
+
+from starlette.requests import Request
+
+from server.benchmarks.common import client, reset_schema
+from server.admission import password_gate
+
+PROXY = "10.0.0.5"
+
+
+def _request(peer: str, forwarded: list[str]) -> Request:
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+async def _logins(c, count: int, forwarded_for) -> int:
+    """POST /auth/login `count` times with unknown emails; returns how many got 429."""
+    shed = 0
+    for i in range(count):
+        r = await c.post("/auth/login", headers={"X-Forwarded-For": forwarded_for(i)},
+                         json={"email": f"nobody-{i}@example.com", "password": "wrong-password"})
+        shed += r.status_code == 429
+    return shed
+
+
+async def run(clients: int) -> dict:
+    await reset_schema()
+    checks = {}
+    trusted = (ipaddress.ip_network(f"{PROXY}/32"), ipaddress.ip_network("172.16.0.0/12"))
+    ip = password_gate.client_ip
+
+    password_gate.trusted_proxies = ()
+    checks["untrusted_peer_ignores_header"] = (ip(_request("203.0.113.9", ["198.51.100.1"])), "203.0.113.9")
+    password_gate.trusted_proxies = trusted
+    checks["trusted_peer_uses_header"] = (ip(_request(PROXY, ["198.51.100.1"])), "198.51.100.1")
+    checks["chained_proxies_skipped"] = (ip(_request(PROXY, ["198.51.100.1, 172.16.3.4"])), "198.51.100.1")
+    checks["forged_left_entries_ignored"] = (
+        ip(_request(PROXY, ["1.2.3.4", "198.51.100.1"])), "198.51.100.1")
+    checks["no_header_falls_back_to_peer"] = (ip(_request(PROXY, [])), PROXY)
+
+    async with client((PROXY, 1234)) as c:
+        password_gate.trusted_proxies = trusted
+        checks["many_clients_via_proxy_not_shed"] = (
+            await _logins(c, clients, lambda i: f"198.51.100.{i % 250 + 1}"), 0)
+        checks["one_client_via_proxy_limited"] = (
+            await _logins(c, 20, lambda i: "192.0.2.77") > 0, True)
+        password_gate.trusted_proxies = ()
+        checks["untrusted_proxy_shares_one_bucket"] = (
+            await _logins(c, 20, lambda i: f"192.0.2.{i + 100}") > 0, True)
+
+    return {"clients": clients, "gate": password_gate.stats(),
+            "checks": {name: {"got": got, "expected": expected} for name, (got, expected) in checks.items()}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=50)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.clients))
+    print(json.dumps(results, indent=2))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
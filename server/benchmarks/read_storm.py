@@ -0,0 +1,99 @@
+"""
+Read-storm (single-flight) benchmark.
+
+Fires N simultaneous identical `GET /teachers/?skip=0&limit=10` requests on
+a cold response cache, once with single-flight disabled and once enabled,
+and counts the SQL statements each run actually executed.
+
+Checks that single-flight collapses the storm to one query, and that
+cancelling the caller that started a shared read (a client disconnect)
+does not fail the callers waiting on it.
+Fails (exit 1) if a check does not hold.
+
+Usage:
+    python -m server.benchmarks.read_storm [--requests 200]
+"""
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import event
+
+from server import database
+from server.benchmarks.common import client, reset_schema, seed_teachers, summarize, timed
+from server.caching import teacher_responses
+from server.crud import teacherProfileCrud as crud
+from server.database import get_engine
+from server.singleflight import read_flights
+
+
+async def _storm(c, requests: int) -> dict:
+    queries = 0
+
+    def count(*_):
+        nonlocal queries
+        queries += 1
+
+    teacher_responses.invalidate()  # cold cache: every request reaches the CRUD layer
+    collapsed_before = read_flights.collapsed
+    event.listen(get_engine().sync_engine, "before_cursor_execute", count)
+    try:
+        samples = await asyncio.gather(*(timed(c.get("/teachers/?skip=0&limit=10")) for _ in range(requests)))
+    finally:
+        event.remove(get_engine().sync_engine, "before_cursor_execute", count)
+    return {
+        "db_queries": queries,
+        "collapsed_calls": read_flights.collapsed - collapsed_before,
+        "latency": summarize(list(samples)),
+    }
+
+
+async def _leader_cancelled(followers: int) -> list:
+    """Start a shared read, join it `followers` times, cancel the starter; return what the followers got."""
+    async def read():
+        async with database.SessionLocal() as session:
+            return await crud.list_active_teachers(session, skip=0, limit=10)
+
+    leader = asyncio.create_task(read())
+    await asyncio.sleep(0)
+    joined = [asyncio.create_task(read()) for _ in range(followers)]
+    await asyncio.sleep(0)
+    leader.cancel()
+    results = await asyncio.gather(*joined, return_exceptions=True)
+    return [len(r) if isinstance(r, list) else type(r).__name__ for r in results]
+
+
+async def run(requests: int) -> dict:
+    await reset_schema()
+    await seed_teachers(1000)
+    async with client() as c:
+        read_flights.enabled = False
+        without = await _storm(c, requests)
+        read_flights.enabled = True
+        with_sf = await _storm(c, requests)
+        cancelled = await _leader_cancelled(20)
+    checks = {
+        "single_flight_one_query": (with_sf["db_queries"], 1),
+        "followers_survive_cancelled_leader": (cancelled, [10] * 20),
+    }
+    return {
+        "requests": requests, "without_single_flight": without, "with_single_flight": with_sf,
+        "checks": {name: {"got": got, "expected": expected} for name, (got, expected) in checks.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.requests))
+    print(json.dumps(results, indent=2))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Read/write splitting check with two SQLite files.
+
+`primary.db` stands in for the primary and `replica.db` for a replica whose
+teacher rows are named differently ("Replica N"), so every response shows
+which database served it. A second replica URL points at a directory that
+does not exist, to exercise the health checks. Fails (exit 1) if:
+- directory reads are not served by the replica,
+- a teacher creation does not land on the primary only,
+- the writing client (or this worker's cache refill) does not read its own
+  write during the sticky window, or stays pinned after it,
+- a client pinned to the primary joins a single-flight read that another
+  client started against the replica,
+- the broken replica is not marked down.
+
+Usage:
+    python -m server.benchmarks.replica_routing
+"""
+import os
+
+# Must be set before any `server.*` module reads the environment.
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///./primary.db"
+os.environ["DATABASE_REPLICA_URLS"] = "sqlite+aiosqlite:///./replica.db,sqlite+aiosqlite:////nonexistent-dir/down.db"
+os.environ["REPLICA_STICKY_SECONDS"] = "1"
+os.environ["REPLICA_HEALTH_INTERVAL"] = "0"
+
+import asyncio
+import json
+
+import httpx
+from sqlalchemy import insert, select
+
+from server import database
+from server.benchmarks.common import SEED_PASSWORD, client, reset_schema, seed_teachers
+from server.crud import teacherProfileCrud as crud
+from server.database import Base, STICKY_COOKIE, get_engine, replicas, warm_up
+from server.main import app
+from server.models.teacherProfile import TeacherProfile
+from server.models.user import User
+
+STICKY_WAIT_S = 1.2
+
+
+async def _seed_replica(count: int) -> None:
+    async with replicas.engines()[0].begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"id": i, "email": f"replica-{i}@example.com", "password_hash": "x", "role": "teacher", "is_active": True}
+            for i in range(1, count + 1)
+        ])
+        await conn.execute(insert(TeacherProfile), [
+            {"id": i, "user_id": i, "name": f"Replica {i}", "bio": "", "image_url": "", "is_active": True}
+            for i in range(1, count + 1)
+        ])
+
+
+def _served_by(response: httpx.Response) -> str:
+    payload = response.json()
+    if isinstance(payload, dict):
+        payload = payload.get("items", [payload])
+    names = {item["name"].split()[0] for item in payload}
+    return "replica" if names == {"Replica"} else "primary" if "Replica" not in names else "mixed"
+
+
+async def _names_in(engine, name: str) -> int:
+    async with engine.connect() as conn:
+        rows = await conn.execute(select(TeacherProfile.id).where(TeacherProfile.name == name))
+        return len(rows.all())
+
+
+async def _list_names(pinned: bool) -> str:
+    """First page through single-flight, as a client pinned to the primary or not."""
+    if pinned:
+        database._pinned_to_primary.set(True)  # this task's context only
+    async with database.SessionLocal() as session:
+        rows = await crud.list_active_teachers(session, skip=0, limit=3)
+    return "replica" if rows[0].name.startswith("Replica") else "primary"
+
+
+async def run() -> dict:
+    await reset_schema()
+    await seed_teachers(5)
+    await _seed_replica(5)
+    checks = {"startup_replicas_healthy": (await warm_up())["replicas_healthy"]}
+
+    async with client() as a:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as b:
+            checks["read_list"] = _served_by(await a.get("/teachers/?limit=3"))
+            checks["read_by_id"] = _served_by(await a.get("/teachers/2"))
+
+            await a.post("/auth/register", json={"email": "rr-admin@example.com", "password": SEED_PASSWORD, "role": "admin"})
+            login = await a.post("/auth/login", json={"email": "rr-admin@example.com", "password": SEED_PASSWORD})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            await asyncio.sleep(STICKY_WAIT_S)
+
+            created = await a.post("/teachers/", headers=headers, json={"name": "Fresh Teacher"})
+            checks["write_status"] = created.status_code
+            checks["write_sets_sticky_cookie"] = STICKY_COOKIE in created.cookies
+            checks["write_on_primary"] = await _names_in(get_engine(), "Fresh Teacher")
+            checks["write_on_replica"] = await _names_in(replicas.engines()[0], "Fresh Teacher")
+
+            checks["writer_read_after_write"] = _served_by(await a.get("/teachers/?limit=50"))
+            checks["other_client_read_after_write"] = _served_by(await b.get("/teachers/?limit=49"))
+            await asyncio.sleep(STICKY_WAIT_S)
+            checks["writer_read_after_window"] = _served_by(await a.get("/teachers/?limit=48"))
+
+            # Same arguments at the same time: the pinned caller must not share the replica read.
+            checks["concurrent_unpinned_and_pinned"] = list(await asyncio.gather(_list_names(False), _list_names(True)))
+
+    checks["replicas"] = replicas.stats()
+    return checks
+
+
+EXPECTED = {
+    "startup_replicas_healthy": [True, False],
+    "read_list": "replica",
+    "read_by_id": "replica",
+    "write_status": 201,
+    "write_sets_sticky_cookie": True,
+    "write_on_primary": 1,
+    "write_on_replica": 0,
+    "writer_read_after_write": "primary",
+    "other_client_read_after_write": "primary",
+    "writer_read_after_window": "replica",
+    "concurrent_unpinned_and_pinned": ["replica", "primary"],
+}
+
+
+def main() -> None:
+    checks = asyncio.run(run())
+    print(json.dumps(checks, indent=2))
+    failures = [f"{key}: {checks[key]!r} (expected {value!r})" for key, value in EXPECTED.items() if checks[key] != value]
+    for failure in failures:
+        print("FAIL:", failure)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
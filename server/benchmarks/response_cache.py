@@ -0,0 +1,102 @@
+"""
+Teacher response cache check.
+
+Seeds N teachers, then checks that the response cache:
+- ignores query parameters the route does not declare (`/teachers/all?x=1`,
+  `?x=2`, ... share the one cached body);
+- shares an entry between spellings that parse to the same values
+  (`limit=10` / `limit=010`, reordered `fields`);
+- keeps distinct entries for really distinct requests, and rejects
+  out-of-range page sizes (422) without caching anything;
+- never holds more body bytes than its cap, evicting least recently used
+  entries, and skips bodies larger than the cap;
+- still answers If-None-Match with 304.
+
+Fails (exit 1) if any check does not hold.
+
+Usage:
+    python -m server.benchmarks.response_cache [--teachers 2000] [--junk 200]
+"""
+import argparse
+import asyncio
+import json
+
+from server.benchmarks.common import client, reset_schema, seed_teachers
+from server.caching import teacher_responses
+
+# Field sets giving distinct, legitimately different /teachers/all bodies.
+FIELD_SETS = ["name", "bio", "image_url", "is_active", "user_id", "name,bio", "name,image_url", "bio,user_id"]
+
+
+async def run(teachers: int, junk: int) -> dict:
+    await reset_schema()
+    await seed_teachers(teachers)
+    results, checks = {"teachers": teachers, "junk_requests": junk}, {}
+    cache = teacher_responses._entries
+
+    async with client() as c:
+        teacher_responses.invalidate()
+        full = await c.get("/teachers/all")
+        for i in range(junk):
+            r = await c.get("/teachers/all", params={"x": i, "utm_source": f"junk-{i}"})
+            assert r.content == full.content
+        results["after_junk"] = {"entries": len(cache), "bytes": cache.size}
+        checks["junk_params_share_one_entry"] = (len(cache), 1)
+        checks["junk_params_bytes"] = (cache.size, len(full.content))
+
+        await c.get("/teachers/", params={"limit": 10})
+        await c.get("/teachers/", params={"limit": "010", "skip": "0"})
+        await c.get("/teachers/all", params={"fields": "name,image_url"})
+        await c.get("/teachers/all", params={"fields": "image_url, name,id"})
+        checks["same_values_share_entries"] = (len(cache), 3)
+        await c.get("/teachers/", params={"limit": 20})
+        await c.get("/teachers/", params={"limit": 10, "cursor": ""})
+        checks["distinct_requests_distinct_entries"] = (len(cache), 5)
+        statuses = [(await c.get("/teachers/", params={"cursor": "", "limit": limit})).status_code
+                    for limit in (-5, 0, 101, 100000)]
+        checks["out_of_range_limit_422_not_cached"] = ((statuses, len(cache)), ([422] * 4, 5))
+
+        r = await c.get("/teachers/all", headers={"If-None-Match": full.headers["etag"]})
+        checks["etag_304"] = (r.status_code, 304)
+
+        # Byte cap: room for about three full bodies, then many distinct bodies.
+        max_size = cache.max_size
+        cache.max_size = 3 * len(full.content)
+        peak = 0
+        for fields in FIELD_SETS:
+            await c.get("/teachers/all", params={"fields": fields})
+            peak = max(peak, cache.size)
+        await c.get("/teachers/all")
+        results["capped"] = {"max_bytes": cache.max_size, "peak_bytes": peak, "entries": len(cache),
+                             "evictions": cache.evictions}
+        checks["bytes_never_above_cap"] = (peak <= cache.max_size and cache.size <= cache.max_size, True)
+        hits = cache.hits
+        await c.get("/teachers/all")
+        checks["most_recent_still_cached"] = (cache.hits - hits, 1)
+
+        cache.max_size = len(full.content) - 1
+        teacher_responses.invalidate()
+        r = await c.get("/teachers/all")
+        checks["oversized_body_served_not_stored"] = ((r.status_code, len(cache)), (200, 0))
+        cache.max_size = max_size
+
+    results["checks"] = {name: {"got": got, "expected": expected} for name, (got, expected) in checks.items()}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teachers", type=int, default=2000)
+    parser.add_argument("--junk", type=int, default=200)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.teachers, args.junk))
+    print(json.dumps(results, indent=2))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
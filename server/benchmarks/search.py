@@ -0,0 +1,117 @@
+"""
+Directory search benchmark: in-memory index vs `LIKE '%q%'`.
+
+Seeds N teacher profiles with varied Spanish names and bios, builds the
+index the way startup does, then times a set of queries against the index
+and against the DB fallback (`crud.search_active_teachers` on a non-MySQL
+backend issues `LIKE '%word%'` per word).
+
+Then checks the cross-worker sync: a profile renamed and another
+deactivated directly in the database (as another worker would) are picked
+up by one index sync step. Fails (exit 1) if they are not.
+
+Usage:
+    python -m server.benchmarks.search [--rows 50000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from datetime import timedelta
+
+from sqlalchemy import insert, update
+
+from server.benchmarks.common import reset_schema
+from server.crud import teacherProfileCrud as crud
+from server.database import SessionLocal, dispose_engine, get_engine
+from server.main import _active_teacher_snapshots, _settled_watermark, _sync_search_index
+from server.models.teacherProfile import TeacherProfile
+from server.models.user import User
+from server.search import teacher_index
+
+FIRST = ["José", "María", "Ana", "Luis", "Carmen", "Andrés", "Sofía", "Raúl", "Inés", "Ñeri"]
+LAST = ["Pérez", "Núñez", "Rodríguez", "González", "Hernández", "Díaz", "Márquez", "Suárez"]
+SUBJECTS = ["matemáticas", "física", "química", "biología", "historia", "inglés", "electrónica",
+            "informática", "dibujo técnico", "educación física", "castellano", "geografía"]
+QUERIES = ["matem", "quimica", "jose", "nunez fis", "electro", "maria historia", "informatica", "dibujo tec"]
+
+
+async def _seed(rows: int) -> None:
+    rng = random.Random(7)
+    async with get_engine().begin() as conn:
+        for start in range(0, rows, 5000):
+            ids = range(start + 1, min(start + 5000, rows) + 1)
+            await conn.execute(insert(User), [
+                {"id": i, "email": f"s{i}@example.com", "password_hash": "x", "role": "teacher", "is_active": True}
+                for i in ids
+            ])
+            await conn.execute(insert(TeacherProfile), [
+                {"id": i, "user_id": i, "is_active": True, "image_url": f"{i}.jpg",
+                 "name": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+                 "bio": f"Profesor de {rng.choice(SUBJECTS)} y {rng.choice(SUBJECTS)} con {rng.randint(1, 30)} años de experiencia."}
+                for i in ids
+            ])
+
+
+async def run(rows: int, repeat: int) -> dict:
+    await reset_schema()
+    await _seed(rows)
+
+    start = time.perf_counter()
+    synced_until = _settled_watermark()
+    await teacher_index.rebuild(_active_teacher_snapshots())
+    build_s = time.perf_counter() - start
+
+    per_query = {}
+    async with SessionLocal() as session:
+        for q in QUERIES:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                hits = teacher_index.search(q, limit=10)
+            index_ms = (time.perf_counter() - start) / repeat * 1000
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                db_hits = await crud.search_active_teachers.__wrapped__(session, q, limit=10)
+            like_ms = (time.perf_counter() - start) / repeat * 1000
+            per_query[q] = {"index_ms": round(index_ms, 3), "like_ms": round(like_ms, 3),
+                            "index_hits": len(hits), "like_hits": len(db_hits)}
+
+    # Writes from another worker: only the change feed tells this index about them.
+    renamed, deactivated = teacher_index.search("matem", limit=2)
+    changed_at = synced_until + timedelta(microseconds=1)
+    async with get_engine().begin() as conn:
+        await conn.execute(update(TeacherProfile).where(TeacherProfile.id == renamed["id"])
+                           .values(name="Zacarías Quintero", updated_at=changed_at))
+        await conn.execute(update(TeacherProfile).where(TeacherProfile.id == deactivated["id"])
+                           .values(is_active=False, updated_at=changed_at))
+    before = [p["id"] for p in teacher_index.search("zacarias quint")]
+    await _sync_search_index(synced_until)
+    checks = {
+        "renamed_found_after_sync": (
+            (before, [p["id"] for p in teacher_index.search("zacarias quint")]), ([], [renamed["id"]])),
+        "deactivated_gone_after_sync": (deactivated["id"] in teacher_index._docs, False),
+    }
+    await dispose_engine()
+    return {"rows": rows, "index_build_s": round(build_s, 2), "indexed": len(teacher_index), "queries": per_query,
+            "checks": {name: {"got": got, "expected": expected} for name, (got, expected) in checks.items()}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.rows, args.repeat))
+    print(json.dumps(results, indent=2))
+    failures = [name for name, check in results["checks"].items() if check["got"] != check["expected"]]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
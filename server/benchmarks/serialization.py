@@ -0,0 +1,78 @@
+"""
+Serialization benchmark for teacher list responses.
+
+Times turning 1,000 TeacherProfile ORM objects into a JSON body three ways:
+- compat: per-object model_validate -> jsonable_encoder -> stdlib json
+  (what a `response_model=list[...]` endpoint with JSONResponse does),
+- compat + orjson: the same path rendered by ORJSONResponse,
+- adapter: the cached TypeAdapter `dump_json` used by the teachers router.
+
+No database is needed; the ORM objects are built in memory.
+
+Usage:
+    python -m server.benchmarks.serialization [--profiles 1000] [--repeat 50]
+"""
+import argparse
+import json
+import time
+
+import server.benchmarks.common  # noqa: F401  (sets DATABASE_URL / SECRET_KEY)
+from fastapi.encoders import jsonable_encoder
+
+from server.models.teacherProfile import TeacherProfile
+from server.schemas import TeacherSchemas
+from server.schemas.serializers import dump_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _profiles(count: int) -> list:
+    return [
+        TeacherProfile(id=i, user_id=i, name=f"Teacher {i}", bio="Profesor de matemáticas y física " * 4,
+                       image_url=f"{i}.jpg", is_active=True)
+        for i in range(1, count + 1)
+    ]
+
+
+def _compat(rows) -> bytes:
+    models = [TeacherSchemas.Read.model_validate(row, from_attributes=True) for row in rows]
+    return json.dumps(jsonable_encoder(models), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _compat_orjson(rows) -> bytes:
+    models = [TeacherSchemas.Read.model_validate(row, from_attributes=True) for row in rows]
+    return orjson.dumps(jsonable_encoder(models))
+
+
+def _adapter(rows) -> bytes:
+    return dump_json(list[TeacherSchemas.Read], rows)
+
+
+def _time(fn, rows, repeat: int) -> float:
+    fn(rows)  # warm-up (builds cached validators/adapters)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = _profiles(args.profiles)
+    assert json.loads(_compat(rows)) == json.loads(_adapter(rows))
+    results = {"profiles": args.profiles, "ms_per_response": {"compat_stdlib_json": round(_time(_compat, rows, args.repeat), 3)}}
+    if orjson is not None:
+        results["ms_per_response"]["compat_orjson"] = round(_time(_compat_orjson, rows, args.repeat), 3)
+    results["ms_per_response"]["cached_type_adapter"] = round(_time(_adapter, rows, args.repeat), 3)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
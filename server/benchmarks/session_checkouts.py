@@ -0,0 +1,89 @@
+"""
+Per-request connection checkout check.
+
+Counts pool checkouts for representative requests and fails (exit 1) if any
+request checks out more connections than expected: authenticated writes must
+share one session between `get_current_user` and the route, and requests
+that never run SQL (unauthenticated, cached) must not touch the pool.
+
+Usage:
+    python -m server.benchmarks.session_checkouts
+"""
+import asyncio
+import json
+
+from sqlalchemy import event
+
+from server.benchmarks.common import SEED_PASSWORD, client, reset_schema, seed_teachers
+from server.database import get_engine
+from server.security import clear_principal_cache
+
+# (label, method, path, needs admin token, cold principal cache, expected checkouts)
+CASES = [
+    ("root", "GET", "/", False, False, 0),
+    ("unauthenticated /auth/me", "GET", "/auth/me", False, False, 0),
+    ("/auth/me, cold identity cache", "GET", "/auth/me", True, True, 1),
+    ("/auth/me, warm identity cache", "GET", "/auth/me", True, False, 0),
+    ("list teachers, cold", "GET", "/teachers/?limit=5", False, False, 1),
+    ("list teachers, cached", "GET", "/teachers/?limit=5", False, False, 0),
+    ("teacher by id, cold", "GET", "/teachers/1", False, False, 1),
+    ("teachers batch, cold", "GET", "/teachers/batch?ids=2,3,4", False, False, 1),
+    ("create teacher, cold identity cache", "POST", "/teachers/", True, True, 1),
+    ("create teacher, warm identity cache", "POST", "/teachers/", True, False, 1),
+    ("login", "POST", "/auth/login", False, False, 1),
+]
+
+
+class Checkouts:
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(get_engine().sync_engine, "checkout", self._checkout)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(get_engine().sync_engine, "checkout", self._checkout)
+
+    def _checkout(self, *_):
+        self.count += 1
+
+
+async def run() -> list[dict]:
+    await reset_schema()
+    await seed_teachers(20)
+    results = []
+    async with client() as c:
+        await c.post("/auth/register", json={"email": "co-admin@example.com", "password": SEED_PASSWORD, "role": "admin"})
+        login = await c.post("/auth/login", json={"email": "co-admin@example.com", "password": SEED_PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        for n, (label, method, path, auth, cold, expected) in enumerate(CASES):
+            if cold:
+                clear_principal_cache()
+            body = None
+            if path == "/teachers/" and method == "POST":
+                body = {"name": f"Checkout {n}", "email": f"co-{n}@example.com"}
+            elif path == "/auth/login":
+                body = {"email": "co-admin@example.com", "password": SEED_PASSWORD}
+            with Checkouts() as checkouts:
+                r = await c.request(method, path, json=body, headers=headers if auth else None)
+            results.append({
+                "request": label, "status": r.status_code,
+                "checkouts": checkouts.count, "expected": expected,
+            })
+    return results
+
+
+def main() -> None:
+    results = asyncio.run(run())
+    print(json.dumps(results, indent=2))
+    failures = [r for r in results if r["checkouts"] != r["expected"] or r["status"] >= 500]
+    for failure in failures:
+        print(f"FAIL: {failure['request']}: {failure['checkouts']} checkouts (expected {failure['expected']})")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Sparse fieldsets (`?fields=`) check and benchmark for the teacher lists.
+
+Seeds N teachers with a 500-character bio, then compares whole profiles
+against `fields=id,name,image_url` (the directory grid):
+- bytes on the wire for `GET /teachers/all` and one `GET /teachers/` page;
+- query + fetch time of `get_active_teachers` (CRUD call, fresh session);
+- end-to-end time of `GET /teachers/all` with the response cache cleared.
+
+Checks that:
+- sparse responses carry exactly the requested fields (plus `id`), in
+  every mode (offset, cursor, buffered `/all`, streamed NDJSON);
+- the emitted SQL selects only the requested columns;
+- field order and repeats do not matter, naming every field gives the
+  full response, and an unknown field answers 400.
+
+Fails (exit 1) if any check does not hold.
+
+Usage:
+    python -m server.benchmarks.sparse_fields [--teachers 20000] [--repeat 10]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from sqlalchemy import event, update
+
+from server import database
+from server.benchmarks.common import client, reset_schema, seed_teachers
+from server.caching import teacher_responses
+from server.crud import teacherProfileCrud as crud
+from server.database import get_engine
+from server.models.teacherProfile import TeacherProfile
+
+GRID_FIELDS = "id,name,image_url"
+GRID_COLUMNS = ("name", "image_url", "id")
+BIO = ("Profesora de matemáticas y física con experiencia en olimpiadas. " * 8)[:500]
+
+
+async def _median_ms(fn, repeat: int) -> float:
+    await fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+async def _query(columns) -> None:
+    async with database.SessionLocal() as session:
+        await crud.get_active_teachers(session, columns=columns)
+
+
+async def run(teachers: int, repeat: int) -> dict:
+    await reset_schema()
+    await seed_teachers(teachers)
+    async with get_engine().begin() as conn:
+        await conn.execute(update(TeacherProfile).values(bio=BIO))
+    results, checks = {"teachers": teachers, "repeat": repeat}, {}
+    grid_keys = sorted(GRID_COLUMNS)
+
+    async with client() as c:
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(get_engine().sync_engine, "before_cursor_execute", record)
+        full = await c.get("/teachers/all")
+        sparse = await c.get("/teachers/all", params={"fields": GRID_FIELDS})
+        event.remove(get_engine().sync_engine, "before_cursor_execute", record)
+        sparse_sql = [s for s in statements if "FROM teacher_profiles" in s][-1].split("FROM")[0]
+        checks["sql_selects_only_requested_columns"] = (
+            sorted(col for col in ("id", "user_id", "name", "bio", "image_url", "is_active", "created_at")
+                   if f"teacher_profiles.{col}" in sparse_sql),
+            grid_keys,
+        )
+
+        results["all_bytes"] = {"full": len(full.content), "fields": len(sparse.content),
+                                "saved_pct": round(100 * (1 - len(sparse.content) / len(full.content)), 1)}
+        checks["all_same_rows"] = ([p["id"] for p in sparse.json()], [p["id"] for p in full.json()])
+        checks["all_only_requested_keys"] = (sorted({tuple(sorted(p)) for p in sparse.json()}), [tuple(grid_keys)])
+
+        page_full = await c.get("/teachers/", params={"limit": 50})
+        page_sparse = await c.get("/teachers/", params={"limit": 50, "fields": GRID_FIELDS})
+        results["page_bytes"] = {"full": len(page_full.content), "fields": len(page_sparse.content)}
+        checks["offset_only_requested_keys"] = (sorted({tuple(sorted(p)) for p in page_sparse.json()}), [tuple(grid_keys)])
+
+        ids, cursor = [], ""
+        while cursor is not None:
+            page = (await c.get("/teachers/", params={"limit": 100, "cursor": cursor, "fields": "name"})).json()
+            ids += [p["id"] for p in page["items"]]
+            checks["cursor_only_requested_keys"] = (sorted({tuple(sorted(p)) for p in page["items"]}), [("id", "name")])
+            cursor = page["next_cursor"]
+        checks["cursor_pages_every_profile"] = (ids, list(range(1, teachers + 1)))
+
+        streamed = await c.get("/teachers/all", params={"stream": "ndjson", "fields": GRID_FIELDS})
+        lines = [json.loads(line) for line in streamed.text.splitlines()]
+        checks["stream_same_as_buffered"] = (lines, sparse.json())
+
+        reordered = await c.get("/teachers/all", params={"fields": "image_url, name,name"})
+        checks["field_order_irrelevant"] = (reordered.content, sparse.content)
+        every = await c.get("/teachers/all", params={"fields": "user_id,bio,is_active,name,image_url"})
+        checks["all_fields_is_full_response"] = (every.content, full.content)
+        r = await c.get("/teachers/", params={"fields": "name,password_hash"})
+        checks["unknown_field_400"] = (r.status_code, 400)
+
+        results["query_ms"] = {
+            "full": await _median_ms(lambda: _query(None), repeat),
+            "fields": await _median_ms(lambda: _query(GRID_COLUMNS), repeat),
+        }
+
+        async def uncached(params):
+            teacher_responses.invalidate()
+            r = await c.get("/teachers/all", params=params)
+            assert r.status_code == 200, r.text
+        results["all_uncached_ms"] = {
+            "full": await _median_ms(lambda: uncached({}), repeat),
+            "fields": await _median_ms(lambda: uncached({"fields": GRID_FIELDS}), repeat),
+        }
+        checks["sparse_query_faster"] = (results["query_ms"]["fields"] < results["query_ms"]["full"], True)
+        checks["sparse_response_smaller"] = (results["all_bytes"]["fields"] < results["all_bytes"]["full"] / 3, True)
+
+    results["checks"] = {
+        name: {"got": got, "expected": expected} if name not in _BULKY else {"ok": got == expected}
+        for name, (got, expected) in checks.items()
+    }
+    return results
+
+
+# Checks whose values are whole responses; reported as pass/fail only.
+_BULKY = {"all_same_rows", "cursor_pages_every_profile", "stream_same_as_buffered",
+          "field_order_irrelevant", "all_fields_is_full_response"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teachers", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.teachers, args.repeat))
+    print(json.dumps(results, indent=2, ensure_ascii=False, default=str))
+    failures = [name for name, check in results["checks"].items()
+                if not check.get("ok", check.get("got") == check.get("expected"))]
+    for name in failures:
+        print("FAIL:", name, results["checks"][name])
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
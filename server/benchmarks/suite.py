@@ -0,0 +1,197 @@
+"""
+Benchmark suite for the auth and teachers API.
+
+Seeds a configurable volume of users / teacher profiles, then drives each
+scenario at several concurrency levels through the in-process ASGI app and
+reports throughput and p50/p95/p99 latency. Results are written as JSON so
+two runs (e.g. two commits) can be compared with `--compare`.
+
+Usage:
+    python -m server.benchmarks.suite --users 1000 --teachers 1000 \\
+        --concurrency 1,10,50 --requests 200 --output bench-results.json
+    python -m server.benchmarks.suite ... --compare bench-baseline.json
+
+Point DATABASE_URL at a local MySQL instead of the default SQLite file to
+benchmark against the production driver.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from server.benchmarks.common import SEED_PASSWORD, client, reset_schema, seed, seed_email, summarize
+
+# Scenario -> coroutine factory(client, counter, ctx) issuing one request.
+SCENARIOS = {}
+# /teachers/all returns the whole table; cap its request count per level.
+ALL_TEACHERS_MAX_REQUESTS = 20
+
+
+def scenario(name: str):
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+@scenario("POST /auth/register")
+async def _register(c, n, ctx):
+    return await c.post("/auth/register", json={
+        "email": f"bench-{ctx['run_id']}-{next(ctx['emails'])}@example.com", "password": SEED_PASSWORD,
+    })
+
+
+@scenario("POST /auth/login")
+async def _login(c, n, ctx):
+    return await c.post("/auth/login", json={
+        "email": seed_email(random.randint(1, ctx["users"])), "password": SEED_PASSWORD,
+    })
+
+
+@scenario("GET /auth/me")
+async def _me(c, n, ctx):
+    return await c.get("/auth/me", headers=ctx["auth_headers"])
+
+
+@scenario("GET /teachers/")
+async def _list(c, n, ctx):
+    skip = random.randint(0, max(0, ctx["teachers"] - 10))
+    return await c.get(f"/teachers/?skip={skip}&limit=10")
+
+
+@scenario("GET /teachers/{id}")
+async def _get_one(c, n, ctx):
+    return await c.get(f"/teachers/{random.randint(1, ctx['teachers'])}")
+
+
+@scenario("GET /teachers/all")
+async def _all(c, n, ctx):
+    return await c.get("/teachers/all")
+
+
+async def _run_level(c, fn, ctx, concurrency: int, requests: int) -> dict:
+    counter = itertools.count()
+    samples: list[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while True:
+            n = next(counter)
+            if n >= requests:
+                return
+            start = time.perf_counter()
+            response = await fn(c, n, ctx)
+            samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"concurrency": concurrency, "throughput_rps": round(requests / elapsed, 2),
+            "errors": errors, **summarize(samples)}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(users: int, teachers: int, levels: list[int], requests: int, only: list[str] | None) -> dict:
+    await reset_schema()
+    start = time.perf_counter()
+    await seed(users, teachers)
+    seed_s = time.perf_counter() - start
+
+    results = {}
+    async with client() as c:
+        login = await c.post("/auth/login", json={"email": seed_email(1), "password": SEED_PASSWORD})
+        login.raise_for_status()
+        ctx = {
+            "users": users,
+            "teachers": max(1, teachers),
+            "run_id": int(time.time()),
+            "emails": itertools.count(),  # unique across concurrency levels
+            "auth_headers": {"Authorization": f"Bearer {login.json()['access_token']}"},
+        }
+        for name, fn in SCENARIOS.items():
+            if only and name not in only:
+                continue
+            count = min(requests, ALL_TEACHERS_MAX_REQUESTS) if name == "GET /teachers/all" else requests
+            results[name] = [await _run_level(c, fn, ctx, level, count) for level in levels]
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+            "users": users,
+            "teachers": teachers,
+            "requests_per_level": requests,
+            "seed_seconds": round(seed_s, 2),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions where p99 grew or throughput fell by more than `tolerance` (fraction)."""
+    regressions = []
+    for name, levels in current["results"].items():
+        base_levels = {row["concurrency"]: row for row in baseline.get("results", {}).get(name, [])}
+        for row in levels:
+            base = base_levels.get(row["concurrency"])
+            if not base:
+                continue
+            if base["p99_ms"] and row["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+                regressions.append(f"{name} c={row['concurrency']}: p99 {base['p99_ms']} -> {row['p99_ms']} ms")
+            if base["throughput_rps"] and row["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+                regressions.append(
+                    f"{name} c={row['concurrency']}: throughput {base['throughput_rps']} -> {row['throughput_rps']} rps"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000, help="e.g. 1000, 100000, 1000000")
+    parser.add_argument("--teachers", type=int, default=1000)
+    parser.add_argument("--concurrency", default="1,10,50", help="comma-separated levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and level")
+    parser.add_argument("--only", help="comma-separated scenario names, e.g. 'GET /teachers/,GET /auth/me'")
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed regression fraction")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    report = asyncio.run(run(args.users, args.teachers, levels, args.requests, only))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print("REGRESSION:", line)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
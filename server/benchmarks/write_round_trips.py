@@ -0,0 +1,119 @@
+"""
+Write-path round-trip check.
+
+Counts the SQL statements and COMMITs issued by `POST /auth/register` and
+admin `POST /teachers/`, with native INSERT ... RETURNING and with the
+MySQL-style lastrowid emulation, and fails (exit 1) if either path needs
+more than the expected number of statements. Also checks that duplicate
+emails still map to 400, that no password admission slot is held while
+SQL runs, and that `POST /teachers/` hashes with no connection checked out.
+
+Usage:
+    python -m server.benchmarks.write_round_trips
+"""
+import asyncio
+import json
+
+from sqlalchemy import event
+
+from server.benchmarks.common import SEED_PASSWORD, client, reset_schema
+from server.admission import password_gate
+from server.database import get_engine
+from server.routers import teachers as teachers_router
+
+# Expected statements per request (COMMIT counted separately).
+EXPECTED = {"register": 1, "create_teacher": 2}
+
+
+class RoundTrips:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        self.gate_slots = 0  # most password gate slots held while a statement ran
+
+    def __enter__(self):
+        event.listen(get_engine().sync_engine, "before_cursor_execute", self._statement)
+        event.listen(get_engine().sync_engine, "commit", self._commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(get_engine().sync_engine, "before_cursor_execute", self._statement)
+        event.remove(get_engine().sync_engine, "commit", self._commit)
+
+    def _statement(self, *_):
+        self.statements += 1
+        self.gate_slots = max(self.gate_slots, password_gate.in_flight)
+
+    def _commit(self, *_):
+        self.commits += 1
+
+
+async def _measure(c, tag: str, headers: dict) -> dict:
+    with RoundTrips() as register:
+        r = await c.post("/auth/register", json={"email": f"rt-{tag}@example.com", "password": SEED_PASSWORD})
+        assert r.status_code == 201, r.text
+    r = await c.post("/auth/register", json={"email": f"rt-{tag}@example.com", "password": SEED_PASSWORD})
+    assert r.status_code == 400, r.text
+
+    checked_out = []
+    hash_password = teachers_router.hash_password
+
+    async def recording_hash(password: str) -> str:
+        checked_out.append(get_engine().pool.checkedout())
+        return await hash_password(password)
+    teachers_router.hash_password = recording_hash
+    try:
+        with RoundTrips() as create:
+            r = await c.post("/teachers/", headers=headers, json={"name": f"RT {tag}", "email": f"rt-t-{tag}@example.com"})
+            assert r.status_code == 201, r.text
+    finally:
+        teachers_router.hash_password = hash_password
+    return {
+        "register": {"statements": register.statements, "commits": register.commits,
+                     "gate_slots_during_sql": register.gate_slots},
+        "create_teacher": {"statements": create.statements, "commits": create.commits,
+                           "gate_slots_during_sql": create.gate_slots,
+                           "connections_while_hashing": checked_out},
+    }
+
+
+async def run() -> dict:
+    await reset_schema()
+    results = {}
+    async with client() as c:
+        await c.post("/auth/register", json={"email": "rt-admin@example.com", "password": SEED_PASSWORD, "role": "admin"})
+        login = await c.post("/auth/login", json={"email": "rt-admin@example.com", "password": SEED_PASSWORD})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        await c.get("/auth/me", headers=headers)  # warm the principal cache
+
+        dialect = get_engine().sync_engine.dialect
+        native = dialect.insert_returning
+        results["returning" if native else "emulated"] = await _measure(c, "a", headers)
+        if native:
+            dialect.insert_returning = False
+            try:
+                results["emulated"] = await _measure(c, "b", headers)
+            finally:
+                dialect.insert_returning = native
+    return results
+
+
+def main() -> None:
+    results = asyncio.run(run())
+    print(json.dumps(results, indent=2))
+    failures = [
+        f"{mode}/{path}: {counts}, expected at most {EXPECTED[path]} statements, "
+        "no gate slot during SQL and no connection while hashing"
+        for mode, paths in results.items()
+        for path, counts in paths.items()
+        if counts["statements"] > EXPECTED[path] or counts["commits"] != 1
+        or counts["gate_slots_during_sql"] or any(counts.get("connections_while_hashing", ()))
+    ]
+    for failure in failures:
+        print("FAIL:", failure)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
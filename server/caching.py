@@ -0,0 +1,382 @@
+"""
+caching.py
+Small in-process caching primitives shared by the API.
+- TTLCache: bounded LRU mapping (by entry count and, optionally, total
+  size) whose entries also expire after a TTL.
+- ResponseCache: pre-serialized JSON responses with strong ETags / 304s,
+  keyed by the route's own parsed parameters, capped in bytes, and
+  invalidated by a version counter that write paths bump.
+- SWRCache: one upstream-backed JSON document served stale-while-revalidate,
+  persisted to disk, with coalesced background refreshes.
+
+Caches live per worker process; they are a latency optimization, never the
+source of truth, so every user of them must tolerate a miss.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU cache with per-entry time-to-live.
+
+    Args:
+        max_entries (int): Maximum number of entries; least recently used are evicted first.
+        ttl (float): Default lifetime of an entry in seconds.
+        max_size (int, optional): Maximum total of the `size` passed to `set`
+            (e.g. body bytes); least recently used are evicted first.
+
+    Attributes:
+        hits (int): Lookups that returned a live entry.
+        misses (int): Lookups that found nothing or an expired entry.
+        evictions (int): Entries dropped because the cache was full.
+        size (int): Current total size of the entries.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0, max_size: Optional[int] = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, tuple[float, Any, int]]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the live value for `key` (refreshing its LRU position) or `default`."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: int = 0) -> None:
+        """
+        Store `value` under `key` for `ttl` seconds (defaults to the cache TTL).
+        `size` counts against `max_size`; a value larger than `max_size` is not stored.
+        """
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0 or (self.max_size is not None and size > self.max_size):
+            return
+        self.pop(key)
+        self._data[key] = (time.monotonic() + lifetime, value, size)
+        self.size += size
+        while len(self._data) > self.max_entries or (self.max_size is not None and self.size > self.max_size):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        """Remove `key` if present."""
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def items(self):
+        """Snapshot of (key, value) pairs, including not-yet-purged expired ones."""
+        return [(key, value) for key, (_, value, _) in self._data.items()]
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._data.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Counters snapshot, suitable for a metrics/admin endpoint."""
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "size": self.size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def _etag_for(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: ignore a W/ prefix, honour `*`."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    HTTP response cache for read endpoints whose data only changes on known writes.
+
+    Entries hold the serialized JSON body and its ETag, keyed by
+    (version, route, params), where `params` are the route's own parsed and
+    normalized parameters: query strings the route does not declare, or
+    spellings that parse to the same values, share one entry, so junk
+    parameters cannot fill the cache with copies. The total body size is
+    capped by `max_bytes`. Write paths call `invalidate()`, which bumps
+    the version so no stale entry can be served again. A conditional request
+    whose `If-None-Match` matches a cached ETag gets a 304 without running the
+    producer (i.e. without touching the DB).
+
+    Invalidation is per worker process; with several workers a write is
+    visible everywhere once the TTL expires.
+
+    Args:
+        max_entries (int): LRU bound on cached responses.
+        ttl (float): Safety-net lifetime of an entry in seconds.
+        max_bytes (int): LRU bound on the total size of cached bodies.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 300.0, max_bytes: int = 64 * 1024 * 1024):
+        self._entries = TTLCache(max_entries, ttl, max_size=max_bytes)
+        self.version = 0
+        self.not_modified = 0
+
+    def invalidate(self) -> None:
+        """Bump the version and drop every cached response."""
+        self.version += 1
+        self._entries.clear()
+
+    async def respond(self, request: Request, produce: Callable[[], Awaitable[bytes]], params: Hashable) -> Response:
+        """
+        Serve `request` from the cache, or build the body with `produce()` and cache it.
+
+        Args:
+            request (Request): Incoming request (matched route, If-None-Match).
+            produce (callable): Coroutine function returning the JSON body bytes.
+            params (Hashable): Everything the body depends on besides the route,
+                as parsed values (e.g. `(skip, limit, cursor)`), never raw query strings.
+
+        Returns:
+            Response: 200 with body + ETag, or 304 Not Modified.
+        """
+        version = self.version
+        route = request.scope.get("route")
+        key = (version, route.path if route is not None else request.url.path, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            body = await produce()
+            entry = (body, _etag_for(body))
+            # Skip storing if a write landed while we were querying.
+            if version == self.version:
+                self._entries.set(key, entry, size=len(body))
+
+        body, etag = entry
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        """Entry counters plus the current version and 304 count."""
+        return {**self._entries.stats(), "version": self.version, "not_modified": self.not_modified}
+
+
+class SWRCache:
+    """
+    Stale-while-revalidate cache for one JSON document fetched from an upstream.
+
+    - Fresh (younger than `ttl`): served from memory.
+    - Stale: served from memory immediately while one background refresh runs.
+    - Upstream failure: the last good snapshot keeps being served; refreshes
+      are retried at most every `retry_interval` seconds.
+    - Only a cold start with no snapshot at all (neither in memory nor on
+      disk) waits for the upstream.
+
+    Concurrent refreshes are coalesced into one upstream call. Good snapshots
+    are written to `disk_path` (atomically) so a restarted worker serves the
+    last feed without calling the upstream.
+
+    Args:
+        fetch (callable): Coroutine function returning the JSON-serializable document.
+        ttl (float): Seconds a snapshot counts as fresh.
+        retry_interval (float): Minimum seconds between refreshes after a failure.
+        disk_path (str, optional): File used to persist the last good snapshot.
+        clock (callable): Current time in seconds (default: `time.time`); it
+            must be a wall clock so ages survive restarts via disk.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float = 300.0,
+        retry_interval: float = 30.0,
+        disk_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.disk_path = disk_path
+        self.clock = clock
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._fetched_at = 0.0
+        self._last_attempt = 0.0
+        self._loaded_from_disk = False
+        self._refresh: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.not_modified = 0
+        self.last_error: Optional[str] = None
+
+    def _store(self, body: bytes, fetched_at: float) -> None:
+        self._body = body
+        self._etag = _etag_for(body)
+        self._fetched_at = fetched_at
+
+    def _load_from_disk(self) -> None:
+        self._loaded_from_disk = True
+        if not self.disk_path or self._body is not None:
+            return
+        try:
+            with open(self.disk_path, "rb") as f:
+                snapshot = json.loads(f.read())
+            self._store(json.dumps(snapshot["document"]).encode(), float(snapshot["fetched_at"]))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable cache snapshot %s: %s", self.disk_path, e)
+
+    def _save_to_disk(self, document: Any, fetched_at: float) -> None:
+        tmp_path = f"{self.disk_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": fetched_at, "document": document}, f)
+        os.replace(tmp_path, self.disk_path)
+
+    async def _do_refresh(self) -> None:
+        self._last_attempt = self.clock()
+        self.refreshes += 1
+        try:
+            document = await self.fetch()
+            fetched_at = self.clock()
+            self._store(json.dumps(document).encode(), fetched_at)
+            self.last_error = None
+        except Exception as e:  # any upstream failure keeps the last good snapshot
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.warning("Upstream refresh failed, serving last good snapshot: %s", self.last_error)
+            raise
+        if self.disk_path:
+            try:
+                await asyncio.to_thread(self._save_to_disk, document, fetched_at)
+            except OSError as e:
+                logger.warning("Could not persist cache snapshot to %s: %s", self.disk_path, e)
+
+    def refresh(self) -> asyncio.Task:
+        """Start a refresh unless one is already running; returns the in-flight task."""
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._do_refresh())
+            # Background refreshes are fire-and-forget; failures are logged above.
+            self._refresh.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self._refresh
+
+    def warm(self) -> None:
+        """Load the disk snapshot and start a background refresh if it is missing or stale (startup)."""
+        if not self._loaded_from_disk:
+            self._load_from_disk()
+        if self._body is None or self.clock() - self._fetched_at >= self.ttl:
+            self.refresh()
+
+    async def get(self) -> tuple[bytes, str, float]:
+        """
+        Current snapshot, refreshing in the background when stale.
+
+        Returns:
+            (body, etag, age_seconds)
+
+        Raises:
+            Exception: The upstream error, only when there is no snapshot at all.
+        """
+        if not self._loaded_from_disk:
+            self._load_from_disk()
+        if self._body is None:
+            await asyncio.shield(self.refresh())
+        else:
+            age = self.clock() - self._fetched_at
+            if age < self.ttl:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if self.clock() - self._last_attempt >= self.retry_interval or not self.last_error:
+                    self.refresh()
+        return self._body, self._etag, self.clock() - self._fetched_at
+
+    async def respond(self, request: Request) -> Response:
+        """
+        Serve the snapshot with an ETag (304 on If-None-Match) and a
+        Cache-Control max-age covering its remaining freshness.
+        """
+        body, etag, age = await self.get()
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={max(0, int(self.ttl - age))}",
+            "Age": str(max(0, int(age))),
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def close(self) -> None:
+        """Cancel an in-flight refresh (application shutdown)."""
+        if self._refresh is not None and not self._refresh.done():
+            self._refresh.cancel()
+            try:
+                await self._refresh
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "has_snapshot": self._body is not None,
+            "age_s": round(self.clock() - self._fetched_at, 1) if self._body is not None else None,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "not_modified": self.not_modified,
+            "refreshes": self.refreshes,
+            "refreshing": self._refresh is not None and not self._refresh.done(),
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+# Public teacher listings; invalidated by the teacher CRUD write functions.
+teacher_responses = ResponseCache(
+    max_entries=int(os.getenv("TEACHER_RESPONSE_CACHE_MAX_ENTRIES", 512)),
+    ttl=float(os.getenv("TEACHER_RESPONSE_CACHE_TTL_SECONDS", 300)),
+    max_bytes=int(os.getenv("TEACHER_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+)
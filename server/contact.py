@@ -0,0 +1,255 @@
+"""
+contact.py
+Write-behind ingestion for the public contact form (`POST /contact`).
+
+Requests only validate the submission and put it on an in-process queue;
+they never wait for the database. One background writer drains the queue
+and stores submissions with a single multi-row INSERT per batch, flushed
+when CONTACT_BATCH_SIZE submissions are waiting or CONTACT_FLUSH_INTERVAL_SECONDS
+after the first one arrived, whichever comes first.
+
+- A slow database only makes batches larger; request latency stays flat.
+- A failing database (connection errors: OperationalError,
+  DisconnectionError) is retried with exponential backoff; the batch stays
+  in memory meanwhile. While the writer is stuck the queue fills up, and at
+  CONTACT_QUEUE_SIZE new submissions are refused (503 + Retry-After)
+  instead of growing memory without bound.
+- Any other database error means the batch itself is bad (e.g. one row
+  violating a constraint): its rows are written one by one and the rows
+  that still fail are dropped and logged in full at ERROR level (the dead
+  letter), so one bad row never blocks the queue.
+- If the writer task dies, new submissions are refused and the error is
+  logged; nothing is acknowledged that no writer will store.
+- On shutdown the lifespan calls `close()`: new submissions are refused and
+  everything already acknowledged is written, for up to
+  CONTACT_DRAIN_TIMEOUT_SECONDS. Anything left after that is logged as lost.
+
+The queue lives in one worker process, so an acknowledged submission is
+lost if the process is killed without a shutdown (SIGKILL, OOM).
+
+Settings (environment variables):
+    CONTACT_QUEUE_SIZE              Submissions waiting to be written (default: 10000).
+    CONTACT_BATCH_SIZE              Rows per INSERT (default: 200).
+    CONTACT_FLUSH_INTERVAL_SECONDS  Max wait before a partial batch is written (default: 0.5).
+    CONTACT_RETRY_SECONDS           First retry delay after a failed write; doubles up to 30 s (default: 1).
+    CONTACT_DRAIN_TIMEOUT_SECONDS   Shutdown budget for writing what is queued (default: 10).
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DisconnectionError, OperationalError, SQLAlchemyError
+
+from .database import get_engine
+from .models.contactMessage import ContactMessage
+from .models.types import utc_now
+
+logger = logging.getLogger(__name__)
+
+CONTACT_QUEUE_SIZE = int(os.getenv("CONTACT_QUEUE_SIZE", 10000))
+CONTACT_BATCH_SIZE = int(os.getenv("CONTACT_BATCH_SIZE", 200))
+CONTACT_FLUSH_INTERVAL_SECONDS = float(os.getenv("CONTACT_FLUSH_INTERVAL_SECONDS", 0.5))
+CONTACT_RETRY_SECONDS = float(os.getenv("CONTACT_RETRY_SECONDS", 1))
+CONTACT_DRAIN_TIMEOUT_SECONDS = float(os.getenv("CONTACT_DRAIN_TIMEOUT_SECONDS", 10))
+
+RETRY_MAX_SECONDS = 30.0
+# Errors worth retrying as-is; anything else will fail again the same way.
+TRANSIENT_ERRORS = (OperationalError, DisconnectionError)
+_STOP = object()
+
+
+class ContactWriter:
+    """
+    Bounded queue plus one background task writing it in multi-row INSERTs.
+
+    Args:
+        batch_size (int): Maximum rows per INSERT.
+        flush_interval (float): Seconds a partial batch may wait for more rows.
+        max_queued (int): Submissions accepted but not yet written; beyond it `submit` refuses.
+        retry_interval (float): First backoff delay after a failed INSERT.
+
+    Attributes:
+        accepted / rejected (int): Submissions queued / refused because the queue was full or closed.
+        written (int): Rows committed.
+        batches (int): INSERT statements committed.
+        failures (int): Failed INSERT attempts (retried, or split into single rows).
+        dropped (int): Rows that could not be written on their own (dead-lettered).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = CONTACT_BATCH_SIZE,
+        flush_interval: float = CONTACT_FLUSH_INTERVAL_SECONDS,
+        max_queued: int = CONTACT_QUEUE_SIZE,
+        retry_interval: float = CONTACT_RETRY_SECONDS,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_queued = max(1, max_queued)
+        self.retry_interval = retry_interval
+        # Unbounded so the stop marker always fits; `submit` enforces max_queued.
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._unwritten = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self.last_error: Optional[str] = None
+        self.max_batch = 0
+
+    @property
+    def pending(self) -> int:
+        """Submissions acknowledged but not yet committed."""
+        return self._unwritten
+
+    def start(self) -> None:
+        """Start the writer task on the running loop (application startup)."""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+            self._task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Contact writer crashed with %d submission(s) not written; refusing new ones",
+                         self.pending, exc_info=task.exception())
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue one submission (column values of ContactMessage) without waiting.
+
+        Returns:
+            bool: False if the writer is not running or the queue is full.
+        """
+        if self._task is None or self._task.done() or self._closing or self.pending >= self.max_queued:
+            self.rejected += 1
+            return False
+        row.setdefault("created_at", utc_now())
+        self._queue.put_nowait(row)
+        self._unwritten += 1
+        self.accepted += 1
+        return True
+
+    async def _next_batch(self) -> tuple[List[Dict[str, Any]], bool]:
+        """Wait for one row, then collect more until the batch is full or the flush interval passes."""
+        first = await self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                row = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closing:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if row is _STOP:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        """INSERT `rows` as one multi-row statement, retrying transient errors with backoff until it commits."""
+        delay = self.retry_interval
+        while True:
+            try:
+                # Straight on the engine: a RoutingSession commit would start the
+                # replica read-your-writes window for unrelated teacher reads.
+                async with get_engine().begin() as conn:
+                    await conn.execute(insert(ContactMessage).values(rows))
+                break
+            except TRANSIENT_ERRORS as e:
+                self._failed(e)
+                logger.warning("Contact batch of %d not written, retrying in %.1fs: %s", len(rows), delay, self.last_error)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RETRY_MAX_SECONDS)
+        self._unwritten -= len(rows)
+        self.written += len(rows)
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(rows))
+        self.last_error = None
+
+    def _failed(self, error: SQLAlchemyError) -> None:
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+
+    def _drop(self, row: Dict[str, Any]) -> None:
+        """Dead-letter one row that cannot be written: log it in full and forget it."""
+        self._unwritten -= 1
+        self.dropped += 1
+        logger.error("Contact submission dropped (%s): %r", self.last_error, row)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Write `batch`; if it fails for good, write its rows one by one and drop the ones that still fail."""
+        try:
+            await self._insert(batch)
+        except SQLAlchemyError as e:
+            self._failed(e)
+            if len(batch) == 1:
+                self._drop(batch[0])
+                return
+            logger.warning("Contact batch of %d rejected, writing rows one by one: %s", len(batch), self.last_error)
+            for row in batch:
+                await self._write([row])
+
+    async def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = await self._next_batch()
+            if batch:
+                await self._write(batch)
+
+    async def close(self, timeout: float = CONTACT_DRAIN_TIMEOUT_SECONDS) -> None:
+        """Refuse new submissions and write the queued ones, for up to `timeout` seconds (shutdown)."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._queue.put_nowait(_STOP)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            lost = self.pending
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            logger.error("Contact writer stopped after %.1fs with %d submission(s) not written: %s",
+                         timeout, lost, self.last_error)
+        except Exception:
+            pass  # the writer had crashed; already logged by `_on_done`
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": self.pending,
+            "max_queued": self.max_queued,
+            "batch_size": self.batch_size,
+            "flush_interval_s": self.flush_interval,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "written": self.written,
+            "batches": self.batches,
+            "max_batch": self.max_batch,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "last_error": self.last_error,
+        }
+
+
+# Process-wide writer; started and drained by the lifespan in main.py.
+contact_writer = ContactWriter()
@@ -0,0 +1,33 @@
+"""
+CRUD reads for contact form messages.
+Messages are inserted in batches by the contact writer (see contact.py),
+so this module only lists them.
+"""
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.contactMessage import ContactMessage
+
+
+async def list_contact_messages(db: AsyncSession, before_id: Optional[int] = None, limit: int = 50) -> List[ContactMessage]:
+    """
+    Keyset-paginated contact messages, newest first.
+
+    Reads the primary (no `read_only`), so admins see messages as soon as
+    the writer has committed them.
+
+    Args:
+        db (AsyncSession): DB session (async).
+        before_id (int, optional): Last id of the previous page; None for the first page.
+        limit (int): Max number of rows to return.
+
+    Returns:
+        List[ContactMessage]: Messages with id < before_id, ordered by id descending.
+    """
+    stmt = select(ContactMessage)
+    if before_id is not None:
+        stmt = stmt.filter(ContactMessage.id < before_id)
+    result = await db.execute(stmt.order_by(ContactMessage.id.desc()).limit(limit))
+    return result.scalars().all()
@@ -0,0 +1,56 @@
+"""
+Low-level SQL helpers shared by the CRUD modules.
+"""
+from typing import Any, Dict
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _with_python_defaults(table, values: Dict[str, Any]) -> Dict[str, Any]:
+    """`values` plus the Python-side column defaults (scalars and callables) it does not set."""
+    row = {}
+    for column in table.columns:
+        default = column.default
+        if default is None or column.name in values:
+            continue
+        if default.is_scalar:
+            row[column.name] = default.arg
+        elif default.is_callable:
+            row[column.name] = default.arg(None)  # SQLAlchemy wraps zero-arg callables to take a context
+    row.update(values)
+    return row
+
+
+async def insert_returning(db: AsyncSession, model, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    INSERT one row and get the full row back in a single round trip.
+
+    Uses `INSERT ... RETURNING` where the dialect supports it (SQLite,
+    PostgreSQL, MariaDB). MySQL has no RETURNING, so it is emulated: the
+    generated primary key comes from the driver's `lastrowid` (no extra
+    query) and the other columns from the values sent plus Python-side
+    defaults, which are evaluated here and sent explicitly.
+    Server-side defaults are therefore only reflected on RETURNING dialects.
+
+    Does not commit. Unique/foreign-key violations raise IntegrityError.
+
+    Args:
+        db (AsyncSession): DB session (async).
+        model: ORM model class whose table is inserted into.
+        values (dict): Column values.
+
+    Returns:
+        dict: Column name -> value for the inserted row.
+    """
+    table = model.__table__
+    row = _with_python_defaults(table, values)
+    if db.get_bind().dialect.insert_returning:
+        result = await db.execute(insert(table).values(**row).returning(*table.columns))
+        return dict(result.mappings().one())
+
+    result = await db.execute(insert(table).values(**row))
+    inserted = {column.name: row.get(column.name) for column in table.columns}
+    for column, value in zip(table.primary_key.columns, result.inserted_primary_key):
+        inserted[column.name] = value
+    return inserted
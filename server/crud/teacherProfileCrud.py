@@ -6,45 +6,61 @@ from server.models.user import User
 from server.security import hash_password
 from sqlalchemy.orm import Session
 from ..models.teacherProfile import TeacherProfile  
+from ..models.types import utc_now
 from ..schemas.TeacherProfileSchemas import TeacherProfileCreate
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 import logging
 from uuid import uuid4
-from sqlalchemy import select
+from datetime import datetime
+from sqlalchemy import insert, select, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from ..models.user import User
-from ..security import hash_password
+from ..security import hash_password, invalidate_principal
+from ..caching import teacher_responses
+from ..singleflight import read_flights
+from ..database import read_only
+from ..admission import password_gate
+from .sqlHelpers import insert_returning
+from ..search import profile_snapshot, teacher_index, tokenize
+from sqlalchemy import and_, or_
 
 logger = logging.getLogger(__name__)
 
+LIKE_ESCAPE = "\\"
 
 
-async def _create_user_for_teacher(db: AsyncSession, email: Optional[str] = None, password: Optional[str] = None) -> User:
+def _contains_pattern(text: str) -> str:
+    """`%text%` LIKE pattern matching `text` literally (use with `escape=LIKE_ESCAPE`)."""
+    escaped = text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+    return f"%{escaped}%"
+
+
+
+async def _create_user_for_teacher(db: AsyncSession, password_hash: str, email: Optional[str] = None) -> dict:
     """
     Create a User row to be associated with a new TeacherProfile.
 
     If email is None, generate a unique email using uuid4.
-    If password is None, generate a random password (hashed) — caller must handle password reset flows.
-    Returns the created User object.
+    `password_hash` is already hashed by the caller (outside any transaction).
+    Returns the created user row as a dict (one INSERT ... RETURNING, no flush/refresh).
     """
-    # Generate fallback email and password if not provided
+    # Generate fallback email if not provided
     if email is None:
         # Use a namespaced unique email so uniqueness constraint satisfied
         email = f"auto-teacher-{uuid4().hex}@example.com"
-    if password is None:
-        # generate a random string as password; admin/teacher must reset it
-        password = uuid4().hex
 
-    user = User(email=email, password_hash=hash_password(password), role="teacher", is_active=True)
-    db.add(user)
-    await db.flush()   # populate user.id
-    return user
+    return await insert_returning(db, User, {
+        "email": email,
+        "password_hash": password_hash,
+        "role": "teacher",
+        "is_active": True,
+    })
 
 
 async def create_teacher_with_auto_user(
@@ -54,54 +70,64 @@ async def create_teacher_with_auto_user(
     image_url: str = "",
     is_active: bool = True,
     email: Optional[str] = None,
-    password: Optional[str] = None,
+    password_hash: Optional[str] = None,
     user_id: Optional[int] = None,
 ):
     """
     Create a TeacherProfile. If `user_id` is provided, link to that user;
-    otherwise create a new User (optionally using provided email/password).
+    otherwise create a new User (optionally using provided email) with
+    `password_hash`.
+
+    The password is hashed by the caller, through the password admission
+    gate and before this runs, so no bcrypt slot is held across the DB
+    round trips and no connection is checked out while hashing.
+
+    The common path (new user) is two INSERT ... RETURNING statements and a
+    COMMIT. The 1-to-1 rule and email uniqueness are enforced by the unique
+    constraints on `teacher_profiles.user_id` and `users.email`, so there is
+    no pre-check SELECT and no post-commit refresh.
 
     Args:
         db (AsyncSession): DB session (async).
         name, bio, image_url, is_active: teacher profile fields.
-        email, password: optional credentials to create the User with.
+        email: optional email to create the User with.
+        password_hash: hash of the new User's password (required unless `user_id` is given);
+            hash a random password when the admin did not set one.
         user_id: optional existing user id to link to (admins may pass it; we prefer None for safety).
 
     Returns:
-        TeacherProfile: newly created profile.
+        TeacherProfile: newly created profile (transient, built from the RETURNING row).
 
     Raises:
         HTTPException: 400/404/500 depending on error.
     """
+    created_user = None
     try:
         # If user_id provided -> validate exists
         if user_id:
-            user_res = await db.execute(select(User).where(User.id == user_id))
-            user_obj = user_res.scalars().one_or_none()
-            if user_obj is None:
+            user_res = await db.execute(select(User.id).where(User.id == user_id))
+            if user_res.scalar_one_or_none() is None:
                 raise HTTPException(status_code=404, detail=f"User {user_id} not found.")
         else:
-            # create new user (auto-generated email/password if not provided)
-            user_obj = await _create_user_for_teacher(db, email=email, password=password)
-
-        # Guard: ensure no existing TeacherProfile for that user (1-to-1)
-        existing = await db.execute(select(TeacherProfile).where(TeacherProfile.user_id == user_obj.id))
-        if existing.scalars().one_or_none():
-            raise HTTPException(status_code=400, detail=f"User {user_obj.id} already has a teacher profile.")
-
-        # create profile
-        new_profile = TeacherProfile(
-            user_id=user_obj.id,
-            name=name,
-            bio=bio or "",
-            image_url=image_url or "",
-            is_active=is_active
-        )
-        db.add(new_profile)
+            # create new user (auto-generated email if not provided)
+            created_user = await _create_user_for_teacher(db, password_hash, email=email)
+            user_id = created_user["id"]
+
+        # create profile; a second profile for the same user violates the unique user_id
+        row = await insert_returning(db, TeacherProfile, {
+            "user_id": user_id,
+            "name": name,
+            "bio": bio or "",
+            "image_url": image_url or "",
+            "is_active": is_active,
+        })
         await db.commit()
-        await db.refresh(new_profile)
+        if created_user is not None:
+            invalidate_principal(email=created_user["email"])
+        teacher_responses.invalidate()
+        teacher_index.add(profile_snapshot(row))
 
-        return new_profile
+        return TeacherProfile(**row)
 
     except IntegrityError as e:
         await db.rollback()
@@ -113,6 +139,118 @@ async def create_teacher_with_auto_user(
         logger.exception("Unexpected DB error creating teacher profile")
         raise HTTPException(status_code=500, detail="Unexpected database error while creating teacher profile.") from e
 
+
+async def bulk_create_teachers(db: AsyncSession, rows: List[TeacherProfileCreate]) -> List[dict]:
+    """
+    Create many teachers (User + TeacherProfile each) in one transaction.
+
+    Intended to be called once per chunk of an import. Passwords are hashed
+    through the password admission gate (`run_batch`: a few at a time, so
+    logins are not starved) with no DB connection held, then users and
+    profiles are written with one multi-row INSERT each (RETURNING where the
+    dialect supports it, otherwise a single SELECT back by email / user_id).
+
+    Rows whose email already exists (in the DB or earlier in the chunk) are
+    reported as errors and skipped; the rest of the chunk still goes in.
+
+    Args:
+        db (AsyncSession): DB session (async).
+        rows (List[TeacherProfileCreate]): Validated rows of this chunk.
+
+    Returns:
+        List[dict]: One result per input row, in order, with keys
+        `status` ("created"/"error"), `email`, `user_id`, `teacher_id`, `error`.
+    """
+    emails = [row.email or f"auto-teacher-{uuid4().hex}@example.com" for row in rows]
+    results = [{"status": "created", "email": email, "user_id": None, "teacher_id": None, "error": None}
+               for email in emails]
+
+    def fail(index: int, message: str) -> None:
+        results[index].update(status="error", error=message)
+
+    # Duplicates: one SELECT for the whole chunk instead of one per row.
+    existing = await db.execute(select(User.email).where(User.email.in_(emails)))
+    taken = set(existing.scalars().all())
+    seen: set = set()
+    pending = []
+    for i, email in enumerate(emails):
+        if email in taken or email in seen:
+            fail(i, "Email already registered.")
+        else:
+            seen.add(email)
+            pending.append(i)
+    if not pending:
+        return results
+
+    # End the read transaction so the pooled connection goes back before the
+    # bcrypt batch; a concurrent insert of one of these emails in between
+    # surfaces as an IntegrityError below.
+    await db.rollback()
+    hashes = await password_gate.run_batch(hash_password, [rows[i].password or uuid4().hex for i in pending])
+    dialect = db.get_bind().dialect
+
+    try:
+        user_values = [
+            {"email": emails[i], "password_hash": pw_hash, "role": "teacher", "is_active": True}
+            for i, pw_hash in zip(pending, hashes)
+        ]
+        if dialect.insert_executemany_returning:
+            inserted = await db.execute(insert(User).returning(User.id, User.email), user_values)
+        else:
+            await db.execute(insert(User), user_values)
+            inserted = await db.execute(
+                select(User.id, User.email).where(User.email.in_([emails[i] for i in pending]))
+            )
+        user_ids = {email: user_id for user_id, email in inserted.all()}
+
+        profile_values = []
+        for i in pending:
+            results[i]["user_id"] = user_ids[emails[i]]
+            profile_values.append({
+                "user_id": user_ids[emails[i]],
+                "name": rows[i].name,
+                "bio": rows[i].bio or "",
+                "image_url": rows[i].image_url or "",
+                "is_active": rows[i].is_active,
+            })
+        if dialect.insert_executemany_returning:
+            inserted = await db.execute(
+                insert(TeacherProfile).returning(TeacherProfile.id, TeacherProfile.user_id), profile_values
+            )
+        else:
+            await db.execute(insert(TeacherProfile), profile_values)
+            inserted = await db.execute(
+                select(TeacherProfile.id, TeacherProfile.user_id)
+                .where(TeacherProfile.user_id.in_(list(user_ids.values())))
+            )
+        teacher_ids = {user_id: teacher_id for teacher_id, user_id in inserted.all()}
+        for i in pending:
+            results[i]["teacher_id"] = teacher_ids[results[i]["user_id"]]
+
+        await db.commit()
+        for i in pending:
+            invalidate_principal(email=emails[i])
+        teacher_responses.invalidate()
+        teacher_index.add_many(
+            {"id": results[i]["teacher_id"], **profile}
+            for i, profile in zip(pending, profile_values)
+        )
+
+    except IntegrityError as e:
+        # A concurrent writer took one of the emails; the whole chunk is rolled back.
+        await db.rollback()
+        logger.warning("IntegrityError in bulk teacher import: %s", e)
+        for i in pending:
+            results[i].update(user_id=None, teacher_id=None)
+            fail(i, "Row could not be created due to integrity constraints.")
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.exception("Unexpected DB error in bulk teacher import")
+        raise HTTPException(status_code=500, detail="Unexpected database error during bulk import.") from e
+
+    return results
+
 def get_teacher_by_user_id(db: Session, user_id: int) -> Optional[TeacherProfile]:
     """
     Retrieve a teacher profile by the associated user ID.
@@ -127,56 +265,317 @@ def get_teacher_by_user_id(db: Session, user_id: int) -> Optional[TeacherProfile
     return db.query(TeacherProfile).filter(TeacherProfile.user_id == user_id).first()
 
 
-async def list_active_teachers(db: AsyncSession, skip: int = 0, limit: int = 10) -> List[TeacherProfile]:
+def _select_active(columns: Optional[Tuple[str, ...]] = None):
     """
-    Paginated list of active teachers (async).
+    SELECT of active profiles: whole ORM rows, or only `columns`.
+
+    A column projection returns lightweight Row tuples (attribute access by
+    column name) and never reads the other columns, e.g. the 500-char `bio`.
     """
-    result = await db.execute(
-        select(TeacherProfile)
-        .filter(TeacherProfile.is_active == True)
-        .offset(skip)
-        .limit(limit)
-    )
-    return result.scalars().all()
+    if columns is None:
+        stmt = select(TeacherProfile)
+    else:
+        stmt = select(*(TeacherProfile.__table__.c[name] for name in columns))
+    return stmt.filter(TeacherProfile.is_active == True)
 
-async def get_active_teachers(db: AsyncSession) -> List[TeacherProfile]:
+async def _fetch(db: AsyncSession, stmt, columns: Optional[Tuple[str, ...]]) -> Sequence:
+    result = await db.execute(stmt)
+    return result.scalars().all() if columns is None else result.all()
+
+@read_flights.wrap
+@read_only
+async def list_active_teachers(
+    db: AsyncSession, skip: int = 0, limit: int = 10, columns: Optional[Tuple[str, ...]] = None,
+) -> List[TeacherProfile]:
     """
-    Retrieve all active teacher profiles (async).
+    Paginated list of active teachers (async, offset mode).
+
+    Kept for compatibility; cost grows with `skip`. Prefer
+    `list_active_teachers_after` for deep pagination. With `columns`, only
+    those columns are selected (see `_select_active`).
     """
-    result = await db.execute(
-        select(TeacherProfile).filter(TeacherProfile.is_active == True)
-    )
-    return result.scalars().all()
+    stmt = _select_active(columns).order_by(TeacherProfile.id).offset(skip).limit(limit)
+    return await _fetch(db, stmt, columns)
+
+@read_flights.wrap
+@read_only
+async def list_active_teachers_after(
+    db: AsyncSession, after_id: Optional[int] = None, limit: int = 10, columns: Optional[Tuple[str, ...]] = None,
+) -> List[TeacherProfile]:
+    """
+    Keyset-paginated list of active teachers (async, cursor mode).
 
+    Seeks on the (is_active, id) index, so page N costs the same as page 1.
 
+    Args:
+        db (AsyncSession): DB session (async).
+        after_id (int, optional): Last id of the previous page; None for the first page.
+        limit (int): Max number of rows to return.
+        columns (tuple[str, ...], optional): Column names to select (must
+            include `id`); None for whole profiles.
 
-def get_teacher_by_id(db: Session, teacher_id: int) -> Optional[TeacherProfile]:
+    Returns:
+        List[TeacherProfile]: Active profiles with id > after_id, ordered by id
+        (Rows of `columns` when given).
     """
-    Retrieve a teacher profile by its primary ID.
+    stmt = _select_active(columns)
+    if after_id is not None:
+        stmt = stmt.filter(TeacherProfile.id > after_id)
+    return await _fetch(db, stmt.order_by(TeacherProfile.id).limit(limit), columns)
+
+@read_flights.wrap
+@read_only
+async def get_active_teachers(db: AsyncSession, columns: Optional[Tuple[str, ...]] = None) -> List[TeacherProfile]:
+    """
+    Retrieve all active teacher profiles (async); only `columns` when given.
+    """
+    return await _fetch(db, _select_active(columns), columns)
+
+async def stream_active_teachers(
+    db: AsyncSession, batch_size: int = 1000, columns: Optional[Tuple[str, ...]] = None,
+) -> AsyncIterator[TeacherProfile]:
+    """
+    Stream all active teacher profiles through a server-side cursor (async).
+
+    Rows are fetched `batch_size` at a time (`yield_per`), so memory stays
+    constant no matter how many profiles exist. The session must stay open
+    until the iterator is exhausted.
 
     Args:
-        db (Session): SQLAlchemy session.
+        db (AsyncSession): DB session (async).
+        batch_size (int): Rows buffered per fetch.
+        columns (tuple[str, ...], optional): Column names to select; None for
+            whole profiles.
+
+    Yields:
+        TeacherProfile: Active profiles ordered by id (Rows of `columns` when given).
+    """
+    stmt = _select_active(columns).order_by(TeacherProfile.id).execution_options(yield_per=batch_size)
+    result = await (db.stream_scalars(stmt) if columns is None else db.stream(stmt))
+    async for profile in result:
+        yield profile
+
+
+
+
+@read_flights.wrap
+@read_only
+async def search_active_teachers(db: AsyncSession, query: str, limit: int = 10) -> List[TeacherProfile]:
+    """
+    DB-side directory search, used when the in-memory index is not available.
+
+    On MySQL this is a FULLTEXT `MATCH(name, bio) AGAINST(... IN BOOLEAN MODE)`
+    requiring every word (last one as a prefix), ranked by relevance; it
+    needs the FULLTEXT index (existing databases: run
+    `python -m server.migrations.teacher_directory_indexes`). Other backends
+    fall back to `LIKE '%word%'` on name/bio for every word, which is
+    neither accent-insensitive nor ranked.
+
+    Args:
+        db (AsyncSession): DB session (async).
+        query (str): Free-text query.
+        limit (int): Max results.
+
+    Returns:
+        List[TeacherProfile]: Matching active profiles.
+    """
+    words = tokenize(query)
+    if not words:
+        return []
+    stmt = select(TeacherProfile).filter(TeacherProfile.is_active == True)
+    if db.get_bind().dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import match  # only loaded on MySQL deployments
+
+        terms = " ".join(f"+{word}" for word in words[:-1]) + f" +{words[-1]}*"
+        relevance = match(TeacherProfile.name, TeacherProfile.bio, against=terms.strip()).in_boolean_mode()
+        stmt = stmt.filter(relevance).order_by(relevance.desc(), TeacherProfile.id)
+    else:
+        stmt = stmt.filter(and_(*(
+            or_(TeacherProfile.name.ilike(_contains_pattern(word), escape=LIKE_ESCAPE),
+                TeacherProfile.bio.ilike(_contains_pattern(word), escape=LIKE_ESCAPE))
+            for word in words
+        ))).order_by(TeacherProfile.id)
+    result = await db.execute(stmt.limit(limit))
+    return result.scalars().all()
+
+@read_flights.wrap
+@read_only
+async def get_teacher_by_id(db: AsyncSession, teacher_id: int) -> Optional[TeacherProfile]:
+    """
+    Retrieve a teacher profile by its primary ID (async).
+
+    Args:
+        db (AsyncSession): DB session (async).
         teacher_id (int): The ID of the teacher profile.
 
     Returns:
         Optional[TeacherProfile]: The teacher profile if found, else None.
     """
-    return db.query(TeacherProfile).filter(TeacherProfile.id == teacher_id).first()
-
-def deactivate_teacher(db: Session, teacher_id: int) -> Optional[TeacherProfile]:
-    """Mark a teacher as inactive (soft delete)."""
-    teacher = db.query(TeacherProfile).filter(TeacherProfile.id == teacher_id).first()
-    if teacher:
-        teacher.is_active = False
-        db.commit()
-        db.refresh(teacher)
-    return teacher
-
-def activate_teacher(db: Session, teacher_id: int) -> Optional[TeacherProfile]:
-    """Mark a teacher as active again."""
-    teacher = db.query(TeacherProfile).filter(TeacherProfile.id == teacher_id).first()
-    if teacher:
-        teacher.is_active = True
-        db.commit()
-        db.refresh(teacher)
-    return teacher
\ No newline at end of file
+    result = await db.execute(select(TeacherProfile).filter(TeacherProfile.id == teacher_id))
+    return result.scalars().first()
+
+@read_flights.wrap
+@read_only
+async def get_teachers_by_ids(db: AsyncSession, teacher_ids: List[int]) -> List[TeacherProfile]:
+    """
+    Retrieve many teacher profiles in one `WHERE id IN (...)` query (async).
+
+    Args:
+        db (AsyncSession): DB session (async).
+        teacher_ids (List[int]): IDs to fetch; unknown ids are simply absent.
+
+    Returns:
+        List[TeacherProfile]: Matching profiles, in no particular order.
+    """
+    if not teacher_ids:
+        return []
+    result = await db.execute(select(TeacherProfile).filter(TeacherProfile.id.in_(teacher_ids)))
+    return result.scalars().all()
+
+# Ids per UPDATE statement (and per transaction) in bulk status changes.
+STATUS_UPDATE_CHUNK_SIZE = 1000
+
+_SNAPSHOT_COLUMNS = (
+    TeacherProfile.id, TeacherProfile.user_id, TeacherProfile.name,
+    TeacherProfile.bio, TeacherProfile.image_url, TeacherProfile.is_active,
+)
+
+
+async def set_teachers_active(
+    db: AsyncSession,
+    is_active: bool,
+    teacher_ids: Optional[List[int]] = None,
+    name_contains: Optional[str] = None,
+    chunk_size: int = STATUS_UPDATE_CHUNK_SIZE,
+) -> dict:
+    """
+    Activate or deactivate many teachers with set-based UPDATEs.
+
+    Targets are given by id list, or by filter (`name_contains`), in which
+    case their ids are resolved with one SELECT. Each chunk of ids is one
+    `UPDATE teacher_profiles SET is_active=..., updated_at=..., deleted_at=...
+    WHERE id IN (...) AND is_active != ...` in its own transaction, with
+    RETURNING where the dialect supports it (otherwise one SELECT of the
+    rows about to change per chunk). Rows already in the target state are
+    left untouched.
+
+    Deactivation stamps `deleted_at` (soft delete); activation clears it.
+    After each chunk the response cache is invalidated and the search
+    index updated.
+
+    Args:
+        db (AsyncSession): DB session (async).
+        is_active (bool): Target state.
+        teacher_ids (List[int], optional): Explicit targets.
+        name_contains (str, optional): Filter on the name (case-insensitive) when no ids are given.
+        chunk_size (int): Ids per UPDATE.
+
+    Returns:
+        dict: `targets` (unique ids given, or rows matched by the filter),
+        `updated` rows, and `unchanged` (missing or already in that state).
+
+    Raises:
+        HTTPException: 500 on unexpected DB errors (the current chunk is rolled back).
+    """
+    changing = TeacherProfile.is_active != is_active
+    if teacher_ids is None:
+        stmt = select(TeacherProfile.id).where(changing)
+        if name_contains:
+            stmt = stmt.where(TeacherProfile.name.ilike(_contains_pattern(name_contains), escape=LIKE_ESCAPE))
+        teacher_ids = list((await db.execute(stmt.order_by(TeacherProfile.id))).scalars().all())
+    else:
+        teacher_ids = sorted(set(teacher_ids))
+
+    now = utc_now()
+    values = {"is_active": is_active, "updated_at": now, "deleted_at": None if is_active else now}
+    returning = db.get_bind().dialect.update_returning
+    updated = 0
+
+    try:
+        for start in range(0, len(teacher_ids), chunk_size):
+            chunk = teacher_ids[start:start + chunk_size]
+            if returning:
+                stmt = (
+                    update(TeacherProfile)
+                    .where(TeacherProfile.id.in_(chunk), changing)
+                    .values(**values)
+                    .returning(*_SNAPSHOT_COLUMNS)
+                )
+                rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+            else:
+                found = await db.execute(select(*_SNAPSHOT_COLUMNS).where(TeacherProfile.id.in_(chunk), changing))
+                rows = [{**row, "is_active": is_active} for row in found.mappings()]
+                if rows:
+                    await db.execute(
+                        update(TeacherProfile)
+                        .where(TeacherProfile.id.in_([row["id"] for row in rows]))
+                        .values(**values)
+                    )
+            await db.commit()
+            updated += len(rows)
+            if not rows:
+                continue
+            teacher_responses.invalidate()
+            if is_active:
+                teacher_index.add_many(profile_snapshot(row) for row in rows)
+            else:
+                for row in rows:
+                    teacher_index.remove(row["id"])
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.exception("Unexpected DB error changing teacher status")
+        raise HTTPException(status_code=500, detail="Unexpected database error while changing teacher status.") from e
+
+    return {"targets": len(teacher_ids), "updated": updated, "unchanged": len(teacher_ids) - updated}
+
+
+async def deactivate_teacher(db: AsyncSession, teacher_id: int) -> bool:
+    """Mark a teacher as inactive (soft delete). Returns False if not found or already inactive."""
+    return (await set_teachers_active(db, False, teacher_ids=[teacher_id]))["updated"] == 1
+
+
+async def activate_teacher(db: AsyncSession, teacher_id: int) -> bool:
+    """Mark a teacher as active again. Returns False if not found or already active."""
+    return (await set_teachers_active(db, True, teacher_ids=[teacher_id]))["updated"] == 1
+
+
+async def list_teacher_changes(
+    db: AsyncSession,
+    until: datetime,
+    since: Optional[datetime] = None,
+    after_id: Optional[int] = None,
+    limit: int = 500,
+) -> List[TeacherProfile]:
+    """
+    Profiles created, updated or soft-deleted after a sync position (async).
+
+    Keyset scan of the (updated_at, id) index: rows with
+    `(updated_at, id) > (since, after_id)` and `updated_at < until`, in that
+    order, so a client can resume exactly after the last row it received.
+    Without `after_id`, `since` is a watermark: every row with
+    `updated_at >= since` is returned.
+    Inactive profiles are included; they are the soft deletions.
+
+    Reads the primary on purpose (no `read_only`): a lagging replica would
+    let the position move past rows it has not applied yet, and they would
+    never be returned.
+
+    Args:
+        db (AsyncSession): DB session (async).
+        until (datetime): Exclusive upper bound on `updated_at` (the settled watermark).
+        since (datetime, optional): Sync position; None for a full sync.
+        after_id (int, optional): Id of the last row synced at `since`; None when `since` is a watermark.
+        limit (int): Max number of rows to return.
+
+    Returns:
+        List[TeacherProfile]: Changed profiles ordered by (updated_at, id).
+    """
+    stmt = select(TeacherProfile).where(TeacherProfile.updated_at < until)
+    if since is not None:
+        # One range on the index (>= since) keeps the scan in index order;
+        # the OR only filters out rows at `since` that were already synced.
+        stmt = stmt.where(TeacherProfile.updated_at >= since)
+        if after_id is not None:
+            stmt = stmt.where(or_(TeacherProfile.updated_at > since, TeacherProfile.id > after_id))
+    result = await db.execute(stmt.order_by(TeacherProfile.updated_at, TeacherProfile.id).limit(limit))
+    return result.scalars().all()
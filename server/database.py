@@ -1,40 +1,461 @@
 """
 Database configuration module.
-- Loads DATABASE_URL from environment (.env).
-- Creates an async SQLAlchemy engine for DB communication.
-- Provides SessionLocal for generating DB sessions per request.
+- Reads DATABASE_URL and pool settings from the environment (`.env` is
+  loaded once by `server.main`).
+- Creates the async SQLAlchemy engine lazily, once, on first use
+  (normally from the application lifespan) and disposes it on shutdown.
+- Provides SessionLocal and `get_db`, the single request-scoped session dependency.
 - Defines Base for all ORM models to inherit from.
+- Warms up pool connections with a readiness ping.
+- Routes read-only CRUD calls to read replicas (round-robin, health
+  checked), with read-your-writes stickiness after a client writes.
+- Tracks connection-pool wait times for the admin pool statistics endpoint.
+
+Engine settings (environment variables):
+    DB_ECHO            Log every SQL statement (default: false; costly in prod).
+    DB_POOL_SIZE       Persistent connections kept in the pool (default: 5).
+    DB_MAX_OVERFLOW    Extra connections allowed under burst (default: 10).
+    DB_POOL_TIMEOUT    Seconds to wait for a free connection (default: 30).
+    DB_POOL_RECYCLE    Reconnect connections older than this many seconds;
+                       keep below MySQL's wait_timeout (default: 1800).
+    DB_POOL_PRE_PING   Test connections on checkout (default: true).
+    DB_WARMUP_CONNECTIONS  Connections opened at startup (default: 2, capped
+                       at DB_POOL_SIZE).
+
+Replica settings (environment variables):
+    DATABASE_REPLICA_URLS  Comma-separated replica URLs (default: none; every
+                       query then goes to DATABASE_URL).
+    REPLICA_RETRY_SECONDS  How long a failed replica is skipped before it is
+                       tried again (default: 30).
+    REPLICA_HEALTH_INTERVAL  Seconds between background replica pings
+                       (default: 10; 0 disables).
+    REPLICA_STICKY_SECONDS  Read-your-writes window: after a write, that
+                       client's reads (and this worker's directory reads)
+                       go to the primary for this long (default: 5).
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+import functools
+import itertools
+import logging
+import math
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+from fastapi import Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Connection checkout wait times, updated by InstrumentedQueuePool.
+pool_wait_stats = {"waits": 0, "total_wait_s": 0.0, "max_wait_s": 0.0, "timeouts": 0}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long each checkout waited for a connection.
+    A growing average/max wait means the pool is undersized for the load.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_wait_stats["timeouts"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            pool_wait_stats["waits"] += 1
+            pool_wait_stats["total_wait_s"] += waited
+            pool_wait_stats["max_wait_s"] = max(pool_wait_stats["max_wait_s"], waited)
+
+
+def engine_options(url: str) -> dict:
+    """
+    Build `create_async_engine` keyword arguments from the environment.
+    In-memory SQLite uses a single static connection, so pool sizing is skipped.
+    """
+    options = {
+        "echo": _env_bool("DB_ECHO", False),
+        "future": True,
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+    if url.startswith("sqlite") and ":memory:" in url:
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    )
+    return options
+
+
+_engine: Optional[AsyncEngine] = None
+_engine_hooks: List[Callable[[AsyncEngine], None]] = []
+
+
+def on_engine_created(hook: Callable[[AsyncEngine], None]) -> None:
+    """
+    Run `hook(engine)` once the engine exists (immediately if it already does).
+    Used to attach event listeners (e.g. query metrics) without creating the
+    engine at import time.
+    """
+    _engine_hooks.append(hook)
+    if _engine is not None:
+        hook(_engine)
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Return the process-wide async engine, creating it on first call.
+
+    Creating the engine imports the DB driver and dialect, so it is deferred
+    until the application starts (or the first session is opened).
+
+    Raises:
+        ValueError: If DATABASE_URL is not set.
+    """
+    global _engine
+    if _engine is None:
+        url = os.getenv("DATABASE_URL")
+        if not url:
+            raise ValueError("DATABASE_URL not set in environment!")
+        _engine = create_async_engine(url, **engine_options(url))
+        SessionLocal.configure(bind=_engine)
+        for hook in _engine_hooks:
+            hook(_engine)
+    return _engine
+
+
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", 30))
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", 10))
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", 5))
+# Cookie holding the (epoch) time until which a client's reads stay on the primary.
+STICKY_COOKIE = "db_primary_until"
+
+
+class ReplicaSet:
+    """
+    Read replicas picked round-robin, skipping the ones that recently failed.
+
+    A replica is marked down when a connection to it errors (passively, via
+    the engine's `handle_error` event) or when a health ping fails. It is
+    skipped for `retry_seconds`, then tried again. With no healthy replica,
+    reads fall back to the primary.
+
+    Args:
+        urls (list[str]): Replica database URLs.
+        retry_seconds (float): How long a failed replica is skipped.
+    """
+
+    def __init__(self, urls: List[str], retry_seconds: float = 30.0):
+        self.urls = urls
+        self.retry_seconds = retry_seconds
+        self._engines: List[AsyncEngine] = []
+        self._down_until: Dict[int, float] = {}
+        self._cursor = itertools.count()
+        self.reads = 0
+        self.fallbacks = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    def engines(self) -> List[AsyncEngine]:
+        """The replica engines, created on first use."""
+        if not self._engines and self.urls:
+            for index, url in enumerate(self.urls):
+                engine = create_async_engine(url, **engine_options(url))
+                event.listen(engine.sync_engine, "handle_error", functools.partial(self._on_error, index))
+                for hook in _engine_hooks:
+                    hook(engine)
+                self._engines.append(engine)
+        return self._engines
+
+    def _on_error(self, index: int, context) -> None:
+        # Only connection-level failures say anything about replica health.
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(index)
+
+    def mark_down(self, index: int) -> None:
+        if self._down_until.get(index, 0) <= time.monotonic():
+            logger.warning("Replica %d marked down for %.0f s", index, self.retry_seconds)
+        self.failures += 1
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+    def pick(self) -> Optional[AsyncEngine]:
+        """Next healthy replica in round-robin order, or None if all are down."""
+        engines = self.engines()
+        now = time.monotonic()
+        for _ in range(len(engines)):
+            index = next(self._cursor) % len(engines)
+            if self._down_until.get(index, 0) <= now:
+                self.reads += 1
+                return engines[index]
+        self.fallbacks += 1
+        return None
+
+    async def check(self) -> List[bool]:
+        """Ping every replica with `SELECT 1`; failures are marked down, successes back up."""
+        async def ping(index: int, engine: AsyncEngine) -> bool:
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            except (DBAPIError, OSError):
+                self.mark_down(index)
+                return False
+            self._down_until.pop(index, None)
+            return True
+
+        return list(await asyncio.gather(*(ping(i, e) for i, e in enumerate(self.engines()))))
+
+    async def run_health_checks(self, interval: float) -> None:
+        """Ping the replicas every `interval` seconds until cancelled (started by the lifespan)."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.check()
+
+    async def dispose(self) -> None:
+        for engine in self._engines:
+            await engine.dispose()
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "replicas": [
+                {"index": i, "url": engine.url.render_as_string(hide_password=True),
+                 "healthy": self._down_until.get(i, 0) <= now}
+                for i, engine in enumerate(self._engines)
+            ],
+            "replica_reads": self.reads,
+            "primary_fallbacks": self.fallbacks,
+            "failures": self.failures,
+            "sticky_seconds": REPLICA_STICKY_SECONDS,
+        }
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL not set in environment!")
 
-engine = create_async_engine(
-    DATABASE_URL, 
-    echo=True, # Logs SQL queries (disable in prod for performance)
-    future=True 
+replicas = ReplicaSet(
+    [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()],
+    retry_seconds=REPLICA_RETRY_SECONDS,
 )
 
-SessionLocal = sessionmaker(
-    bind=engine,
+# True while a `read_only` CRUD function runs: its SELECTs may use a replica.
+_read_only: ContextVar[bool] = ContextVar("db_read_only", default=False)
+# True when the current client wrote within the sticky window (from its cookie).
+_pinned_to_primary: ContextVar[bool] = ContextVar("db_pinned_to_primary", default=False)
+# Response of the current request, so a commit can set the sticky cookie.
+_current_response: ContextVar[Optional[Response]] = ContextVar("db_current_response", default=None)
+# Monotonic deadline: every read in this worker stays on the primary until then,
+# so caches refilled right after a write never capture a lagging replica.
+_primary_until = 0.0
+
+
+def read_only(fn: Callable) -> Callable:
+    """
+    Mark an async CRUD read `fn(db, ...)` as safe to serve from a replica.
+
+    Only SELECTs issued by the session are routed; a session that already
+    wrote in its transaction keeps reading the primary.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+
+    return wrapper
+
+
+async def read_preference(request: Request, response: Response) -> None:
+    """
+    App-wide dependency: pin this request's reads to the primary if the
+    client wrote within the last REPLICA_STICKY_SECONDS (sticky cookie), and
+    remember the response so a write can set that cookie.
+    """
+    if not replicas.enabled:
+        return
+    _current_response.set(response)
+    try:
+        _pinned_to_primary.set(float(request.cookies.get(STICKY_COOKIE, 0)) > time.time())
+    except ValueError:
+        pass
+
+
+def reads_use_primary() -> bool:
+    """
+    True when read-only SELECTs in the current context must go to the primary:
+    the client is pinned by its sticky cookie, or this worker is inside its
+    read-your-writes window. Always False without replicas.
+    """
+    return replicas.enabled and (_pinned_to_primary.get() or time.monotonic() < _primary_until)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends writes to the primary and read-only CRUD SELECTs to a replica.
+
+    Without DATABASE_REPLICA_URLS it behaves exactly like a plain Session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        writing = self._flushing or (clause is not None and clause.is_dml)
+        if writing:
+            # Also tracked without replicas: single-flight skips sharing for such sessions.
+            self.info["wrote"] = True
+        if not replicas.enabled:
+            return super().get_bind(mapper=mapper, clause=clause, **kw)
+        primary = get_engine().sync_engine
+        if writing:
+            return primary
+        if (
+            not _read_only.get()
+            or self.info.get("wrote")
+            or reads_use_primary()
+            or clause is None
+            or not clause.is_select
+        ):
+            return primary
+        replica = replicas.pick()
+        return replica.sync_engine if replica is not None else primary
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session: Session) -> None:
+    """Start the read-your-writes window after a committed write."""
+    global _primary_until
+    if not session.info.pop("wrote", False) or not replicas.enabled:
+        return
+    _primary_until = time.monotonic() + REPLICA_STICKY_SECONDS
+    response = _current_response.get()
+    if response is not None:
+        response.set_cookie(
+            STICKY_COOKIE, f"{time.time() + REPLICA_STICKY_SECONDS:.3f}",
+            max_age=math.ceil(REPLICA_STICKY_SECONDS), httponly=True, samesite="lax",
+        )
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker that creates the engine on the first session it hands out."""
+
+    def __call__(self, **local_kw):
+        if _engine is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionMaker(
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False
 )
 
+
+async def warm_up(connections: Optional[int] = None) -> dict:
+    """
+    Open `connections` pool connections concurrently and run `SELECT 1` on each.
+
+    Doubles as the readiness check: any failure propagates, so startup fails
+    fast instead of the first requests paying (or failing) the connect.
+    The connections go back to the pool idle, ready for the first requests.
+
+    Args:
+        connections (int, optional): Defaults to DB_WARMUP_CONNECTIONS, capped at the pool size.
+
+    Returns:
+        dict: Connections opened and elapsed milliseconds.
+    """
+    engine = get_engine()
+    if connections is None:
+        connections = int(os.getenv("DB_WARMUP_CONNECTIONS", 2))
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        connections = min(connections, size())
+    else:
+        connections = min(connections, 1)  # single static connection (in-memory SQLite)
+    connections = max(1, connections)
+
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(ping() for _ in range(connections)))
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+    logger.info("Database ready: %d connection(s) warmed up in %.2f ms", connections, elapsed_ms)
+    ready = {"connections": connections, "elapsed_ms": elapsed_ms}
+    if replicas.enabled:
+        # A down replica does not block startup; reads fall back to the primary.
+        ready["replicas_healthy"] = await replicas.check()
+    return ready
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection (application shutdown / reload)."""
+    if _engine is not None:
+        await _engine.dispose()
+    await replicas.dispose()
+
 Base = declarative_base()
 
+
+def get_pool_stats() -> dict:
+    """
+    Snapshot of the engine's connection pool: configured size, connections
+    checked out / idle, current overflow, and cumulative checkout wait times.
+    """
+    pool = get_engine().pool
+    waits = pool_wait_stats["waits"]
+    stats = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedout", "checkedin", "overflow"):
+        method = getattr(pool, name, None)
+        stats[name] = method() if callable(method) else None
+    stats["checked_out"] = stats.pop("checkedout")
+    stats["idle"] = stats.pop("checkedin")
+    stats["max_overflow"] = getattr(pool, "_max_overflow", None)
+    stats["timeout_s"] = pool.timeout() if hasattr(pool, "timeout") else None
+    stats["waits"] = {
+        "count": waits,
+        "timeouts": pool_wait_stats["timeouts"],
+        "avg_ms": round(pool_wait_stats["total_wait_s"] / waits * 1000, 3) if waits else 0.0,
+        "max_ms": round(pool_wait_stats["max_wait_s"] * 1000, 3),
+    }
+    return stats
+
 async def get_db() -> AsyncSession:
     """
-    FastAPI dependency.
-    Yields an async database session.
-    Ensures session is closed after request ends.
+    FastAPI dependency: the request-scoped DB session.
+
+    This is the only session provider; every dependency and route depends on
+    this same callable, so FastAPI's per-request dependency cache hands them
+    all one shared session (e.g. `get_current_user` and the route body).
+
+    The session is lazy: it checks out a pooled connection only when the
+    first statement runs, so unauthenticated, rejected or fully cached
+    requests never touch the pool. It is closed (connection returned) when
+    the request ends.
     """
     async with SessionLocal() as session:
         yield session
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+instagram.py
+Upstream sources for the homepage Instagram feed (`GET /api/instagram/feed`).
+
+The feed is served from an SWRCache (see caching.py), so page loads never
+wait on Instagram. The upstream fetcher is pluggable:
+- GraphFetcher: the Instagram Graph API (`/me/media`), used when
+  INSTAGRAM_ACCESS_TOKEN is set.
+- StubFetcher: posts from a local JSON file (INSTAGRAM_STUB_FILE), or an
+  empty feed; used in development, tests and benchmarks.
+
+Settings (environment variables):
+    INSTAGRAM_ACCESS_TOKEN     Long-lived Graph API token (default: none -> stub).
+    INSTAGRAM_STUB_FILE        JSON file with `{"data": [...]}` for the stub.
+    INSTAGRAM_FEED_LIMIT       Posts returned (default: 9).
+    INSTAGRAM_FEED_TTL_SECONDS Freshness of a snapshot (default: 900).
+    INSTAGRAM_FEED_RETRY_SECONDS  Minimum gap between retries after a failure (default: 60).
+    INSTAGRAM_FEED_CACHE_PATH  On-disk snapshot (default: <tmp>/school-api-instagram-feed.json).
+    INSTAGRAM_TIMEOUT_SECONDS  Upstream request timeout (default: 5).
+"""
+import asyncio
+import json
+import os
+import tempfile
+import urllib.parse
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .caching import SWRCache
+
+INSTAGRAM_ACCESS_TOKEN = os.getenv("INSTAGRAM_ACCESS_TOKEN")
+INSTAGRAM_STUB_FILE = os.getenv("INSTAGRAM_STUB_FILE")
+INSTAGRAM_FEED_LIMIT = int(os.getenv("INSTAGRAM_FEED_LIMIT", 9))
+INSTAGRAM_FEED_TTL_SECONDS = float(os.getenv("INSTAGRAM_FEED_TTL_SECONDS", 900))
+INSTAGRAM_FEED_RETRY_SECONDS = float(os.getenv("INSTAGRAM_FEED_RETRY_SECONDS", 60))
+INSTAGRAM_FEED_CACHE_PATH = os.getenv(
+    "INSTAGRAM_FEED_CACHE_PATH", os.path.join(tempfile.gettempdir(), "school-api-instagram-feed.json")
+)
+INSTAGRAM_TIMEOUT_SECONDS = float(os.getenv("INSTAGRAM_TIMEOUT_SECONDS", 5))
+
+GRAPH_MEDIA_URL = "https://graph.instagram.com/me/media"
+# Fields the client renders (see client/src/components/InstagramFeed.jsx).
+POST_FIELDS = ("id", "caption", "media_type", "media_url", "thumbnail_url", "permalink", "timestamp")
+
+FeedFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+def normalize_feed(payload: Dict[str, Any], limit: int = INSTAGRAM_FEED_LIMIT) -> Dict[str, List[dict]]:
+    """Keep the first `limit` posts and only the fields the client uses."""
+    posts = payload.get("data") or []
+    return {"data": [{field: post.get(field) for field in POST_FIELDS} for post in posts[:limit]]}
+
+
+class GraphFetcher:
+    """
+    Fetch recent media from the Instagram Graph API.
+
+    Uses urllib in a worker thread, so the API needs no extra HTTP client.
+
+    Args:
+        access_token (str): Long-lived user access token.
+        limit (int): Posts to request.
+        timeout (float): Request timeout in seconds.
+    """
+
+    def __init__(self, access_token: str, limit: int = INSTAGRAM_FEED_LIMIT, timeout: float = INSTAGRAM_TIMEOUT_SECONDS):
+        self.access_token = access_token
+        self.limit = limit
+        self.timeout = timeout
+
+    def _get(self) -> Dict[str, Any]:
+        import urllib.request  # pulls in ssl/http.client; only needed when a token is configured
+
+        query = urllib.parse.urlencode({
+            "fields": ",".join(POST_FIELDS),
+            "limit": self.limit,
+            "access_token": self.access_token,
+        })
+        with urllib.request.urlopen(f"{GRAPH_MEDIA_URL}?{query}", timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    async def __call__(self) -> Dict[str, Any]:
+        return normalize_feed(await asyncio.to_thread(self._get), self.limit)
+
+
+class StubFetcher:
+    """
+    Local stand-in for the upstream: posts from a JSON file, or an empty feed.
+
+    Args:
+        path (str, optional): File containing `{"data": [...]}` in Graph API shape.
+        limit (int): Posts to return.
+    """
+
+    def __init__(self, path: Optional[str] = None, limit: int = INSTAGRAM_FEED_LIMIT):
+        self.path = path
+        self.limit = limit
+
+    async def __call__(self) -> Dict[str, Any]:
+        if not self.path:
+            return {"data": []}
+        with open(self.path, "rb") as f:
+            return normalize_feed(json.loads(f.read()), self.limit)
+
+
+def default_fetcher() -> FeedFetcher:
+    """Graph API when a token is configured, otherwise the stub."""
+    if INSTAGRAM_ACCESS_TOKEN:
+        return GraphFetcher(INSTAGRAM_ACCESS_TOKEN)
+    return StubFetcher(INSTAGRAM_STUB_FILE)
+
+
+# Process-wide feed cache; swap `instagram_feed.fetch` to plug in another source.
+instagram_feed = SWRCache(
+    default_fetcher(),
+    ttl=INSTAGRAM_FEED_TTL_SECONDS,
+    retry_interval=INSTAGRAM_FEED_RETRY_SECONDS,
+    disk_path=INSTAGRAM_FEED_CACHE_PATH or None,
+)
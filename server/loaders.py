@@ -0,0 +1,117 @@
+"""
+loaders.py
+DataLoader-style request coalescing.
+
+Concurrent `load(key)` calls arriving within a short window are merged into
+one batch function call (one `WHERE id IN (...)` query), and callers asking
+for the same key share the same result. Loaders are process-wide, so they
+batch across requests and use their own DB session, never a request's.
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+from .crud import teacherProfileCrud as crud
+from .database import SessionLocal
+
+
+class BatchLoader:
+    """
+    Coalesces concurrent key lookups into batched calls.
+
+    Args:
+        batch_fn: Coroutine function taking a list of keys and returning a
+            dict of key -> value; missing keys resolve to None.
+        window_s (float): How long to collect keys before dispatching.
+        max_batch (int): Dispatch early once this many distinct keys are pending.
+
+    Attributes:
+        requested (int): Keys requested through `load`/`load_many`.
+        batches (int): Batch function calls made (i.e. DB round trips).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        window_s: float = 0.002,
+        max_batch: int = 500,
+    ):
+        self.batch_fn = batch_fn
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.requested = 0
+        self.batches = 0
+
+    def _future_for(self, key: Hashable) -> asyncio.Future:
+        self.requested += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch:
+                self._schedule_dispatch(loop, immediate=True)
+            elif self._timer is None:
+                self._schedule_dispatch(loop)
+        return future
+
+    def _schedule_dispatch(self, loop: asyncio.AbstractEventLoop, immediate: bool = False) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if immediate:
+            self._start_batch()
+        else:
+            self._timer = loop.call_later(self.window_s, self._start_batch)
+
+    def _start_batch(self) -> None:
+        self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.ensure_future(self._dispatch(batch))
+
+    async def _dispatch(self, batch: Dict[Hashable, asyncio.Future]) -> None:
+        self.batches += 1
+        try:
+            values = await self.batch_fn(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
+
+    async def load(self, key: Hashable) -> Any:
+        """Value for `key` (or None), batched with concurrent callers."""
+        # shield: one cancelled caller must not cancel the result for the others.
+        return await asyncio.shield(self._future_for(key))
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """Values for `keys` in order (None where missing), in as few batches as possible."""
+        futures = [self._future_for(key) for key in keys]
+        return list(await asyncio.shield(asyncio.gather(*futures)))
+
+    def stats(self) -> dict:
+        """How many keys were requested and how many batch calls served them."""
+        return {"requested": self.requested, "batches": self.batches}
+
+
+async def _load_teachers(ids: List[int]) -> Dict[int, Any]:
+    # The loader already merges concurrent lookups, so it bypasses the
+    # single-flight layer (`__wrapped__`), which would run the query on a
+    # second session of its own: one session per batch.
+    async with SessionLocal() as session:
+        profiles = await crud.get_teachers_by_ids.__wrapped__(session, ids)
+    return {profile.id: profile for profile in profiles}
+
+
+# Teacher profiles by id, shared by GET /teachers/{id} and GET /teachers/batch.
+teacher_loader = BatchLoader(
+    _load_teachers,
+    window_s=float(os.getenv("TEACHER_LOADER_WINDOW_MS", 2)) / 1000,
+    max_batch=int(os.getenv("TEACHER_LOADER_MAX_BATCH", 500)),
+)
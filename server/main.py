@@ -1,27 +1,201 @@
 """
 Main FastAPI application entry point.
 
-This file wires together the application, including routers and 
+This file wires together the application, including routers and
 lifecycle events. It acts as the central hub for the API.
+
+The lifespan handler owns process-wide resources:
+- Startup: create the engine, warm up pool connections (readiness ping),
+  ping the read replicas and start their health checks, start the password
+  worker pool, build the search index and start syncing it, compile the
+  programs catalog and start watching its file, start the Instagram feed
+  refresh and the contact writer, and prime the response caches.
+- Shutdown: stop the health checks, index sync, catalog watcher and feed
+  refresh, drain the contact writer, stop the password workers, and
+  dispose the engines.
+
+Startup settings (environment variables):
+    DB_WARMUP_CONNECTIONS  Pool connections opened at startup (see database.py).
+    SEARCH_INDEX_ENABLED   Build the in-memory teacher search index (default: true).
+    SEARCH_INDEX_SYNC_SECONDS  How often each worker applies teacher changes
+                           made by other workers to its index (default: 30;
+                           0 disables). See search.py for the staleness bound.
+    CACHE_WARMUP_PATHS     Comma-separated GET paths requested once at startup
+                           to fill the response caches (default: /teachers/).
 """
-from fastapi import FastAPI
-from server.routers import auth, teachers
+from dotenv import load_dotenv
+
+# Load `.env` once, before any server module reads its settings.
+load_dotenv()
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from fastapi import Depends, FastAPI
+from server import database
+from server.contact import contact_writer
+from server.crud import teacherProfileCrud
+from server.metrics import MetricsMiddleware, instrument_engine
+from server.models.types import utc_now
+from server.instagram import instagram_feed
+from server.programs import PROGRAMS_RELOAD_INTERVAL, programs_catalog
+from server.routers import admin, auth, contact, instagram, metrics, programs, teachers
+from server.search import profile_snapshot, teacher_index
+from server.security import password_hasher
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+SEARCH_INDEX_SYNC_SECONDS = float(os.getenv("SEARCH_INDEX_SYNC_SECONDS", 30))
+SEARCH_INDEX_SYNC_BATCH = 1000
+CACHE_WARMUP_PATHS = [p.strip() for p in os.getenv("CACHE_WARMUP_PATHS", "/teachers/").split(",") if p.strip()]
+
+
+async def _active_teacher_snapshots():
+    async with database.SessionLocal() as session:
+        async for profile in teacherProfileCrud.stream_active_teachers(session):
+            yield profile_snapshot(profile)
+
+
+def _settled_watermark() -> datetime:
+    """Change-feed upper bound: rows older than this are committed (see GET /teachers/changes)."""
+    return utc_now() - timedelta(seconds=teachers.CHANGES_SETTLE_SECONDS)
+
+
+async def _sync_search_index(since: datetime, after_id: Optional[int] = None) -> Tuple[datetime, Optional[int]]:
+    """
+    Apply profile changes after the sync position to `teacher_index`.
+
+    Reads the change feed (every write stamps `updated_at`, including
+    deactivations), so edits and (de)activations made on other workers reach
+    this worker's copy of the index. Re-applying a change it already has is
+    harmless.
+
+    Returns:
+        The new sync position, to pass to the next call.
+    """
+    until = _settled_watermark()
+    if until <= since:
+        return since, after_id
+    async with database.SessionLocal() as session:
+        while True:
+            rows = await teacherProfileCrud.list_teacher_changes(
+                session, until=until, since=since, after_id=after_id, limit=SEARCH_INDEX_SYNC_BATCH,
+            )
+            teacher_index.add_many(profile_snapshot(row) for row in rows)
+            if len(rows) < SEARCH_INDEX_SYNC_BATCH:
+                return until, None
+            since, after_id = rows[-1].updated_at, rows[-1].id
+
+
+async def _run_search_index_sync(interval: float, since: datetime) -> None:
+    """Sync the search index every `interval` seconds until cancelled (started by the lifespan)."""
+    position = (since, None)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            position = await _sync_search_index(*position)
+        except Exception:  # keep syncing; the next round resumes from the same position
+            logger.exception("Search index sync failed")
+
+
+async def _prime_path(app: FastAPI, path: str) -> int:
+    """
+    Send one in-process GET through the full ASGI stack and discard the body.
+
+    Fills the response cache entry for `path` exactly as a client request
+    would, and compiles the route's serializers along the way.
+
+    Returns:
+        int: Response status code.
+    """
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": query.encode(), "headers": [(b"host", b"warmup")],
+        "client": ("127.0.0.1", 0), "server": ("warmup", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create and warm shared resources on startup; release them on shutdown."""
+    logger.info("App starting up")
+    database.get_engine()
+    await database.warm_up()
+    health_checks = None
+    if database.replicas.enabled and database.REPLICA_HEALTH_INTERVAL > 0:
+        health_checks = asyncio.create_task(database.replicas.run_health_checks(database.REPLICA_HEALTH_INTERVAL))
+    password_hasher.start()
+    index_sync = None
+    if SEARCH_INDEX_ENABLED:
+        # Taken before the build: changes racing it are applied again by the sync.
+        synced_until = _settled_watermark()
+        await teacher_index.rebuild(_active_teacher_snapshots())
+        if SEARCH_INDEX_SYNC_SECONDS > 0:
+            index_sync = asyncio.create_task(_run_search_index_sync(SEARCH_INDEX_SYNC_SECONDS, synced_until))
+    await programs_catalog.reload_if_changed()
+    catalog_watcher = None
+    if PROGRAMS_RELOAD_INTERVAL > 0:
+        catalog_watcher = asyncio.create_task(programs_catalog.run_reloader(PROGRAMS_RELOAD_INTERVAL))
+    # Warm the feed without holding up startup (it may call the upstream).
+    instagram_feed.warm()
+    contact_writer.start()
+    for path in CACHE_WARMUP_PATHS:
+        status = await _prime_path(app, path)
+        if status >= 400:
+            logger.warning("Cache warm-up GET %s returned %d", path, status)
+
+    yield
+
+    for task in (health_checks, index_sync, catalog_watcher):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    await instagram_feed.close()
+    # Before the engine goes away: write every acknowledged submission.
+    await contact_writer.close()
+    password_hasher.shutdown()
+    await database.dispose_engine()
+
 
 app = FastAPI(
     title="School API",
-    description="API for managing authentication and teacher profiles.",
+    description="API for managing authentication, teacher profiles and the programs catalog.",
     version="1.0.1",
+    lifespan=lifespan,
+    # Read-your-writes stickiness for replica routing (no-op without replicas).
+    dependencies=[Depends(database.read_preference)],
 )
 
+app.add_middleware(MetricsMiddleware)
+database.on_engine_created(instrument_engine)
+
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(teachers.router, prefix="/teachers", tags=["teachers"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+app.include_router(instagram.router, prefix="/api/instagram", tags=["instagram"])
+app.include_router(programs.router, prefix="/programs", tags=["programs"])
+app.include_router(contact.router, prefix="/contact", tags=["contact"])
+app.include_router(metrics.router, tags=["metrics"])
 
 @app.get("/", tags=["root"])
 async def read_root():
     return {"status": "ok", "message": "School API is running"}
-
-@app.on_event("startup")
-async def startup_event():
-    print("🚀 App starting up!")
-
-    
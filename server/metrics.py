@@ -0,0 +1,258 @@
+"""
+metrics.py
+Request and database instrumentation, exported in Prometheus text format.
+- MetricsMiddleware: per-route latency histograms and status-code counts.
+- instrument_engine: SQLAlchemy cursor hooks that count queries and DB time
+  for the request that issued them.
+- render_prometheus: text exposition served by GET /metrics.
+Every statement is also handed to `querylog` (slow-query log, N+1 detection).
+
+Per-request DB numbers are also attached to the request (`request.state.db`)
+and returned in a `Server-Timing` header, so a slow `/auth/login` can be told
+apart as bcrypt-bound (high app time, low db time) or DB-bound.
+"""
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from . import querylog
+from .admission import password_gate
+from .contact import contact_writer
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestDBStats:
+    """Queries, DB time and per-statement counts accumulated by one request."""
+    __slots__ = ("queries", "db_time", "statements", "scope")
+
+    def __init__(self, scope=None):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements: Counter = Counter()
+        self.scope = scope
+
+
+# Set by the middleware for the lifetime of a request; None outside requests.
+current_request_db: ContextVar[Optional[RequestDBStats]] = ContextVar("current_request_db", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """In-process store for every metric this module exports."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.request_latency: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.request_count: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.request_db_queries: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.request_db_time: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.db_queries_total = 0
+        self.db_time_total = 0.0
+
+    def record_request(self, method: str, route: str, status: int, duration: float, db: RequestDBStats) -> None:
+        key = (method, route)
+        self.request_latency[key].observe(duration)
+        self.request_count[(method, route, str(status))] += 1
+        self.request_db_queries[key] += db.queries
+        self.request_db_time[key] += db.db_time
+
+
+registry = MetricsRegistry()
+
+
+def _route_label(scope) -> str:
+    """Route template (e.g. /teachers/{teacher_id}) to keep label cardinality bounded."""
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no extra task per request, unlike BaseHTTPMiddleware)
+    that times each HTTP request and records its DB usage.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        db_stats = RequestDBStats(scope)
+        token = current_request_db.set(db_stats)
+        scope.setdefault("state", {})["db"] = db_stats
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                timing = (
+                    f"app;dur={elapsed_ms:.1f}, "
+                    f"db;dur={db_stats.db_time * 1000:.1f};desc=\"{db_stats.queries} queries\""
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_db.reset(token)
+            route = _route_label(scope)
+            registry.record_request(scope["method"], route, status, time.perf_counter() - start, db_stats)
+            querylog.check_request(scope["method"], route, db_stats.statements)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    registry.db_queries_total += 1
+    registry.db_time_total += elapsed
+    stats = current_request_db.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+    querylog.record(
+        statement, parameters, executemany, elapsed,
+        route=_route_label(stats.scope) if stats is not None else None,
+        request_statements=stats.statements if stats is not None else None,
+    )
+
+
+def _handle_error(exception_context):
+    # Keep the start-time stack balanced when a statement fails.
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach query counting/timing hooks to `engine` (idempotent)."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus() -> str:
+    """Serialize the registry in Prometheus text exposition format (v0.0.4)."""
+    lines = [
+        "# HELP http_requests_total HTTP requests by method, route template and status.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(registry.request_count.items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds HTTP request latency by method and route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), hist in sorted(registry.request_latency.items()):
+        for bound, count in zip(hist.buckets, hist.counts):
+            lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {count}")
+        lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le='+Inf')} {hist.count}")
+        lines.append(f"http_request_duration_seconds_sum{_labels(method=method, route=route)} {hist.total:.6f}")
+        lines.append(f"http_request_duration_seconds_count{_labels(method=method, route=route)} {hist.count}")
+
+    lines += [
+        "# HELP http_request_db_queries_total SQL statements issued while serving each route.",
+        "# TYPE http_request_db_queries_total counter",
+    ]
+    for (method, route), count in sorted(registry.request_db_queries.items()):
+        lines.append(f"http_request_db_queries_total{_labels(method=method, route=route)} {count}")
+
+    lines += [
+        "# HELP http_request_db_seconds_total Time spent in SQL statements while serving each route.",
+        "# TYPE http_request_db_seconds_total counter",
+    ]
+    for (method, route), seconds in sorted(registry.request_db_time.items()):
+        lines.append(f"http_request_db_seconds_total{_labels(method=method, route=route)} {seconds:.6f}")
+
+    lines += [
+        "# HELP db_queries_total SQL statements executed by the engine.",
+        "# TYPE db_queries_total counter",
+        f"db_queries_total {registry.db_queries_total}",
+        "# HELP db_query_seconds_total Total time spent executing SQL statements.",
+        "# TYPE db_query_seconds_total counter",
+        f"db_query_seconds_total {registry.db_time_total:.6f}",
+    ]
+
+    gate = password_gate.stats()
+    lines += [
+        "# HELP password_admission_in_flight Password (bcrypt) operations running now.",
+        "# TYPE password_admission_in_flight gauge",
+        f"password_admission_in_flight {gate['in_flight']}",
+        "# HELP password_admission_queued Password operations waiting for a slot.",
+        "# TYPE password_admission_queued gauge",
+        f"password_admission_queued {gate['queued']}",
+        "# HELP password_admission_admitted_total Password operations admitted.",
+        "# TYPE password_admission_admitted_total counter",
+        f"password_admission_admitted_total {gate['admitted']}",
+        "# HELP password_admission_shed_total Password requests rejected with 429, by reason.",
+        "# TYPE password_admission_shed_total counter",
+    ]
+    for reason, count in sorted(gate["shed"].items()):
+        lines.append(f"password_admission_shed_total{_labels(reason=reason)} {count}")
+
+    contact = contact_writer.stats()
+    lines += [
+        "# HELP contact_queue_pending Contact submissions acknowledged but not yet written.",
+        "# TYPE contact_queue_pending gauge",
+        f"contact_queue_pending {contact['pending']}",
+        "# HELP contact_rejected_total Contact submissions refused with 503 (queue full or shutting down).",
+        "# TYPE contact_rejected_total counter",
+        f"contact_rejected_total {contact['rejected']}",
+        "# HELP contact_written_total Contact submissions written to the database.",
+        "# TYPE contact_written_total counter",
+        f"contact_written_total {contact['written']}",
+        "# HELP contact_write_failures_total Failed contact INSERTs (retried, or split into single rows).",
+        "# TYPE contact_write_failures_total counter",
+        f"contact_write_failures_total {contact['failures']}",
+        "# HELP contact_dropped_total Contact submissions that could not be written and were dropped (logged).",
+        "# TYPE contact_dropped_total counter",
+        f"contact_dropped_total {contact['dropped']}",
+    ]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,16 @@
+"""
+migrations
+One-off schema migrations for existing databases, run by hand:
+
+    python -m server.migrations.<name> [--dry-run]
+
+Fresh databases get the current schema from the models and need none of
+these. Each migration inspects the live schema first, so running it twice
+(or again after an interruption) is safe.
+
+Available:
+- teacher_timestamps: teacher_profiles.created_at/updated_at/deleted_at
+  from VARCHAR(50) to real UTC timestamps, plus the change-feed index.
+- teacher_directory_indexes: the directory pagination index and, on MySQL,
+  the FULLTEXT index the DB search fallback needs.
+"""
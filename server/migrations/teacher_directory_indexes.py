@@ -0,0 +1,87 @@
+"""
+Create the teacher directory indexes declared on TeacherProfile on an
+existing database:
+- ix_teacher_profiles_is_active_id (is_active, id): keyset pagination of
+  the public directory;
+- ix_teacher_profiles_name_bio_fulltext FULLTEXT (name, bio), MySQL only:
+  the DB-side search fallback (`MATCH ... AGAINST`) used until the
+  in-memory search index is built. MySQL rejects that query without it.
+
+Each index is skipped when the schema already has it. The DDL is compiled
+from the model, so it matches what a fresh database gets.
+
+Usage:
+    python -m server.migrations.teacher_directory_indexes [--dry-run]
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import argparse
+import asyncio
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
+
+from server.database import dispose_engine, get_engine
+from server.models.teacherProfile import TeacherProfile
+
+TABLE = TeacherProfile.__tablename__
+# Index name -> dialects it applies to (None: every dialect).
+INDEXES = {
+    "ix_teacher_profiles_is_active_id": None,
+    "ix_teacher_profiles_name_bio_fulltext": ("mysql",),
+}
+
+
+def _index_names(sync_conn) -> set:
+    return {index["name"] for index in inspect(sync_conn).get_indexes(TABLE)}
+
+
+async def migrate(dry_run: bool = False) -> list[str]:
+    """
+    Create the missing directory indexes.
+
+    Returns:
+        list[str]: The statements run (or that would be, with `dry_run`).
+    """
+    engine = get_engine()
+    dialect = engine.dialect
+    async with engine.connect() as conn:
+        existing = await conn.run_sync(_index_names)
+
+    steps: list[str] = []
+    for index in sorted(TeacherProfile.__table__.indexes, key=lambda index: index.name):
+        if index.name not in INDEXES or index.name in existing:
+            continue
+        dialects = INDEXES[index.name]
+        if dialects is not None and dialect.name not in dialects:
+            continue
+        sql = str(CreateIndex(index).compile(dialect=dialect))
+        steps.append(sql)
+        if not dry_run:
+            async with engine.begin() as conn:
+                await conn.execute(text(sql))
+    return steps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true", help="Print the statements without running them.")
+    args = parser.parse_args()
+
+    async def run() -> list[str]:
+        try:
+            return await migrate(args.dry_run)
+        finally:
+            await dispose_engine()
+
+    steps = asyncio.run(run())
+    for step in steps:
+        print(("would run: " if args.dry_run else "ran: ") + step)
+    if not steps:
+        print("teacher_profiles directory indexes are already in place.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Convert teacher_profiles.created_at / updated_at / deleted_at from
+VARCHAR(50) to real UTC timestamps and add the change-feed index.
+
+Steps (each skipped when the schema shows it is already done):
+1. Add `<column>_new` timestamp columns (DATETIME(6) on MySQL).
+2. Backfill them in batches of ids from the old strings (ISO-8601 as
+   written by the bulk status endpoints; unparsable values count as empty):
+   - created_at: the old value, or the migration time;
+   - updated_at: the latest known timestamp, or the migration time;
+   - deleted_at: the old value, or for inactive profiles the updated_at
+     above; always empty for active profiles.
+3. Drop the old columns and rename the new ones (MySQL 8.0+, SQLite 3.35+).
+   On MySQL created_at/updated_at become NOT NULL; SQLite cannot change
+   nullability in place, and the application always sets both.
+4. Create ix_teacher_profiles_updated_at_id (updated_at, id).
+
+Every backfilled row gets an updated_at, so the first `GET /teachers/changes`
+sync after the migration returns the whole directory once.
+
+Usage:
+    python -m server.migrations.teacher_timestamps [--dry-run] [--batch-size 1000]
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.types import DateTime
+
+from server.database import dispose_engine, get_engine
+from server.models.teacherProfile import TeacherProfile
+from server.models.types import UTCDateTime
+
+TABLE = TeacherProfile.__tablename__
+COLUMNS = ("created_at", "updated_at", "deleted_at")
+NOT_NULL = ("created_at", "updated_at")
+INDEX = "ix_teacher_profiles_updated_at_id"
+
+
+def _parse(value) -> Optional[datetime]:
+    """Old VARCHAR value as aware UTC, or None when empty or unparsable."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not value or not str(value).strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+    return parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _backfill_row(row, migrated_at: datetime) -> dict:
+    created = _parse(row.created_at)
+    updated = _parse(row.updated_at)
+    deleted = _parse(row.deleted_at)
+    known = [value for value in (created, updated, deleted) if value is not None]
+    updated = max(known) if known else migrated_at
+    return {
+        "row_id": row.id,
+        "created_at_new": created or updated,
+        "updated_at_new": updated,
+        "deleted_at_new": None if row.is_active else (deleted or updated),
+    }
+
+
+def _schema(sync_conn) -> dict:
+    inspector = inspect(sync_conn)
+    return {
+        "columns": {column["name"]: column["type"] for column in inspector.get_columns(TABLE)},
+        "indexes": {index["name"] for index in inspector.get_indexes(TABLE)},
+    }
+
+
+async def migrate(dry_run: bool = False, batch_size: int = 1000) -> list[str]:
+    """
+    Bring teacher_profiles to the current timestamp schema.
+
+    Returns:
+        list[str]: The steps performed (or that would be, with `dry_run`).
+    """
+    engine = get_engine()
+    dialect = engine.dialect
+    column_type = UTCDateTime().load_dialect_impl(dialect).compile(dialect=dialect)
+    steps: list[str] = []
+
+    async with engine.connect() as conn:
+        schema = await conn.run_sync(_schema)
+    columns = schema["columns"]
+
+    def pending(column: str) -> bool:
+        return f"{column}_new" in columns or not isinstance(columns[column], DateTime)
+
+    to_convert = [column for column in COLUMNS if pending(column)]
+
+    async def run(sql: str) -> None:
+        steps.append(sql)
+        if not dry_run:
+            async with engine.begin() as conn:
+                await conn.execute(text(sql))
+
+    for column in to_convert:
+        if f"{column}_new" not in columns:
+            await run(f"ALTER TABLE {TABLE} ADD COLUMN {column}_new {column_type} NULL")
+
+    if to_convert:
+        steps.append(f"backfill {', '.join(f'{column}_new' for column in COLUMNS if column in to_convert)} "
+                     f"in batches of {batch_size}")
+        if not dry_run:
+            migrated_at = datetime.now(timezone.utc)
+            # Columns already converted are read as they are; only the pending ones are written.
+            stamp = UTCDateTime()
+            update = text(
+                f"UPDATE {TABLE} SET "
+                + ", ".join(f"{column}_new = :{column}_new" for column in to_convert)
+                + " WHERE id = :row_id"
+            ).bindparams(*(bindparam(f"{column}_new", type_=stamp) for column in to_convert))
+            # A column already swapped by an interrupted run is read as NULL.
+            old_values = ", ".join(column if column in columns else f"NULL AS {column}" for column in COLUMNS)
+            last_id = 0
+            while True:
+                async with engine.begin() as conn:
+                    rows = (await conn.execute(
+                        text(f"SELECT id, is_active, {old_values} FROM {TABLE} "
+                             "WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                        {"last_id": last_id, "limit": batch_size},
+                    )).all()
+                    if not rows:
+                        break
+                    values = [_backfill_row(row, migrated_at) for row in rows]
+                    await conn.execute(update, [
+                        {"row_id": value["row_id"], **{f"{c}_new": value[f"{c}_new"] for c in to_convert}}
+                        for value in values
+                    ])
+                last_id = rows[-1].id
+
+    for column in to_convert:
+        if column in columns:
+            await run(f"ALTER TABLE {TABLE} DROP COLUMN {column}")
+        await run(f"ALTER TABLE {TABLE} RENAME COLUMN {column}_new TO {column}")
+        if dialect.name == "mysql" and column in NOT_NULL:
+            await run(f"ALTER TABLE {TABLE} MODIFY {column} {column_type} NOT NULL")
+
+    if INDEX not in schema["indexes"]:
+        await run(f"CREATE INDEX {INDEX} ON {TABLE} (updated_at, id)")
+    return steps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true", help="Print the steps without changing anything.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    async def run() -> list[str]:
+        try:
+            return await migrate(args.dry_run, args.batch_size)
+        finally:
+            await dispose_engine()
+
+    steps = asyncio.run(run())
+    for step in steps:
+        print(("would run: " if args.dry_run else "ran: ") + step)
+    if not steps:
+        print("teacher_profiles timestamps are already up to date.")
+
+
+if __name__ == "__main__":
+    main()
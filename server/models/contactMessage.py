@@ -0,0 +1,34 @@
+"""
+ContactMessage Model
+Messages submitted through the public contact form (`POST /contact`).
+Rows are written in batches by the contact writer (see contact.py), not by
+the request that received them.
+"""
+from sqlalchemy import Column, Integer, String, Text
+from ..database import Base
+from .types import UTCDateTime, utc_now
+
+class ContactMessage(Base):
+    """
+    Database model for contact form submissions.
+
+    Table name: `contact_messages`
+
+    Attributes:
+        id (int): Primary key; increases with insertion order.
+        name (str): Sender's name.
+        email (str): Sender's reply address.
+        subject (str, optional): Subject line.
+        message (str): Message body.
+        client_ip (str, optional): Address the submission came from.
+        created_at (datetime): When the API accepted the submission (not when it was written).
+    """
+    __tablename__ = "contact_messages"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    email = Column(String(255), nullable=False)
+    subject = Column(String(150))
+    message = Column(Text, nullable=False)
+    client_ip = Column(String(45))
+    created_at = Column(UTCDateTime, nullable=False, default=utc_now)
@@ -3,10 +3,11 @@ TeacherProfile Model
 Defines the database model for teacher profiles.
 Each teacher profile is linked to exactly one user account (one-to-one relationship).
 """
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 from .user import User
+from .types import UTCDateTime, utc_now
 
 class TeacherProfile(Base):    
     """
@@ -23,8 +24,24 @@ class TeacherProfile(Base):
         bio (str, optional): Short biography or description of the teacher.
         image_url (str, optional): URL to the teacher's profile image.
         is_active (bool): Flag indicating whether the teacher's profile is active.
+        created_at (datetime): When the profile was created (UTC).
+        updated_at (datetime): Last change to the row (UTC); stamped on every
+            INSERT/UPDATE issued through SQLAlchemy. Drives `GET /teachers/changes`.
+        deleted_at (datetime, optional): When the profile was deactivated (soft
+            delete); cleared on reactivation.
     """
     __tablename__ = "teacher_profiles"
+    # Existing databases get these indexes from server/migrations
+    # (teacher_timestamps, teacher_directory_indexes).
+    __table_args__ = (
+        # Backs keyset pagination of the public directory:
+        # WHERE is_active = true AND id > :cursor ORDER BY id
+        Index("ix_teacher_profiles_is_active_id", "is_active", "id"),
+        # Backs the change feed: WHERE (updated_at, id) > (:t, :id) ORDER BY updated_at, id
+        Index("ix_teacher_profiles_updated_at_id", "updated_at", "id"),
+        # DB-side fallback for directory search (MySQL only; other backends use LIKE).
+        Index("ix_teacher_profiles_name_bio_fulltext", "name", "bio", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
@@ -32,8 +49,8 @@ class TeacherProfile(Base):
     bio = Column(String(500))
     image_url = Column(String(255))
     is_active = Column(Boolean, default=True)
-    created_at = Column(String(50))
-    updated_at = Column(String(50))
-    deleted_at = Column(String(50), nullable=True)
+    created_at = Column(UTCDateTime, nullable=False, default=utc_now)
+    updated_at = Column(UTCDateTime, nullable=False, default=utc_now, onupdate=utc_now)
+    deleted_at = Column(UTCDateTime, nullable=True)
 
     user = relationship("User", back_populates="teacher_profile")
@@ -0,0 +1,41 @@
+"""
+Shared column types for the ORM models.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+def utc_now() -> datetime:
+    """Current time as an aware UTC datetime (Python-side column default)."""
+    return datetime.now(timezone.utc)
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    Timestamp stored as naive UTC with microseconds, returned as aware UTC.
+
+    MySQL gets DATETIME(6); a plain DATETIME would truncate to whole seconds
+    and make rows written in the same second indistinguishable. Aware values
+    are converted to UTC before binding; naive values are taken as UTC.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            from sqlalchemy.dialects.mysql import DATETIME  # only loaded on MySQL deployments
+
+            return dialect.type_descriptor(DATETIME(fsp=6))
+        return dialect.type_descriptor(DateTime())
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
@@ -0,0 +1,73 @@
+"""
+pagination.py
+Opaque cursor helpers for keyset pagination.
+
+A cursor encodes the sort key of the last row of a page (currently the
+primary key) as URL-safe base64 JSON. Clients must treat it as opaque.
+Sync tokens (`GET /teachers/changes`) work the same way with an
+(updated_at, id) position.
+"""
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(last_id: int) -> str:
+    """Build the cursor pointing just after the row with `last_id`."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Return the last-seen id encoded in `cursor`, or None for the first page.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+        if not isinstance(last_id, int):
+            raise ValueError
+        return last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+
+
+def encode_sync_token(position: datetime, last_id: Optional[int] = None) -> str:
+    """
+    Build the sync token for a change-feed position.
+
+    `last_id` is the id of the last row returned at `position`; without it
+    the token is a watermark (resume with rows at or after `position`).
+    """
+    payload = {"t": position.astimezone(timezone.utc).isoformat(), "id": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_sync_token(token: Optional[str]) -> Tuple[Optional[datetime], Optional[int]]:
+    """
+    Return the (position, last_id) encoded in `token`, or (None, None) for a full sync.
+
+    Raises:
+        HTTPException: 400 if the token is malformed.
+    """
+    if not token:
+        return None, None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        position = datetime.fromisoformat(payload["t"])
+        last_id = payload["id"]
+        if position.tzinfo is None or not (last_id is None or isinstance(last_id, int)):
+            raise ValueError
+        return position, last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid sync token.")
@@ -0,0 +1,275 @@
+"""
+programs.py
+Academic programs catalog served by `GET /programs/` and `GET /programs/{id}`.
+
+The catalog is a JSON data file (`{"programs": [...]}`, see data/programs.json)
+that is validated and compiled once per change into an immutable snapshot:
+- every response body (the list and each program) is serialized once;
+- each body is pre-compressed once with gzip, and with brotli when the
+  optional `brotli` package is installed;
+- each representation gets a strong content-hash ETag, and the catalog a
+  content-hash `version`.
+
+Requests only negotiate Content-Encoding and copy bytes. Responses are
+cacheable for PROGRAMS_MAX_AGE_SECONDS; requests that name the current
+version (`?v=<version>`) are cacheable for a year as `immutable`, since any
+edit produces a new version and therefore a new URL.
+
+The file is polled every PROGRAMS_RELOAD_INTERVAL seconds (lifespan task)
+and recompiled when its mtime or size changes. An invalid edit is logged and
+the previous snapshot keeps being served.
+
+Settings (environment variables):
+    PROGRAMS_DATA_FILE          Catalog file (default: server/data/programs.json).
+    PROGRAMS_RELOAD_INTERVAL    Seconds between change checks; 0 disables (default: 2).
+    PROGRAMS_MAX_AGE_SECONDS    Cache-Control max-age for unversioned requests (default: 300).
+"""
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from .caching import _etag_matches
+from .schemas import ProgramSchemas
+from .schemas.serializers import adapter_for
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+PROGRAMS_DATA_FILE = os.getenv(
+    "PROGRAMS_DATA_FILE", os.path.join(os.path.dirname(__file__), "data", "programs.json")
+)
+PROGRAMS_RELOAD_INTERVAL = float(os.getenv("PROGRAMS_RELOAD_INTERVAL", 2))
+PROGRAMS_MAX_AGE_SECONDS = int(os.getenv("PROGRAMS_MAX_AGE_SECONDS", 300))
+
+IMMUTABLE_MAX_AGE_SECONDS = 365 * 24 * 3600
+# Bodies smaller than this are not worth a Content-Encoding.
+MIN_COMPRESS_BYTES = 256
+
+
+def _compress(body: bytes) -> Dict[str, bytes]:
+    """Identity body plus every encoding that actually makes it smaller."""
+    variants = {"identity": body}
+    if len(body) < MIN_COMPRESS_BYTES:
+        return variants
+    candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        candidates["br"] = brotli.compress(body, quality=11)
+    for encoding, data in candidates.items():
+        if len(data) < len(body):
+            variants[encoding] = data
+    return variants
+
+
+class CompiledResponse:
+    """
+    One resource, serialized and compressed once.
+
+    Attributes:
+        variants (dict): Content-Encoding -> (body bytes, strong ETag).
+    """
+
+    __slots__ = ("variants", "etags")
+
+    def __init__(self, body: bytes):
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: Dict[str, Tuple[bytes, str]] = {
+            encoding: (data, f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"')
+            for encoding, data in _compress(body).items()
+        }
+        self.etags = tuple(etag for _, etag in self.variants.values())
+
+
+class CatalogSnapshot:
+    """Immutable compiled catalog: the list response and one response per program id."""
+
+    def __init__(self, catalog, source: Tuple[int, int]):
+        self.version = catalog.version
+        self.source = source
+        self.count = len(catalog.programs)
+        self.loaded_at = time.time()
+        self.listing = CompiledResponse(adapter_for(ProgramSchemas.Catalog).dump_json(catalog))
+        program_adapter = adapter_for(ProgramSchemas.Read)
+        self.details = {program.id: CompiledResponse(program_adapter.dump_json(program)) for program in catalog.programs}
+
+    def size(self) -> dict:
+        """Bytes held per encoding, summed over all responses."""
+        totals: Dict[str, int] = {}
+        for response in (self.listing, *self.details.values()):
+            for encoding, (data, _) in response.variants.items():
+                totals[encoding] = totals.get(encoding, 0) + len(data)
+        return totals
+
+
+@lru_cache(maxsize=256)
+def _negotiate(accept_encoding: str, available: Tuple[str, ...]) -> str:
+    """Pick br, then gzip, then identity according to an Accept-Encoding header."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return "identity"
+
+
+class ProgramCatalog:
+    """
+    Hot-reloadable, precompiled program catalog.
+
+    Args:
+        path (str): Catalog data file.
+        max_age (int): Cache-Control max-age for unversioned requests.
+
+    Attributes:
+        reloads (int): Successful compilations (including the first load).
+        failures (int): Loads rejected because the file was missing or invalid.
+    """
+
+    def __init__(self, path: str = PROGRAMS_DATA_FILE, max_age: int = PROGRAMS_MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age = max_age
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._rejected_source: Optional[Tuple[int, int]] = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.served: Dict[str, int] = {}
+        self.not_modified = 0
+
+    def _source(self) -> Tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def _compile(self) -> CatalogSnapshot:
+        source = self._source()
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        catalog = ProgramSchemas.Catalog.model_validate_json(raw)
+        # Version from the validated content, so whitespace-only edits keep it.
+        content = adapter_for(list[ProgramSchemas.Read]).dump_json(catalog.programs)
+        catalog.version = hashlib.sha256(content).hexdigest()[:12]
+        return CatalogSnapshot(catalog, source)
+
+    def load(self) -> bool:
+        """
+        Compile the data file and swap in the new snapshot.
+
+        Returns:
+            bool: True on success; on failure the previous snapshot (if any) stays.
+        """
+        try:
+            snapshot = self._compile()
+        except (OSError, ValueError) as e:  # pydantic ValidationError is a ValueError
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.error("Program catalog %s not loaded, keeping the previous one: %s", self.path, self.last_error)
+            return False
+        previous, self._snapshot = self._snapshot, snapshot
+        self.reloads += 1
+        self.last_error = None
+        if previous is None or previous.version != snapshot.version:
+            logger.info("Program catalog loaded: %d programs, version %s", snapshot.count, snapshot.version)
+        return True
+
+    async def reload_if_changed(self) -> bool:
+        """Recompile (in a worker thread) when the file's mtime or size changed."""
+        try:
+            source = self._source()
+        except OSError:
+            source = None
+        if self._snapshot is not None and source == self._snapshot.source:
+            return False
+        if source == self._rejected_source:
+            return False  # same broken or missing file; already reported
+        loaded = await asyncio.to_thread(self.load)
+        self._rejected_source = None if loaded else source
+        return loaded
+
+    async def run_reloader(self, interval: float) -> None:
+        """Poll the data file every `interval` seconds until cancelled (started by the lifespan)."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.reload_if_changed()
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._snapshot.version if self._snapshot is not None else None
+
+    def respond(self, request: Request, program_id: Optional[str] = None) -> Optional[Response]:
+        """
+        Serve the list (or one program) from the compiled snapshot.
+
+        Args:
+            request (Request): Incoming request (Accept-Encoding, If-None-Match, `v`).
+            program_id (str, optional): Program slug; None for the list.
+
+        Returns:
+            Response: 200 with the negotiated representation or 304; None if
+            `program_id` is unknown.
+
+        Raises:
+            LookupError: No catalog has been loaded.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise LookupError(self.last_error or "program catalog not loaded")
+        compiled = snapshot.listing if program_id is None else snapshot.details.get(program_id)
+        if compiled is None:
+            return None
+
+        encoding = _negotiate(request.headers.get("accept-encoding", ""), tuple(compiled.variants))
+        body, etag = compiled.variants[encoding]
+        if request.query_params.get("v") == snapshot.version:
+            cache_control = f"public, max-age={IMMUTABLE_MAX_AGE_SECONDS}, immutable"
+        else:
+            cache_control = f"public, max-age={self.max_age}"
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and any(_etag_matches(if_none_match, candidate) for candidate in compiled.etags):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        self.served[encoding] = self.served.get(encoding, 0) + 1
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "path": self.path,
+            "version": snapshot.version if snapshot else None,
+            "programs": snapshot.count if snapshot else 0,
+            "loaded_at": snapshot.loaded_at if snapshot else None,
+            "bytes": snapshot.size() if snapshot else {},
+            "brotli": brotli is not None,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "served": dict(self.served),
+            "not_modified": self.not_modified,
+        }
+
+
+# Process-wide catalog; loaded and watched by the lifespan in main.py.
+programs_catalog = ProgramCatalog()
@@ -0,0 +1,149 @@
+"""
+querylog.py
+Structured slow-query log, N+1 detection and aggregated statement stats.
+
+Fed by the cursor hooks in `metrics.py`:
+- Statements slower than SLOW_QUERY_THRESHOLD_MS are logged as one JSON
+  line with normalized SQL, parameter shape, duration and originating route.
+- A request that runs the same normalized statement more than
+  N_PLUS_ONE_THRESHOLD times (e.g. lazy loads of `TeacherProfile.user`)
+  is logged and kept in a short report list.
+- Every statement is aggregated by normalized SQL so the admin endpoint
+  can return the top-K by total, mean or max time. Past
+  MAX_TRACKED_STATEMENTS distinct statements, new ones are no longer
+  aggregated (counted in `untracked`) but are still slow-logged.
+"""
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter, deque
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 10))
+# Bound on distinct normalized statements tracked (keeps memory fixed).
+MAX_TRACKED_STATEMENTS = int(os.getenv("QUERYLOG_MAX_STATEMENTS", 1000))
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Collapse a statement to its shape: literals become `?`, IN-lists of any
+    length become `(...)` and so do multi-row VALUES lists, so `WHERE id IN
+    (1, 2)` and `IN (3)` group together, as do INSERTs of 2 and 200 rows.
+    """
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    return _REPEATED_GROUPS.sub("(...)", sql)
+
+
+def params_shape(parameters: Any, executemany: bool) -> str:
+    """Describe parameters without logging their (possibly sensitive) values."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameters[0] if parameters else ()
+        return f"executemany[{len(parameters)} x {len(first)}]"
+    if isinstance(parameters, dict):
+        return "dict[" + ",".join(sorted(map(str, parameters))) + "]"
+    if isinstance(parameters, (list, tuple)):
+        return f"tuple[{len(parameters)}]"
+    return type(parameters).__name__
+
+
+class StatementStats:
+    """Aggregated timings of one normalized statement."""
+    __slots__ = ("sql", "count", "total_s", "max_s", "slow_count", "last_route")
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.slow_count = 0
+        self.last_route: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": round(self.total_s * 1000, 3),
+            "mean_ms": round(self.total_s / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max_s * 1000, 3),
+            "slow_count": self.slow_count,
+            "last_route": self.last_route,
+        }
+
+
+statements: Dict[str, StatementStats] = {}
+n_plus_one_reports: deque = deque(maxlen=50)
+# Executions of statements not aggregated because `statements` was full.
+untracked = 0
+
+
+def record(statement: str, parameters: Any, executemany: bool, elapsed: float,
+           route: Optional[str], request_statements: Optional[Counter]) -> None:
+    """Aggregate one executed statement and log it if it was slow."""
+    global untracked
+    sql = normalize_sql(statement)
+    if request_statements is not None:
+        request_statements[sql] += 1
+
+    stats = statements.get(sql)
+    if stats is None and len(statements) < MAX_TRACKED_STATEMENTS:
+        stats = statements[sql] = StatementStats(sql)
+    slow = elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS
+    if stats is None:
+        untracked += 1
+    else:
+        stats.count += 1
+        stats.total_s += elapsed
+        stats.max_s = max(stats.max_s, elapsed)
+        stats.last_route = route
+        if slow:
+            stats.slow_count += 1
+
+    if slow:
+        logger.warning("slow_query %s", json.dumps({
+            "duration_ms": round(elapsed * 1000, 3),
+            "route": route,
+            "sql": sql,
+            "params": params_shape(parameters, executemany),
+        }))
+
+
+def check_request(method: str, route: str, request_statements: Counter) -> None:
+    """Flag statements a single request repeated more than N_PLUS_ONE_THRESHOLD times."""
+    for sql, count in request_statements.items():
+        if count > N_PLUS_ONE_THRESHOLD:
+            report = {"at": time.time(), "method": method, "route": route, "sql": sql, "count": count}
+            n_plus_one_reports.append(report)
+            logger.warning("n_plus_one %s", json.dumps(report))
+
+
+def top_statements(limit: int = 20, order_by: str = "total") -> list:
+    """Top-K aggregated statements by `total`, `mean` or `max` time."""
+    keys = {
+        "total": lambda s: s.total_s,
+        "mean": lambda s: s.total_s / s.count if s.count else 0.0,
+        "max": lambda s: s.max_s,
+    }
+    ranked = sorted(statements.values(), key=keys[order_by], reverse=True)
+    return [s.as_dict() for s in ranked[:limit]]
+
+
+def reset() -> None:
+    """Forget aggregated statements and N+1 reports."""
+    global untracked
+    statements.clear()
+    untracked = 0
+    n_plus_one_reports.clear()
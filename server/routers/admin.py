@@ -0,0 +1,113 @@
+"""
+Admin Router
+Operational endpoints for administrators (runtime statistics, diagnostics).
+Every endpoint requires an authenticated admin.
+"""
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from .. import database, querylog, security
+from ..admission import password_gate
+from ..caching import teacher_responses
+from ..contact import contact_writer
+from ..instagram import instagram_feed
+from ..loaders import teacher_loader
+from ..programs import programs_catalog
+from ..security import require_admin
+from ..singleflight import read_flights
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/db/pool")
+async def db_pool_stats():
+    """
+    Connection pool statistics for sizing DB_POOL_SIZE / DB_MAX_OVERFLOW.
+
+    Returns:
+        Pool size, checked-out and idle connections, overflow in use, and
+        cumulative checkout wait times (count, timeouts, avg/max ms).
+    """
+    return database.get_pool_stats()
+
+
+@router.get("/db/replicas")
+async def db_replica_stats():
+    """
+    Read replica routing state.
+
+    Returns:
+        Each replica's health, reads routed to replicas, fallbacks to the
+        primary (no healthy replica) and connection failures seen.
+    """
+    return database.replicas.stats()
+
+
+@router.get("/db/slow-queries")
+async def db_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: Literal["total", "mean", "max"] = "total",
+):
+    """
+    Top-K statements aggregated by normalized SQL, plus recent N+1 reports.
+
+    Args:
+        limit (int): Number of statements to return.
+        order_by (str): Rank by `total`, `mean` or `max` time.
+
+    Returns:
+        Thresholds in effect, the ranked statements, executions left out of the
+        aggregation once the statement cap was reached, and the last N+1 detections.
+    """
+    return {
+        "slow_query_threshold_ms": querylog.SLOW_QUERY_THRESHOLD_MS,
+        "n_plus_one_threshold": querylog.N_PLUS_ONE_THRESHOLD,
+        "statements": querylog.top_statements(limit, order_by),
+        "untracked_executions": querylog.untracked,
+        "n_plus_one": list(querylog.n_plus_one_reports),
+    }
+
+
+@router.get("/cache")
+async def cache_stats():
+    """
+    Hit/miss and coalescing counters for the in-process caches.
+
+    Returns:
+        Principal/token caches, teacher response cache, teacher loader
+        batching, single-flight collapsed-call counts, the Instagram feed
+        snapshot (age, stale hits, refreshes, upstream failures) and the
+        programs catalog (version, precompressed bytes, reloads).
+    """
+    return {
+        "identity": security.principal_cache_stats(),
+        "teacher_responses": teacher_responses.stats(),
+        "teacher_loader": teacher_loader.stats(),
+        "single_flight": read_flights.stats(),
+        "instagram_feed": instagram_feed.stats(),
+        "programs_catalog": programs_catalog.stats(),
+    }
+
+
+@router.get("/admission")
+async def admission_stats():
+    """
+    Password admission gate state (login/register/teacher creation).
+
+    Returns:
+        Concurrency limit, current in-flight and queued operations, peak queue
+        depth, admitted count, and 429 sheds by reason (ip_rate, email_rate,
+        queue_full, queue_timeout).
+    """
+    return password_gate.stats()
+
+
+@router.get("/contact")
+async def contact_writer_stats():
+    """
+    Contact form write-behind queue.
+
+    Returns:
+        Submissions pending, accepted and refused (queue full), rows and
+        batches written, largest batch, and failed INSERT attempts.
+    """
+    return contact_writer.stats()
@@ -7,70 +7,80 @@ Provides endpoints for:
 - Current User Info
 - Protected Routes (requires authentication)
 
+Register and login spend one bcrypt computation each, so both pass through
+the password admission gate (per-IP/per-email token buckets and a bounded
+concurrency queue) and may answer 429 with Retry-After under load.
+
 This router integrates with FastAPI's dependency injection,
 SQLAlchemy AsyncSession for DB access, and JWT-based authentication.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
 from ..schemas import UserSchemas
 from ..models import user as user_model
+from ..crud.sqlHelpers import insert_returning
 from .. import database, security
-from ..database import SessionLocal
+from ..admission import password_gate
+from ..database import get_db
 
 router = APIRouter()
 
-# Dependency: async DB session
-async def get_db() -> AsyncSession:
-    """
-    Async DB dependency.
-    Yields an AsyncSession from SessionLocal.
-    """
-    async with SessionLocal() as session:
-        yield session
-
-
 @router.post("/register", response_model=UserSchemas.Read, status_code=status.HTTP_201_CREATED)
-async def register(user: UserSchemas.Create, db: AsyncSession = Depends(get_db)):
+async def register(user: UserSchemas.Create, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Register a new user (async).
-    """
-    # Check if email exists
-    result = await db.execute(
-        select(user_model.User).filter(user_model.User.email == user.email)
-    )
-    db_user = result.scalars().first()
 
-    if db_user:
+    Relies on the unique constraint on `users.email` instead of a pre-check
+    SELECT: one INSERT ... RETURNING plus the COMMIT. A duplicate email
+    surfaces as an IntegrityError and is mapped to 400.
+    """
+    password_gate.charge(request, email=user.email)
+
+    # Hash password first (runs in the password worker pool, no DB connection held)
+    async with password_gate.slot():
+        hashed_pw = await security.hash_password(user.password)
+
+    try:
+        new_user = await insert_returning(db, user_model.User, {
+            "email": user.email,
+            "password_hash": hashed_pw,
+            "role": user.role,
+        })
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-
-    # Hash password
-    hashed_pw = security.hash_password(user.password)
-
-    new_user = user_model.User(
-        email=user.email,
-        password_hash=hashed_pw,
-        role=user.role,
-    )
-
-    db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
+    security.invalidate_principal(email=new_user["email"])
 
     return new_user
 
 
 @router.post("/login", status_code=status.HTTP_200_OK)
-async def login(user: UserSchemas.Login, db: AsyncSession = Depends(get_db)):
+async def login(user: UserSchemas.Login, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Authenticate a user (async).
+
+    Rate limits are charged before the user lookup, so a shed attempt costs
+    neither a query nor a bcrypt verify.
     """
+    password_gate.charge(request, email=user.email)
+
     result = await db.execute(
         select(user_model.User).filter(user_model.User.email == user.email)
     )
     db_user = result.scalars().first()
 
-    if not db_user or not security.verify_password(user.password, db_user.password_hash):
+    # Return the pooled connection before the ~250 ms bcrypt verify;
+    # the loaded attributes stay readable on the detached object.
+    await db.close()
+
+    valid = False
+    if db_user:
+        async with password_gate.slot():
+            valid = await security.verify_password(user.password, db_user.password_hash)
+    if not valid or not db_user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     token = security.create_access_token(
@@ -81,7 +91,7 @@ async def login(user: UserSchemas.Login, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserSchemas.Read, status_code=status.HTTP_200_OK)
-async def read_users_me(current_user: user_model.User = Depends(security.get_current_user)):
+async def read_users_me(current_user: security.Principal = Depends(security.get_current_user)):
     """
     Retrieve current user (async).
     """
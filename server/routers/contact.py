@@ -0,0 +1,75 @@
+"""
+Contact Router
+Public contact form submissions and the admin inbox.
+Submissions are acknowledged as soon as they are queued; the contact writer
+(see contact.py) stores them in batches, so a slow database never slows
+down the form.
+"""
+import math
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..contact import contact_writer
+from ..crud import contactMessageCrud as crud
+from ..database import get_db
+from ..pagination import decode_cursor, encode_cursor
+from ..schemas import ContactSchemas
+from ..security import require_admin
+
+router = APIRouter()
+
+
+@router.post("", response_model=ContactSchemas.Receipt, status_code=202)
+async def submit_contact_message(message: ContactSchemas.Create, request: Request):
+    """
+    Accept a contact form submission (ContactForm.jsx).
+
+    Expected body example:
+    {
+      "name": "Arya Stark",
+      "email": "arya@example.com",
+      "subject": "Inscripciones",
+      "message": "¿Cuándo abren las inscripciones?"
+    }
+
+    Returns:
+        202 Accepted with `{"status": "queued"}`; the message is written shortly after.
+
+    Raises:
+        422 Unprocessable Entity: Missing/empty name or message, invalid email, fields too long.
+        503 Service Unavailable: The write queue is full or the server is shutting down.
+    """
+    queued = contact_writer.submit({
+        **message.model_dump(),
+        "client_ip": request.client.host if request.client else None,
+    })
+    if not queued:
+        raise HTTPException(
+            status_code=503,
+            detail="Contact form temporarily unavailable, retry later.",
+            headers={"Retry-After": str(max(1, math.ceil(contact_writer.flush_interval)))},
+        )
+    return ContactSchemas.Receipt()
+
+
+@router.get("/messages", response_model=ContactSchemas.Page, dependencies=[Depends(require_admin)])
+async def list_contact_messages(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Admin inbox: stored contact messages, newest first.
+
+    Args:
+        cursor (str, optional): `next_cursor` of the previous page.
+        limit (int): Page size.
+
+    Returns:
+        `{"items": [...], "next_cursor": ...}`. Submissions still queued
+        (see GET /admin/contact) appear once the writer has flushed them.
+    """
+    rows = await crud.list_contact_messages(db, before_id=decode_cursor(cursor), limit=limit + 1)
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].id) if len(rows) > limit and items else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,32 @@
+"""
+Instagram Router
+Serves the homepage Instagram feed from a stale-while-revalidate cache.
+Page loads never wait on the upstream: stale snapshots are served while one
+background refresh runs, and the last good snapshot survives upstream outages.
+"""
+import logging
+from fastapi import APIRouter, HTTPException, Request
+from ..instagram import instagram_feed
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/feed")
+async def instagram_feed_posts(request: Request):
+    """
+    Recent Instagram posts for the homepage.
+
+    Returns:
+        `{"data": [{id, caption, media_type, media_url, thumbnail_url, permalink, timestamp}]}`
+        with an ETag (304 on If-None-Match) and Cache-Control max-age.
+
+    Raises:
+        503 Service Unavailable: Only on a cold start when the upstream is down
+        and no snapshot has ever been stored.
+    """
+    try:
+        return await instagram_feed.respond(request)
+    except Exception as e:
+        logger.warning("Instagram feed unavailable: %s", e)
+        raise HTTPException(status_code=503, detail="Instagram feed temporarily unavailable.")
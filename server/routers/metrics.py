@@ -0,0 +1,17 @@
+"""
+Metrics Router
+Exposes runtime metrics in Prometheus text format for scraping.
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from .. import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Per-route request counts, latency histograms and DB query/time totals.
+    """
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
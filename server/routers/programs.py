@@ -0,0 +1,51 @@
+"""
+Programs Router
+Public academic programs catalog (pages/Programs.jsx, CourseDetails.jsx).
+Responses are precompiled and precompressed when the catalog file is
+loaded; see programs.py.
+"""
+import logging
+from fastapi import APIRouter, HTTPException, Request
+from ..programs import programs_catalog
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _serve(request: Request, program_id: str = None):
+    try:
+        response = programs_catalog.respond(request, program_id)
+    except LookupError as e:
+        logger.warning("Program catalog unavailable: %s", e)
+        raise HTTPException(status_code=503, detail="Program catalog temporarily unavailable.")
+    if response is None:
+        raise HTTPException(status_code=404, detail="Program not found")
+    return response
+
+
+@router.get("/")
+async def list_programs(request: Request):
+    """
+    All programs, in catalog order.
+
+    Returns:
+        `{"version": str, "programs": [{id, icon, title, description, duration,
+        curriculum, subjects, requirements, objectives}]}`. Add `?v=<version>`
+        to get a long-lived immutable response.
+
+    Raises:
+        503 Service Unavailable: The catalog file has never loaded.
+    """
+    return _serve(request)
+
+
+@router.get("/{program_id}")
+async def get_program(program_id: str, request: Request):
+    """
+    One program by its slug id.
+
+    Raises:
+        404 Not Found: Unknown id.
+        503 Service Unavailable: The catalog file has never loaded.
+    """
+    return _serve(request, program_id)
@@ -3,21 +3,83 @@ Teacher Router
 Defines API endpoints for creating and retrieving teacher profiles.
 Endpoints use the CRUD layer (`teacherProfileCrud`) to interact with the database.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from ..crud import teacherProfileCrud as crud
 from ..schemas import TeacherSchemas
-from ..security import get_current_user, get_db
+from ..schemas.serializers import FastJSONResponse, dump_json
+from ..security import get_current_user, hash_password, require_admin
+from ..database import get_db
 from .. import database
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Literal, Optional, Union
+from ..pagination import decode_cursor, decode_sync_token, encode_cursor, encode_sync_token
+from ..models.types import utc_now
+from ..caching import teacher_responses
+from ..loaders import teacher_loader
+from ..search import teacher_index
+from ..admission import password_gate
+from pydantic import ValidationError
+import csv
+import json
 import logging
+import os
+from datetime import timedelta
+from uuid import uuid4
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Rows fetched per server-side cursor round trip in streaming exports.
+EXPORT_BATCH_SIZE = 1000
+# Approximate size of each body chunk written by streaming exports.
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Rows written per transaction by the bulk import.
+BULK_CHUNK_SIZE = 500
+BULK_CSV_TYPES = {"text/csv", "application/csv"}
+BULK_NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+# Upper bound on ids accepted by GET /teachers/batch.
+BATCH_MAX_IDS = 100
+
+# GET /teachers/changes only returns rows older than this, so transactions
+# still in flight (and small clock skew between workers) are never skipped.
+CHANGES_SETTLE_SECONDS = float(os.getenv("TEACHER_CHANGES_SETTLE_SECONDS", 2))
+CHANGES_MAX_LIMIT = 1000
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated fields to return, e.g. `id,name,image_url` (`id` is always included).",
+)
+
+def _parse_fields(fields: Optional[str]) -> Optional[tuple[str, ...]]:
+    """
+    `?fields=` as a tuple of Read fields in response order, always with `id`;
+    None (whole profiles) when absent, empty or naming every field.
+    Unknown names answer 400.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(TeacherSchemas.FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(TeacherSchemas.FIELDS)}.",
+        )
+    requested.add("id")
+    if len(requested) == len(TeacherSchemas.FIELDS):
+        return None
+    return tuple(name for name in TeacherSchemas.FIELDS if name in requested)
+
 @router.post("/", response_model=TeacherSchemas.Read, status_code=201)
 async def create_profile(
     profile: TeacherSchemas.Create,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
@@ -35,6 +97,8 @@ async def create_profile(
     - If `email` and `password` included: these will be used to create the linked User.
     - Otherwise a User is auto-created with a generated email & random password.
     - Returns the created TeacherProfile (including user_id).
+    - Hashing the new user's password goes through the password admission
+      gate, so this may answer 429 with Retry-After under a login storm.
     """
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated.")
@@ -42,6 +106,12 @@ async def create_profile(
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can create teacher profiles.")
 
+    password_gate.charge(request, email=profile.email)
+    # Hash first (password worker pool); the slot is released before any DB work.
+    # Without a password the user gets a random one and must reset it.
+    async with password_gate.slot():
+        password_hash = await hash_password(profile.password or uuid4().hex)
+
     teacher = await crud.create_teacher_with_auto_user(
         db=db,
         name=profile.name,
@@ -49,53 +119,412 @@ async def create_profile(
         image_url=profile.image_url or "",
         is_active=profile.is_active,
         email=profile.email,         # optional
-        password=profile.password,   # optional
-        user_id=None                 
+        password_hash=password_hash,
+        user_id=None
     )
 
     return teacher
 
-@router.get("/", response_model=list[TeacherSchemas.Read])
-async def list_teachers_paginated(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+async def _iter_upload_records(request: Request) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Parse a streamed CSV (with header row) or NDJSON upload line by line.
+
+    Yields `(row_number, record, error)`; exactly one of record/error is set.
+    CSV fields may not contain embedded newlines.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in BULK_CSV_TYPES:
+        is_csv = True
+    elif content_type in BULK_NDJSON_TYPES:
+        is_csv = False
+    else:
+        raise HTTPException(status_code=415, detail="Upload must be text/csv or application/x-ndjson.")
+
+    header: Optional[list[str]] = None
+    row_number = 0
+    pending = b""
+
+    def parse(raw: bytes):
+        nonlocal header
+        text = raw.decode("utf-8-sig").strip()
+        if not text:
+            return None
+        if not is_csv:
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError:
+                return "Invalid JSON."
+            return record if isinstance(record, dict) else "Each line must be a JSON object."
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            return None
+        # Empty CSV cells mean "not provided".
+        return {key: value for key, value in zip(header, values) if value != ""}
+
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            parsed = parse(line)
+            if parsed is not None:
+                row_number += 1
+                yield (row_number, parsed, None) if isinstance(parsed, dict) else (row_number, None, parsed)
+    parsed = parse(pending)
+    if parsed is not None:
+        row_number += 1
+        yield (row_number, parsed, None) if isinstance(parsed, dict) else (row_number, None, parsed)
+
+
+@router.post("/bulk", response_model=TeacherSchemas.BulkReport, response_class=FastJSONResponse)
+async def bulk_import_teachers(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(require_admin),
+):
+    """
+    Admin-only bulk import of teacher profiles.
+
+    Body: a streamed CSV upload (`Content-Type: text/csv`, header row with
+    any of name,bio,image_url,is_active,email,password) or NDJSON
+    (`Content-Type: application/x-ndjson`, one object per line with the same
+    keys as `POST /teachers/`).
+
+    Rows are validated as they arrive and written in chunks of
+    BULK_CHUNK_SIZE: passwords hashed through the password gate a few at a
+    time (interactive logins are not shed behind the import), users and
+    profiles inserted with multi-row INSERTs, one transaction per chunk.
+
+    Returns:
+        Counts plus a per-row report (created ids or the error).
+    """
+    report: list[dict] = []
+    chunk: list = []
+    chunk_numbers: list[int] = []
+
+    async def flush() -> None:
+        results = await crud.bulk_create_teachers(db, chunk)
+        report.extend({"row": number, **result} for number, result in zip(chunk_numbers, results))
+        chunk.clear()
+        chunk_numbers.clear()
+
+    async for number, record, error in _iter_upload_records(request):
+        if error is not None:
+            report.append({"row": number, "status": "error", "error": error})
+            continue
+        try:
+            chunk.append(TeacherSchemas.Create.model_validate(record))
+        except ValidationError as e:
+            first = e.errors()[0]
+            field = ".".join(str(part) for part in first["loc"])
+            report.append({"row": number, "status": "error", "email": record.get("email"),
+                           "error": f"{field}: {first['msg']}" if field else first["msg"]})
+            continue
+        chunk_numbers.append(number)
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+
+    report.sort(key=lambda result: result["row"])
+    created = sum(1 for result in report if result["status"] == "created")
+    return {"created": created, "failed": len(report) - created, "results": report}
+
+
+async def _change_status(body: TeacherSchemas.StatusChange, db: AsyncSession, is_active: bool) -> dict:
+    counts = await crud.set_teachers_active(db, is_active, teacher_ids=body.ids, name_contains=body.name_contains)
+    return {"is_active": is_active, **counts}
+
+
+@router.post("/activate", response_model=TeacherSchemas.StatusReport)
+async def activate_teachers(
+    body: TeacherSchemas.StatusChange,
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(require_admin),
+):
+    """
+    Admin-only: activate many teachers by `ids` or by `name_contains` filter.
+
+    One set-based UPDATE per chunk of STATUS_UPDATE_CHUNK_SIZE ids; clears
+    `deleted_at` and stamps `updated_at`.
+
+    Returns:
+        Targets, rows updated, and rows left unchanged (missing or already active).
+    """
+    return await _change_status(body, db, True)
+
+
+@router.post("/deactivate", response_model=TeacherSchemas.StatusReport)
+async def deactivate_teachers(
+    body: TeacherSchemas.StatusChange,
+    db: AsyncSession = Depends(get_db),
+    admin = Depends(require_admin),
+):
+    """
+    Admin-only: deactivate (soft delete) many teachers by `ids` or by `name_contains` filter.
+
+    One set-based UPDATE per chunk of STATUS_UPDATE_CHUNK_SIZE ids; stamps
+    `deleted_at` and `updated_at`.
+
+    Returns:
+        Targets, rows updated, and rows left unchanged (missing or already inactive).
+    """
+    return await _change_status(body, db, False)
+
+
+@router.get("/", response_model=Union[TeacherSchemas.Page, list[TeacherSchemas.Read]], response_class=FastJSONResponse)
+async def list_teachers_paginated(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
     """
     List active teacher profiles with pagination.
 
+    Two modes:
+    - Offset (default, legacy): `?skip=20&limit=10` returns a plain list.
+    - Cursor: `?cursor=&limit=10` for the first page, then pass the returned
+      `next_cursor`. Returns `{"items": [...], "next_cursor": ...}` and costs
+      the same at any depth.
+
+    `?fields=id,name,image_url` returns only those fields (plus `id`) and
+    selects only those columns. Responses are cached with an ETag;
+    `If-None-Match` revalidation answers 304.
+
     Args:
-        skip (int): Number of records to skip (default=0).
-        limit (int): Max number of records to return (default=10).
+        skip (int): Number of records to skip (offset mode, default=0).
+        limit (int): Max number of records to return (1-100, default=10).
+        cursor (str, optional): Opaque cursor; presence selects cursor mode.
+        fields (str, optional): Comma-separated Read fields to return.
 
     Returns:
         A paginated list of teacher profiles.
     """
-    return await crud.list_active_teachers(db, skip=skip, limit=limit)
+    columns = _parse_fields(fields)
+    read_schema = TeacherSchemas.Read if columns is None else TeacherSchemas.read_subset(columns)
+    page_schema = TeacherSchemas.Page if columns is None else TeacherSchemas.page_subset(columns)
+    after_id = None if cursor is None else decode_cursor(cursor)
+
+    async def produce() -> bytes:
+        if cursor is None:
+            rows = await crud.list_active_teachers(db, skip=skip, limit=limit, columns=columns)
+            return dump_json(list[read_schema], rows)
+
+        # Fetch one extra row to know whether another page exists.
+        rows = await crud.list_active_teachers_after(db, after_id=after_id, limit=limit + 1, columns=columns)
+        items = rows[:limit]
+        next_cursor = encode_cursor(items[-1].id) if len(rows) > limit and items else None
+        return dump_json(page_schema, {"items": items, "next_cursor": next_cursor})
+
+    params = ("offset", skip, limit, columns) if cursor is None else ("cursor", after_id, limit, columns)
+    return await teacher_responses.respond(request, produce, params)
 
-@router.get("/all", response_model=list[TeacherSchemas.Read])
-async def list_all_teachers(db: Session = Depends(get_db)):
+async def _export_active_teachers(fmt: str, columns: Optional[tuple[str, ...]] = None) -> AsyncIterator[bytes]:
+    """
+    Serialize active teachers incrementally as NDJSON or as a chunked JSON array
+    (only `columns` when given).
+
+    Rows are written into ~64 KiB chunks. Opens its own session: the response
+    body is produced after the request's dependencies have been torn down.
+    """
+    separator = b"\n" if fmt == "ndjson" else b","
+    buffer: list[bytes] = [b"["] if fmt == "json" else []
+    buffered = 0
+    first = True
+    schema = TeacherSchemas.Read if columns is None else TeacherSchemas.read_subset(columns)
+    async with database.SessionLocal() as session:
+        async for profile in crud.stream_active_teachers(session, batch_size=EXPORT_BATCH_SIZE, columns=columns):
+            row = dump_json(schema, profile)
+            if columns is None:
+                # Drop the ORM instance from the identity map once it is serialized.
+                session.expunge(profile)
+            if fmt == "ndjson":
+                buffer.append(row + separator)
+            else:
+                buffer.append(row if first else separator + row)
+            first = False
+            buffered += len(row) + 1
+            if buffered >= EXPORT_CHUNK_BYTES:
+                yield b"".join(buffer)
+                buffer.clear()
+                buffered = 0
+    if fmt == "json":
+        buffer.append(b"]")
+    if buffer:
+        yield b"".join(buffer)
+
+
+@router.get("/all", response_model=list[TeacherSchemas.Read], response_class=FastJSONResponse)
+async def list_all_teachers(
+    request: Request,
+    stream: Optional[Literal["ndjson", "json"]] = Query(None),
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db),
+):
     """
     List all active teacher profiles without pagination.
 
-    ⚠️ Use with caution: May return a large dataset.
+    ⚠️ Use with caution: May return a large dataset. For large directories
+    pass `?stream=ndjson` (one JSON object per line) or `?stream=json`
+    (a chunked JSON array): rows are read through a server-side cursor and
+    written as they arrive, so memory is constant and the first byte is
+    sent immediately. Buffered responses are cached with an ETag.
+    `?fields=id,name,image_url` (also with `stream`) returns and selects only
+    those fields, plus `id`.
 
     Returns:
         A list of all teacher profiles.
     """
-    return await crud.get_active_teachers(db)
+    columns = _parse_fields(fields)
+    if stream is not None:
+        media_type = "application/x-ndjson" if stream == "ndjson" else "application/json"
+        return StreamingResponse(_export_active_teachers(stream, columns), media_type=media_type)
+
+    read_schema = TeacherSchemas.Read if columns is None else TeacherSchemas.read_subset(columns)
+
+    async def produce() -> bytes:
+        rows = await crud.get_active_teachers(db, columns=columns)
+        return dump_json(list[read_schema], rows)
+
+    return await teacher_responses.respond(request, produce, columns)
+
+@router.get("/search", response_model=list[TeacherSchemas.Read], response_class=FastJSONResponse)
+async def search_teachers(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Search the teacher directory by name and bio words, with autocomplete.
+
+    Accent- and case-insensitive; the last word matches as a prefix
+    ("matem" finds "Matemáticas"). Served from the in-memory index; falls
+    back to a DB search (FULLTEXT on MySQL) until the index is built.
+    Writes handled by another worker show up after that worker's index sync
+    (about 32 s by default; see search.py).
+
+    Args:
+        q (str): Search text.
+        limit (int): Max results (1-50).
+
+    Returns:
+        Matching active profiles, best match first.
+    """
+    if teacher_index.ready:
+        results = teacher_index.search(q, limit=limit)
+    else:
+        results = await crud.search_active_teachers(db, q, limit=limit)
+    return Response(content=dump_json(list[TeacherSchemas.Read], results), media_type="application/json")
+
+@router.get("/batch", response_model=list[TeacherSchemas.Read], response_class=FastJSONResponse)
+async def read_teachers_batch(request: Request, ids: str = Query(..., description="Comma-separated ids, e.g. 1,2,3")):
+    """
+    Retrieve several teacher profiles by ID in one call.
+
+    Ids are resolved through the shared teacher loader: one `WHERE id IN (...)`
+    query, coalesced with any concurrent lookups of the same ids.
+
+    Args:
+        ids (str): Comma-separated profile ids (max BATCH_MAX_IDS).
+
+    Returns:
+        The profiles found, in the requested order (unknown ids are omitted).
+
+    Raises:
+        400 Bad Request: If ids are malformed or too many.
+    """
+    try:
+        teacher_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers.")
+    if len(teacher_ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} ids per request.")
+
+    async def produce() -> bytes:
+        profiles = [p for p in await teacher_loader.load_many(teacher_ids) if p is not None]
+        return dump_json(list[TeacherSchemas.Read], profiles)
+
+    return await teacher_responses.respond(request, produce, tuple(teacher_ids))
+
+def _change_entry(profile, since) -> dict:
+    """Change-feed entry: the profile while active, a tombstone once deactivated."""
+    schema = TeacherSchemas.Change if profile.is_active else TeacherSchemas.Tombstone
+    entry = {key: getattr(profile, key) for key in schema.model_fields if key != "change"}
+    if not profile.is_active:
+        entry["change"] = "deleted"
+    elif since is None or profile.created_at >= since:
+        entry["change"] = "created"
+    else:
+        entry["change"] = "updated"
+    return entry
+
+@router.get("/changes", response_model=TeacherSchemas.ChangeFeed)
+async def list_teacher_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=CHANGES_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Incremental sync: profiles created, updated or soft-deleted after `since`.
+
+    Start without `since` (full sync), then always pass the returned
+    `next_token`. Each call costs O(changes), not O(table): it is a keyset
+    scan of the (updated_at, id) index. Deactivated profiles come back as
+    tombstones, `{id, change: "deleted", is_active, updated_at, deleted_at}`
+    without their profile data; clients should drop them.
+
+    Tokens are monotonic. Only rows older than TEACHER_CHANGES_SETTLE_SECONDS
+    are returned, so a write that commits late is never skipped; a change
+    shows up in the feed after that delay.
+
+    Args:
+        since (str, optional): `next_token` from the previous call.
+        limit (int): Max changes per call (1-1000).
+
+    Returns:
+        `{"changes": [...], "next_token": str, "has_more": bool}`, oldest change first.
+
+    Raises:
+        400 Bad Request: Malformed token.
+    """
+    position, after_id = decode_sync_token(since)
+    until = utc_now() - timedelta(seconds=CHANGES_SETTLE_SECONDS)
+    rows = await crud.list_teacher_changes(db, until=until, since=position, after_id=after_id, limit=limit + 1)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        next_token = encode_sync_token(rows[-1].updated_at, rows[-1].id)
+    elif position is not None and position >= until:
+        next_token = since  # nothing settled past the token yet; never move it backwards
+    else:
+        next_token = encode_sync_token(until)
+    changes = [_change_entry(row, position) for row in rows]
+    body = dump_json(TeacherSchemas.ChangeFeed, {"changes": changes, "next_token": next_token, "has_more": has_more})
+    return Response(content=body, media_type="application/json")
 
 @router.get("/{teacher_id}", response_model=TeacherSchemas.Read)
-def read_teacher(teacher_id: int, db: Session = Depends(get_db)):
+async def read_teacher(request: Request, teacher_id: int):
     """
     Retrieve a teacher profile by ID.
 
+    Concurrent lookups are coalesced by the teacher loader into a single query.
+
     Args:
         teacher_id (int): ID of the teacher profile to fetch.
 
     Returns:
-        Teacher profile matching the given ID.
+        Teacher profile matching the given ID (cached, with ETag).
 
     Raises:
         404 Not Found: If the teacher does not exist.
     """
-    teacher = crud.get_teacher(db, teacher_id)
-    if not teacher:
-        raise HTTPException(status_code=404, detail="Teacher not found.")
-    return teacher
\ No newline at end of file
+    async def produce() -> bytes:
+        teacher = await teacher_loader.load(teacher_id)
+        if not teacher:
+            raise HTTPException(status_code=404, detail="Teacher not found.")
+        return dump_json(TeacherSchemas.Read, teacher)
+
+    return await teacher_responses.respond(request, produce, teacher_id)
@@ -1,5 +1,7 @@
-from pydantic import BaseModel,  Field
-from typing import Optional
+from datetime import datetime
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, create_model, model_validator
+from typing import Annotated, List, Literal, Optional, Tuple, Type, Union
 
 class TeacherBase(BaseModel):
     name: str
@@ -16,8 +18,120 @@ class TeacherProfileCreate(TeacherBase):
     password: Optional[str] = None   # optional: admin can provide an initial password
 
 class ReadTeacherProfile(TeacherBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     user_id: int
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+class TeacherProfilePage(BaseModel):
+    """
+    One page of a keyset-paginated listing.
+    `next_cursor` is None on the last page.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    items: List[ReadTeacherProfile]
+    next_cursor: Optional[str] = None
+
+# Fields a client can pick with `?fields=`, in response order.
+TEACHER_READ_FIELDS: Tuple[str, ...] = tuple(ReadTeacherProfile.model_fields)
+
+@lru_cache(maxsize=None)
+def teacher_read_subset(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Read schema restricted to `fields` (a subset of TEACHER_READ_FIELDS,
+    in that order), built once per field set.
+    """
+    source = ReadTeacherProfile.model_fields
+    return create_model(
+        "ReadTeacherProfile_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (source[name].annotation, source[name]) for name in fields},
+    )
+
+@lru_cache(maxsize=None)
+def teacher_page_subset(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    TeacherProfilePage whose items use `teacher_read_subset(fields)`.
+    """
+    return create_model(
+        "TeacherProfilePage_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        items=(List[teacher_read_subset(fields)], ...),
+        next_cursor=(Optional[str], None),
+    )
+
+class TeacherBulkRowResult(BaseModel):
+    """
+    Outcome of one row of a bulk import.
+    `row` is 1-based and counts data rows (CSV header excluded).
+    """
+    row: int
+    status: str                      # "created" | "error"
+    email: Optional[str] = None
+    user_id: Optional[int] = None
+    teacher_id: Optional[int] = None
+    error: Optional[str] = None
+
+class TeacherBulkImportReport(BaseModel):
+    """
+    Per-row report returned by the bulk import endpoint.
+    """
+    created: int
+    failed: int
+    results: List[TeacherBulkRowResult]
+
+class TeacherStatusChange(BaseModel):
+    """
+    Targets of a bulk activate/deactivate: an id list, or a filter.
+    Exactly one of `ids` / `name_contains` must be given.
+    """
+    ids: Optional[List[int]] = Field(default=None, min_length=1, max_length=50000)
+    name_contains: Optional[str] = Field(default=None, min_length=1, max_length=255)
+
+    @model_validator(mode="after")
+    def one_selector(self):
+        if (self.ids is None) == (self.name_contains is None):
+            raise ValueError("Provide either `ids` or `name_contains`.")
+        return self
+
+class TeacherStatusChangeReport(BaseModel):
+    """
+    Counts returned by the bulk activate/deactivate endpoints.
+    """
+    is_active: bool
+    targets: int
+    updated: int
+    unchanged: int
+
+class TeacherChange(ReadTeacherProfile):
+    """
+    One change-feed entry for an active profile.
+    `change` is "created" for profiles created since the token, "updated" otherwise.
+    """
+    change: Literal["created", "updated"]
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: Optional[datetime] = None
+
+class TeacherTombstone(BaseModel):
+    """
+    Change-feed entry for an inactive (soft-deleted) profile.
+    Only what a client needs to drop it: the profile data stays hidden,
+    as everywhere else in the public API.
+    """
+    id: int
+    change: Literal["deleted"]
+    is_active: bool
+    updated_at: datetime
+    deleted_at: Optional[datetime] = None
+
+class TeacherChangeFeed(BaseModel):
+    """
+    Changes after a sync token, oldest first.
+    Pass `next_token` as `since` on the next call; when `has_more` is true,
+    call again right away.
+    """
+    changes: List[Annotated[Union[TeacherChange, TeacherTombstone], Field(discriminator="change")]]
+    next_token: str
+    has_more: bool
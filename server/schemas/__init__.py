@@ -3,15 +3,21 @@ schemas/__init__.py
 Centralized schema registry for the application.
 Purpose:
 - Group Pydantic schemas for easier imports and maintainability.
-- Provide a clear namespace for user- and teacher-related schemas.
+- Provide a clear namespace for user-, teacher-, program- and contact-related schemas.
 - Avoid repeated imports of individual schema classes in other modules.
 Usage:
-    from server.schemas import UserSchemas, TeacherSchemas
+    from server.schemas import UserSchemas, TeacherSchemas, ProgramSchemas
     user_create = UserSchemas.Create(...)
     teacher_read = TeacherSchemas.Read(...)
 """
 from .userSchemas import UserCreate, UserRead, UserLogin
-from .TeacherProfileSchemas import ReadTeacherProfile, TeacherProfileCreate, TeacherBase
+from .TeacherProfileSchemas import (
+    ReadTeacherProfile, TeacherProfileCreate, TeacherBase, TeacherProfilePage,
+    TeacherBulkRowResult, TeacherBulkImportReport, TeacherStatusChange, TeacherStatusChangeReport,
+    TeacherChange, TeacherTombstone, TeacherChangeFeed, TEACHER_READ_FIELDS, teacher_read_subset, teacher_page_subset,
+)
+from .programSchemas import ProgramRead, ProgramCatalog
+from .contactSchemas import ContactMessageCreate, ContactMessageRead, ContactMessagePage, ContactReceipt
 
 class UserSchemas:
     """
@@ -31,8 +37,49 @@ class TeacherSchemas:
     Attributes:
         Create: Schema used when creating a new teacher profile.
         Read: Schema used to read teacher profile information (response model).
+        Page: Cursor-paginated list of Read items.
+        BulkRow / BulkReport: Per-row results of a bulk import.
+        StatusChange / StatusReport: Bulk activate/deactivate request and counts.
+        Change / Tombstone / ChangeFeed: Incremental sync entries (active and
+            deactivated profiles) and page (GET /teachers/changes).
+        FIELDS: Read fields selectable with `?fields=`, in response order.
+        read_subset / page_subset: Read and Page restricted to a field set (cached).
     """
     Base = TeacherBase
     Create = TeacherProfileCreate
     Read = ReadTeacherProfile
-    
\ No newline at end of file
+    Page = TeacherProfilePage
+    BulkRow = TeacherBulkRowResult
+    BulkReport = TeacherBulkImportReport
+    StatusChange = TeacherStatusChange
+    StatusReport = TeacherStatusChangeReport
+    Change = TeacherChange
+    Tombstone = TeacherTombstone
+    ChangeFeed = TeacherChangeFeed
+    FIELDS = TEACHER_READ_FIELDS
+    read_subset = staticmethod(teacher_read_subset)
+    page_subset = staticmethod(teacher_page_subset)
+
+class ProgramSchemas:
+    """
+    Namespace for Program catalog schemas.
+    Attributes:
+        Read: One program (detail response and catalog entry).
+        Catalog: The catalog data file and list response.
+    """
+    Read = ProgramRead
+    Catalog = ProgramCatalog
+
+class ContactSchemas:
+    """
+    Namespace for contact form schemas.
+    Attributes:
+        Create: Body of a contact form submission.
+        Read: A stored message (admin listing).
+        Page: Cursor-paginated list of Read items, newest first.
+        Receipt: Acknowledgement returned once a submission is queued.
+    """
+    Create = ContactMessageCreate
+    Read = ContactMessageRead
+    Page = ContactMessagePage
+    Receipt = ContactReceipt
@@ -0,0 +1,34 @@
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import List, Optional
+
+class ContactMessageCreate(BaseModel):
+    """
+    Body of `POST /contact` (fields of ContactForm.jsx).
+    Surrounding whitespace is stripped; empty name/message are rejected.
+    """
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    name: str = Field(min_length=1, max_length=50)
+    email: EmailStr
+    subject: Optional[str] = Field(default=None, max_length=150)
+    message: str = Field(min_length=1, max_length=5000)
+
+class ContactMessageRead(ContactMessageCreate):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    client_ip: Optional[str] = None
+    created_at: datetime
+
+class ContactMessagePage(BaseModel):
+    """
+    Newest-first page of contact messages.
+    `next_cursor` is None on the last page.
+    """
+    items: List[ContactMessageRead]
+    next_cursor: Optional[str] = None
+
+class ContactReceipt(BaseModel):
+    """Acknowledgement of a queued submission (202 Accepted)."""
+    status: str = "queued"
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import List
+
+class ProgramRead(BaseModel):
+    """
+    One academic program, in the shape rendered by pages/Programs.jsx and
+    components/CourseDetails.jsx. `icon` is the name of a lucide-react icon.
+    """
+    id: str = Field(pattern=r"^[a-z0-9]+(?:-[a-z0-9]+)*$")   # URL slug: /programs/{id}
+    icon: str
+    title: str
+    description: str
+    duration: str = ""
+    curriculum: List[str] = []
+    subjects: List[str] = []
+    requirements: List[str] = []
+    objectives: List[str] = []
+
+class ProgramCatalog(BaseModel):
+    """
+    The catalog data file (`{"programs": [...]}`) and the `GET /programs/` body.
+    `version` is a content hash of the catalog; it changes on every edit.
+    """
+    version: str = ""
+    programs: List[ProgramRead]
+
+    @field_validator("programs")
+    @classmethod
+    def unique_ids(cls, programs: List[ProgramRead]) -> List[ProgramRead]:
+        seen = set()
+        for program in programs:
+            if program.id in seen:
+                raise ValueError(f"duplicate program id: {program.id}")
+            seen.add(program.id)
+        return programs
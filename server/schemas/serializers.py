@@ -0,0 +1,40 @@
+"""
+Fast JSON serialization for API responses.
+- dump_json: validates ORM objects once through a cached TypeAdapter
+  (building one schema model per object) and serializes the result in
+  pydantic-core, without the stdlib json module.
+- FastJSONResponse: orjson-backed response class for list endpoints,
+  falling back to the stdlib JSONResponse when orjson is not installed.
+"""
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    FastJSONResponse = JSONResponse
+
+
+@lru_cache(maxsize=None)
+def adapter_for(tp: Any) -> TypeAdapter:
+    """TypeAdapter for `tp` (e.g. `list[TeacherSchemas.Read]`), built once per type."""
+    return TypeAdapter(tp)
+
+
+def dump_json(tp: Any, value: Any) -> bytes:
+    """
+    Validate `value` (ORM objects, dicts or models) as `tp` and return JSON bytes.
+
+    Args:
+        tp: Target type, e.g. `TeacherSchemas.Read` or `list[TeacherSchemas.Read]`.
+        value: Data to serialize; attributes are read from ORM objects.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    adapter = adapter_for(tp)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, validator, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 
 class UserCreate(BaseModel):
     """
@@ -10,7 +10,8 @@ class UserCreate(BaseModel):
     password: str
     role: str = "teacher"
     
-    @validator("email")
+    @field_validator("email")
+    @classmethod
     def validate_email(cls, v):
         """
         Extra email validation beyond EmailStr.
@@ -20,7 +21,8 @@ class UserCreate(BaseModel):
             raise ValueError("Invalid email")
         return v
 
-    @validator("password")
+    @field_validator("password")
+    @classmethod
     def password_strength(cls, v):
         """
         Enforces basic password security rules:
@@ -50,12 +52,11 @@ class UserRead(BaseModel):
     Schema for returning user information to the client.
     - Includes fields that describe the user but excludes sensitive data
       like the raw password.
-    - orm_mode=True allows automatic conversion from SQLAlchemy ORM objects.
+    - from_attributes=True allows automatic conversion from SQLAlchemy ORM objects.
     """
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     email: EmailStr
     role: str
     is_active: bool
-
-    class Config:
-        orm_mode = True
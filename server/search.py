@@ -0,0 +1,185 @@
+"""
+search.py
+In-process inverted index for the public teacher directory.
+
+Parents search by teacher name and by subject words in `bio`; the content
+is Spanish, so tokens are accent- and case-insensitive ("Matemáticas"
+matches "matematicas"). The last query word is treated as a prefix for
+autocomplete. Results are ranked by where the words matched (name beats
+bio) and whether they matched whole words or only prefixes.
+
+The index is built at startup from active TeacherProfile rows and kept
+current by the teacher CRUD write functions. It lives per worker process,
+so each worker also replays the change feed (`updated_at`) every
+SEARCH_INDEX_SYNC_SECONDS (see main.py). A write made on another worker
+(edit, activation or deactivation) therefore reaches this worker's results
+within SEARCH_INDEX_SYNC_SECONDS + TEACHER_CHANGES_SETTLE_SECONDS (32 s by
+default). With the sync disabled, it only shows up after a restart.
+"""
+import bisect
+import heapq
+import re
+import unicodedata
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Set
+
+NAME_WEIGHT = 3.0
+BIO_WEIGHT = 1.0
+# A prefix-only match counts for this fraction of a whole-word match.
+PREFIX_FACTOR = 0.5
+# Cap on index tokens a single prefix may expand to (keeps 1-letter queries cheap).
+MAX_PREFIX_EXPANSION = 200
+
+STOPWORDS = frozenset(
+    "a al con de del el en es la las lo los para por que se su sus un una y o e u".split()
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents (NFKD, drop combining marks); ñ folds to n."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Accent-insensitive word tokens of `text`, stopwords removed."""
+    return [token for token in _WORD.findall(fold(text)) if token not in STOPWORDS]
+
+
+class TeacherSearchIndex:
+    """
+    Inverted index: token -> {teacher_id: weight}, plus a sorted token list
+    for prefix lookups and a snapshot of each indexed profile so results are
+    served without touching the DB.
+
+    Attributes:
+        ready (bool): True once `rebuild` has completed.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._tokens: List[str] = []
+        self._doc_tokens: Dict[int, Set[str]] = {}
+        self._docs: Dict[int, dict] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # -- maintenance -------------------------------------------------------
+
+    def add(self, profile: dict) -> None:
+        """
+        Index (or re-index) one profile.
+
+        Args:
+            profile (dict): Read-schema fields (`id`, `user_id`, `name`, `bio`,
+                `image_url`, `is_active`). Inactive profiles are removed instead.
+        """
+        teacher_id = profile["id"]
+        self.remove(teacher_id)
+        if not profile.get("is_active", True):
+            return
+
+        weights: Dict[str, float] = {}
+        for token in tokenize(profile.get("name") or ""):
+            weights[token] = NAME_WEIGHT
+        for token in set(tokenize(profile.get("bio") or "")):
+            weights[token] = weights.get(token, 0.0) + BIO_WEIGHT
+
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                bisect.insort(self._tokens, token)
+            postings[teacher_id] = weight
+        self._doc_tokens[teacher_id] = set(weights)
+        self._docs[teacher_id] = dict(profile)
+
+    def remove(self, teacher_id: int) -> None:
+        """Drop a profile from the index (no-op if it is not indexed)."""
+        for token in self._doc_tokens.pop(teacher_id, ()):
+            postings = self._postings[token]
+            postings.pop(teacher_id, None)
+            if not postings:
+                del self._postings[token]
+                i = bisect.bisect_left(self._tokens, token)
+                if i < len(self._tokens) and self._tokens[i] == token:
+                    del self._tokens[i]
+        self._docs.pop(teacher_id, None)
+
+    def add_many(self, profiles: Iterable[dict]) -> None:
+        for profile in profiles:
+            self.add(profile)
+
+    async def rebuild(self, profiles: AsyncIterable[dict]) -> None:
+        """Replace the whole index with `profiles` (e.g. streamed from the DB at startup)."""
+        self.clear()
+        async for profile in profiles:
+            self.add(profile)
+        self.ready = True
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._tokens.clear()
+        self._doc_tokens.clear()
+        self._docs.clear()
+        self.ready = False
+
+    # -- querying ----------------------------------------------------------
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._tokens, prefix)
+        matches = []
+        for token in self._tokens[start:start + MAX_PREFIX_EXPANSION]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Ranked profiles matching every word of `query` (last word as a prefix).
+
+        Args:
+            query (str): Free text, e.g. "mate" or "ana fisica".
+            limit (int): Max results.
+
+        Returns:
+            List[dict]: Profile snapshots, best match first.
+        """
+        words = _WORD.findall(fold(query))
+        if not words:
+            return []
+        # Stopwords are ignored except as the word being typed.
+        words = [w for w in words[:-1] if w not in STOPWORDS] + words[-1:]
+
+        scores: Optional[Dict[int, float]] = None
+        for position, word in enumerate(words):
+            is_prefix = position == len(words) - 1
+            word_scores: Dict[int, float] = {}
+            for token in (self._expand(word) if is_prefix else [word]):
+                factor = 1.0 if token == word else PREFIX_FACTOR
+                for teacher_id, weight in self._postings.get(token, {}).items():
+                    score = weight * factor
+                    if score > word_scores.get(teacher_id, 0.0):
+                        word_scores[teacher_id] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {tid: s + word_scores[tid] for tid, s in scores.items() if tid in word_scores}
+            if not scores:
+                return []
+
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self._docs[teacher_id] for teacher_id, _ in ranked]
+
+
+def profile_snapshot(profile) -> dict:
+    """Read-schema fields of a TeacherProfile (ORM object or row mapping) as a dict."""
+    get = profile.get if isinstance(profile, dict) else lambda key: getattr(profile, key)
+    return {key: get(key) for key in ("id", "user_id", "name", "bio", "image_url", "is_active")}
+
+
+# Process-wide index for the teacher directory.
+teacher_index = TeacherSearchIndex()
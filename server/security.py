@@ -1,30 +1,31 @@
 """
 security.py
 This module provides authentication utilities, including:
-- Password hashing and verification.
+- Password hashing and verification (off the event loop, in a worker pool).
 - JWT access token creation.
-- Current user retrieval using OAuth2 Bearer token.
-- Database session management.
+- Current user retrieval using OAuth2 Bearer token (with a TTL principal cache).
 
 Security best practices followed:
 - Passwords hashed with bcrypt.
 - Secret keys loaded from environment.
 - JWT tokens include standard claims (exp, iat, sub).
 """
+import asyncio
+import functools
+import time
+from dataclasses import dataclass
+from concurrent.futures import Executor, ThreadPoolExecutor
 from sqlalchemy.future import select
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 import os
 from sqlalchemy.orm import Session
 from . import models
 from . import database
-from .database import SessionLocal, get_db
+from .database import get_db
+from .caching import TTLCache
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
-from dotenv import load_dotenv
-load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
@@ -33,33 +34,103 @@ if not SECRET_KEY:
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
 
+# bcrypt worker pool: "thread" (default, bcrypt releases the GIL) or "process".
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+
+# Identity cache: decoded tokens and resolved principals, per worker process.
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-# Dependency: async DB session
-async def get_db() -> AsyncSession:
+
+@functools.lru_cache(maxsize=None)
+def _pwd_context():
+    """bcrypt CryptContext, built on first use (passlib is slow to import)."""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _hash_password_sync(password: str) -> str:
+    """Blocking bcrypt hash. Runs inside the worker pool, never on the event loop."""
+    return _pwd_context().hash(password)
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """Blocking bcrypt verify. Runs inside the worker pool, never on the event loop."""
+    return _pwd_context().verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
     """
-    Async DB dependency.
-    Yields an AsyncSession from SessionLocal.
+    Async password hashing service.
+
+    bcrypt costs ~200-300 ms of CPU per call. Running it inline in an `async`
+    handler blocks the whole event loop, so every other request (even cheap
+    reads) waits behind a login burst. This service pushes the work onto a
+    bounded thread or process pool and exposes awaitable `hash`/`verify`.
+
+    Args:
+        executor (str): "thread" or "process".
+        max_workers (int): Upper bound on concurrent bcrypt computations.
     """
-    async with SessionLocal() as session:
-        yield session
 
+    def __init__(self, executor: str = "thread", max_workers: int = 1):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unsupported PASSWORD_HASH_EXECUTOR: {executor!r}")
+        self.executor_kind = executor
+        self.max_workers = max(1, max_workers)
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing this module never spawns workers.
+        if self._executor is None:
+            if self.executor_kind == "process":
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def hash(self, password: str) -> str:
+        """Hash a plain-text password without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), _hash_password_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain-text password without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), _verify_password_sync, plain_password, hashed_password
+        )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def start(self) -> None:
+        """Spawn the worker pool ahead of the first request (called on startup)."""
+        self._get_executor()
 
-def hash_password(password: str):
+    def shutdown(self, wait: bool = True) -> None:
+        """Release the worker pool (called on application shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS)
+
+async def hash_password(password: str) -> str:
     """
-    Hash a plain-text password using bcrypt.
+    Hash a plain-text password using bcrypt (async, runs in the worker pool).
     Args:
         password (str): Plain text password.
     Returns:
         str: Hashed password.
     """
-    return pwd_context.hash(password)
+    return await password_hasher.hash(password)
 
-def verify_password(plain_password, hashed_password):
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a plain-text password against a hashed password.
+    Verify a plain-text password against a hashed password (async, runs in the worker pool).
     Args:
         plain_password (str): Plain text password.
         hashed_password (str): Password hash stored in database.
@@ -67,7 +138,7 @@ def verify_password(plain_password, hashed_password):
     Returns:
         bool: True if passwords match, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
@@ -79,6 +150,8 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     Returns:
         str: Encoded JWT token.
     """
+    from jose import jwt
+
     to_encode = data.copy()
 
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -92,17 +165,94 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    Immutable snapshot of an authenticated user.
+
+    Returned by `get_current_user` instead of an ORM `User` so it can be
+    cached across requests and sessions. Exposes the same attributes the
+    routes read (`id`, `email`, `role`, `is_active`).
+    """
+    id: int
+    email: str
+    role: str
+    is_active: bool
+
+
+# token -> subject (email); saves re-verifying the JWT signature.
+token_cache = TTLCache(PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS)
+# subject (email) -> Principal; saves the `users` lookup.
+principal_cache = TTLCache(PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_principal(email: str | None = None, user_id: int | None = None) -> None:
+    """
+    Drop a cached principal so the next request re-reads it from the database.
+
+    Every write to `users` calls this after its commit (registration, teacher
+    creation, bulk import); any future path that deactivates, deletes or
+    changes the role/email of a user must do the same. Cached tokens for that
+    user stay valid but resolve to a fresh principal.
+
+    Args:
+        email (str, optional): Subject (email) of the user.
+        user_id (int, optional): Primary key of the user.
+    """
+    if email is not None:
+        principal_cache.pop(email)
+    if user_id is not None:
+        for key, principal in principal_cache.items():
+            if principal.id == user_id:
+                principal_cache.pop(key)
+
+
+def clear_principal_cache() -> None:
+    """Invalidate every cached token and principal (e.g. after bulk role changes)."""
+    token_cache.clear()
+    principal_cache.clear()
+
+
+def principal_cache_stats() -> dict:
+    """Hit/miss counters for the token and principal caches."""
+    return {"tokens": token_cache.stats(), "principals": principal_cache.stats()}
+
+
+def _decode_subject(token: str) -> str | None:
+    """
+    Return the `sub` claim of a valid token, using the token cache when possible.
+    Cached entries never outlive the token's own `exp`.
+    """
+    email = token_cache.get(token)
+    if email is not None:
+        return email
+
+    from jose import jwt
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    email = payload.get("sub")
+    if email is not None:
+        exp = payload.get("exp")
+        ttl = exp - time.time() if exp is not None else None
+        token_cache.set(token, email, ttl=ttl)
+    return email
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: AsyncSession = Depends(database.get_db)
-):
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     """
     FastAPI dependency to retrieve the currently authenticated user from a JWT token.
     Steps:
-    1. Decode JWT token from Authorization header.
+    1. Decode JWT token from Authorization header (cached per token).
     2. Extract 'sub' claim (user email).
-    3. Fetch user from database.
-    4. Raise 401 Unauthorized if token invalid or user not found.
+    3. Resolve the principal from the cache, or fetch the user from database.
+    4. Raise 401 Unauthorized if token invalid, user not found or inactive
+       (checked on cache hits too, and inactive principals are never cached).
+
+    Steady-state traffic hits both caches, so the session is never used and
+    no DB round trip is made for identity.
 
     Usage in route:
         user = Depends(get_current_user)
@@ -113,18 +263,39 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    from jose import JWTError
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        
-        email: str = payload.get("sub")
+        email = _decode_subject(token)
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
+    principal = principal_cache.get(email)
+    if principal is not None:
+        if not principal.is_active:
+            principal_cache.pop(email)
+            raise credentials_exception
+        return principal
+
     result = await db.execute(select(models.user.User).filter(models.user.User.email == email))
     user = result.scalars().first()
-    if user is None:
+    if user is None or not user.is_active:
         raise credentials_exception
 
-    return user
\ No newline at end of file
+    principal = Principal(id=user.id, email=user.email, role=user.role, is_active=user.is_active)
+    principal_cache.set(email, principal)
+    return principal
+
+
+async def require_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
+    """
+    FastAPI dependency that only lets admins through.
+
+    Usage in route:
+        admin = Depends(require_admin)
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required.")
+    return current_user
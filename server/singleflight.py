@@ -0,0 +1,89 @@
+"""
+singleflight.py
+Single-flight deduplication for concurrent identical reads.
+
+When many requests call the same read function with the same arguments at
+the same time (e.g. an enrollment announcement sends everyone to page 1 of
+the teacher directory), only the first call runs the query; the others
+await it and share its result. Nothing is cached once the call finishes.
+
+The shared call runs on its own session (like the loaders), never on the
+first caller's: that request may be cancelled and its session closed while
+the others still wait. Callers only share a call made with the same read
+preference (replica, or primary for read-your-writes), and a caller whose
+session has uncommitted writes runs the read on that session, unshared.
+
+Shared results are detached ORM objects (or rows) and must be treated as
+read-only by callers.
+"""
+import asyncio
+import functools
+import os
+from typing import Any, Callable, Dict, Hashable
+
+from . import database
+
+
+def _freeze(value: Any) -> Hashable:
+    """Make list/set/dict arguments usable in a dedup key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class SingleFlight:
+    """
+    Registry of in-flight calls keyed by function name and arguments.
+
+    Attributes:
+        enabled (bool): When False, every call runs on its own.
+        calls (int): Calls made through the group.
+        collapsed (int): Calls that joined an in-flight call instead of querying.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    def wrap(self, fn: Callable) -> Callable:
+        """
+        Decorate an async CRUD read `fn(db, *args, **kwargs)`.
+        The caller's session is not used for a shared call: it runs on a
+        fresh session, keyed by arguments and read preference.
+        """
+        async def run(*args, **kwargs):
+            async with database.SessionLocal() as session:
+                return await fn(session, *args, **kwargs)
+
+        @functools.wraps(fn)
+        async def wrapper(db, *args, **kwargs):
+            self.calls += 1
+            if not self.enabled or (db.in_transaction() and db.sync_session.info.get("wrote")):
+                return await fn(db, *args, **kwargs)
+
+            key = (fn.__qualname__, database.reads_use_primary(), _freeze(args), _freeze(kwargs))
+            future = self._inflight.get(key)
+            if future is not None:
+                self.collapsed += 1
+                return await asyncio.shield(future)
+
+            future = asyncio.ensure_future(run(*args, **kwargs))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            return await asyncio.shield(future)
+
+        return wrapper
+
+    def stats(self) -> dict:
+        """Call and collapse counters plus the number of calls in flight now."""
+        return {"calls": self.calls, "collapsed": self.collapsed, "inflight": len(self._inflight)}
+
+
+# Shared by the read functions in crud/teacherProfileCrud.py.
+read_flights = SingleFlight(enabled=os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes", "on"))